@@ -0,0 +1,81 @@
+"""
+타로 후보 점수 계산 벤치마크 (한 곳씩 계산하는 scoring.reference_score vs 일괄 계산)
+
+    python bench/bench_scoring.py            # 후보 50 / 500 / 5000개
+    python bench/bench_scoring.py 100 1000   # 후보 수 직접 지정
+
+외부 API 없이 무작위 후보를 만들어 두 방식의 점수/상위 50개가 같은지 확인하고 시간을 잼
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from taro import scoring  # noqa: E402
+
+CATEGORIES = ["카페", "커피전문점", "디저트카페", "한식", "양식", "중식", "일식", "술집", "호프,요리주점",
+              "칵테일바", "공원", "미술관", "박물관", "백화점", "복합문화공간", "관광명소"]
+KEYWORDS = ["카페", "맛집", "공원", "문화시설", "실내", "야외"]
+PREFERENCES = [{"food_preference": p} for p in ("cafe", "restaurant", "bar", "other")]
+REPEAT = 20
+
+
+def make_places(n, rng):
+    places = []
+    for i in range(n):
+        keyword = rng.choice(KEYWORDS)
+        places.append({
+            "kakao_id": str(i),
+            "name": f"{rng.choice(['', keyword])}장소{i}",
+            "category": rng.choice(CATEGORIES),
+            "distance": str(rng.choice([0, rng.randint(1, 8000)])),
+            "phone": rng.choice(["", "02-000-0000"]),
+            "road_address": rng.choice(["", "서울 중구"]),
+            "place_url": rng.choice(["", "http://place.map.kakao.com/1"]),
+            "search_keyword": keyword,
+        })
+    return places
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(sizes):
+    rng = random.Random(0)
+    print(f"{'후보 수':>8} {'취향':>10} {'기존(ms)':>10} {'일괄(ms)':>10} {'배속':>6}")
+    for n in sizes:
+        places = make_places(n, rng)
+        for prefs in PREFERENCES:
+            def loop():
+                scores = [scoring.reference_score(p, prefs) for p in places]
+                order = sorted(range(n), key=lambda i: scores[i], reverse=True)[:50]
+                return scores, order
+
+            def batch():
+                scores = scoring.score_places(places, prefs)
+                return scores, scoring.top_k(scores, 50)
+
+            t_loop, expected = timed(loop)
+            t_batch, actual = timed(batch)
+            if actual != expected:
+                raise SystemExit(f"결과 불일치: n={n}, {prefs}")
+            print(f"{n:>8} {prefs['food_preference']:>10} {t_loop * 1000:>10.3f} {t_batch * 1000:>10.3f} "
+                  f"{t_loop / t_batch:>6.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [50, 500, 5000])
@@ -0,0 +1,256 @@
+"""
+가짜 외부 API (구글 Places / 카카오 로컬 / 티맵 경로 / OpenAI chat completions)
+
+녹화 응답(bench/fixtures/upstream.jsonl)을 같은 규칙으로 돌려주면서 지연 시간과 오류를 섞을 수 있음
+- 서버 모드: 실제 Django 서버(runserver/gunicorn)를 띄워 부하 테스트할 때
+
+    python bench/fake_upstream.py --port 8765 --latency 80 --jitter 40 --error-rate 0.02
+    # 출력된 export 줄을 실행한 셸에서 Django 서버 실행 (settings 의 *_BASE 가 가짜 서버를 가리킴)
+
+- 어댑터 모드: 한 프로세스 안에서 (테스트, bench/run.py 처럼 Django 테스트 클라이언트로 측정할 때)
+
+    with replay.mounted(FakeUpstreamAdapter(replay.load_fixtures(), Faults(latency_ms=50))):
+        ...
+
+- 지연/오류는 upstream 별로 다르게 줄 수 있음: --upstream openai:latency_ms=900,timeout_rate=0.05
+- 같은 seed 면 같은 순서로 같은 지연/오류가 나옴 (동시 요청이 섞이면 어느 요청이 받을지는 달라질 수 있음)
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from types import SimpleNamespace
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests  # noqa: E402
+
+from bench import replay  # noqa: E402
+
+# 가짜 서버 경로 접두사 -> 실제 주소 (녹화 JSONL 의 url 과 매칭할 때 되돌림)
+PREFIXES = {
+    "/google": "https://places.googleapis.com",
+    "/kakao-navi": "https://apis-navi.kakaomobility.com",
+    "/kakao": "https://dapi.kakao.com",
+    "/tmap": "https://apis.openapi.sk.com",
+    "/openai": "https://api.openai.com",
+}
+
+ERROR_BODY = {"error": {"code": 503, "message": "fake upstream error", "status": "UNAVAILABLE"}}
+
+
+def settings_env(base_url):
+    """가짜 서버를 가리키는 settings 환경변수 (project/settings.py 의 *_BASE)"""
+    base_url = base_url.rstrip("/")
+    return {
+        "GOOGLE_PLACES_BASE": f"{base_url}/google/v1/places",
+        "KAKAO_LOCAL_BASE": f"{base_url}/kakao/v2/local",
+        "KAKAO_NAVI_BASE": f"{base_url}/kakao-navi/v1/directions",
+        "TMAP_TRANSIT_BASE": f"{base_url}/tmap/transit/routes",
+        "TMAP_ROUTE_BASE": f"{base_url}/tmap/tmap/routes",
+        "OPENAI_API_BASE": f"{base_url}/openai/v1",
+    }
+
+
+class Faults:
+    """지연 시간/오류 주입 설정
+    - latency_ms ± jitter_ms 만큼 기다린 뒤 응답
+    - error_rate 확률로 503, timeout_rate 확률로 응답하지 않고 timeout_s 초 대기
+    - per_upstream: {"openai": {"latency_ms": 900, ...}} 처럼 upstream 별로 덮어쓰기
+    """
+    FIELDS = ("latency_ms", "jitter_ms", "error_rate", "timeout_rate", "timeout_s")
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, timeout_rate=0.0, timeout_s=30.0,
+                 per_upstream=None, seed=0):
+        self.default = dict(latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate,
+                            timeout_rate=timeout_rate, timeout_s=timeout_s)
+        self.per_upstream = per_upstream or {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def config(self, upstream):
+        return {**self.default, **self.per_upstream.get(upstream, {})}
+
+    def plan(self, upstream):
+        """(지연 초, "ok" | "error" | "timeout")"""
+        c = self.config(upstream)
+        with self._lock:
+            jitter = self._rng.uniform(-c["jitter_ms"], c["jitter_ms"]) if c["jitter_ms"] else 0.0
+            roll = self._rng.random()
+        delay = max(0.0, c["latency_ms"] + jitter) / 1000
+        if roll < c["timeout_rate"]:
+            return c["timeout_s"], "timeout"
+        if roll < c["timeout_rate"] + c["error_rate"]:
+            return delay, "error"
+        return delay, "ok"
+
+
+def _read_timeout(timeout):
+    if isinstance(timeout, tuple):
+        timeout = timeout[1]
+    return timeout
+
+
+class FakeUpstreamAdapter(replay.ReplayAdapter):
+    """녹화 응답 + 지연/오류 주입 (requests 어댑터, 프로세스 안에서 사용)
+    - timeout 은 요청의 read timeout 만큼 기다린 뒤 requests.ReadTimeout
+    """
+
+    def __init__(self, entries, faults=None):
+        super().__init__(entries)
+        self.faults = faults or Faults()
+
+    def send(self, request, timeout=None, **kwargs):
+        entry = self.match(request)
+        if entry is None:
+            return super().send(request, timeout=timeout, **kwargs)
+        self.calls += 1
+        delay, outcome = self.faults.plan(entry.get("upstream"))
+        if outcome == "timeout":
+            read_timeout = _read_timeout(timeout)
+            time.sleep(min(delay, read_timeout) if read_timeout else delay)
+            raise requests.ReadTimeout(f"가짜 타임아웃: {request.method} {request.url}", request=request)
+        time.sleep(delay)
+        if outcome == "error":
+            return replay.build_response(request, 503, ERROR_BODY)
+        return replay.build_response(request, entry.get("status", 200), entry.get("body"), entry.get("headers"))
+
+
+class FakeUpstreamApp:
+    """녹화 응답 + 지연/오류 주입 WSGI 앱 (서버 모드)
+    - /google/..., /kakao/..., /tmap/..., /openai/... 경로를 실제 주소로 되돌려 녹화 응답과 매칭
+    - 매칭되는 녹화가 없으면 404, timeout 은 timeout_s 초 뒤 504
+    """
+
+    def __init__(self, entries, faults=None):
+        self.matcher = replay.ReplayAdapter(entries)
+        self.faults = faults or Faults()
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def _real_url(self, path):
+        for prefix, real in PREFIXES.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return real + path[len(prefix):]
+        return None
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path == "/__health":
+            return self._respond(start_response, 200, {"ok": True, "counts": self.counts})
+
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        body = environ["wsgi.input"].read(length) if length else b""
+        url = self._real_url(path)
+        request = SimpleNamespace(method=environ["REQUEST_METHOD"], url=url or "", body=body)
+        entry = self.matcher.match(request) if url else None
+        if entry is None:
+            self._count("unmatched")
+            return self._respond(start_response, 404, {"error": {"code": 404, "message": f"녹화된 응답 없음: {path}"}})
+
+        upstream = entry.get("upstream", "unknown")
+        delay, outcome = self.faults.plan(upstream)
+        time.sleep(delay)
+        self._count(f"{upstream}:{outcome}")
+        if outcome == "timeout":
+            return self._respond(start_response, 504, {"error": {"code": 504, "message": "fake upstream timeout"}})
+        if outcome == "error":
+            return self._respond(start_response, 503, ERROR_BODY)
+        return self._respond(start_response, entry.get("status", 200), entry.get("body"))
+
+    @staticmethod
+    def _respond(start_response, status, body):
+        if isinstance(body, (dict, list)):
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        else:
+            payload = (body or "").encode("utf-8")
+            content_type = "text/plain; charset=utf-8"
+        reason = requests.status_codes._codes.get(status, ("",))[0].upper().replace("_", " ")
+        start_response(f"{status} {reason}", [("Content-Type", content_type), ("Content-Length", str(len(payload)))])
+        return [payload]
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True  # 지연 주입 중인 요청이 다른 요청을 막지 않도록 요청마다 스레드
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def make_fake_server(host="127.0.0.1", port=0, fixtures=replay.FIXTURES, faults=None):
+    """가짜 서버 생성 (port=0 이면 빈 포트) -> (server, base_url)"""
+    app = FakeUpstreamApp(replay.load_fixtures(fixtures), faults)
+    server = make_server(host, port, app, server_class=_ThreadingWSGIServer, handler_class=_QuietHandler)
+    return server, f"http://{host}:{server.server_port}"
+
+
+def start_in_thread(**kwargs):
+    """백그라운드 스레드에서 가짜 서버 실행 -> (server, base_url), 끝나면 server.shutdown()"""
+    server, base_url = make_fake_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name="fake-upstream", daemon=True).start()
+    return server, base_url
+
+
+def _parse_upstream(values):
+    """["openai:latency_ms=900,error_rate=0.1", ...] -> {"openai": {"latency_ms": 900.0, "error_rate": 0.1}}"""
+    result = {}
+    for value in values or []:
+        name, _, pairs = value.partition(":")
+        overrides = result.setdefault(name, {})
+        for pair in filter(None, pairs.split(",")):
+            key, _, number = pair.partition("=")
+            if key not in Faults.FIELDS:
+                raise SystemExit(f"알 수 없는 설정: {key} (가능: {', '.join(Faults.FIELDS)})")
+            overrides[key] = float(number)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="녹화 응답으로 답하는 가짜 외부 API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=str(replay.FIXTURES))
+    parser.add_argument("--latency", type=float, default=0, help="응답 지연(ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="지연 편차(ms, ±)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="응답 지연 후 504 비율")
+    parser.add_argument("--timeout-s", type=float, default=30.0, help="타임아웃 때 기다리는 시간(초)")
+    parser.add_argument("--upstream", action="append", help="upstream 별 설정, 예) openai:latency_ms=900,error_rate=0.1")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    faults = Faults(
+        latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate, timeout_s=args.timeout_s,
+        per_upstream=_parse_upstream(args.upstream), seed=args.seed,
+    )
+    server, base_url = make_fake_server(args.host, args.port, args.fixtures, faults)
+    for key, value in settings_env(base_url).items():
+        print(f"export {key}={value}")
+    print(f"# 가짜 외부 API 실행 중: {base_url} (상태: {base_url}/__health)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+"""
+부하 테스트 - 실제 사용자 흐름(시나리오)을 가상 사용자 여러 명이 동시에 반복 실행하고 단계별 RPS/지연/오류율 측정
+
+    python bench/load.py --self-host --users 20 --duration 60
+        # 가짜 외부 API(bench/fake_upstream.py) + 임시 DB 로 Django 서버를 띄워서 측정
+    python bench/load.py --self-host --latency 80 --jitter 40 --upstream openai:latency_ms=900
+        # 외부 API 지연/오류를 섞어서 측정
+    python bench/load.py --self-host --server-cmd "gunicorn project.wsgi -w 4 -b {addr}"
+        # runserver 대신 다른 서버로 (워커 수 비교 등)
+    python bench/load.py --target http://127.0.0.1:8000 --scenario wiki
+        # 이미 떠 있는 서버 (fake_upstream.py 가 출력한 export 를 적용해서 띄운 서버)
+    python bench/load.py --self-host -o after.json --compare before.json
+
+시나리오 (가상 사용자는 --scenario 목록을 돌아가며 하나씩 맡음)
+- main: 메인(추천 + 인기 검색어) -> 검색 -> 찜하기(3곳) -> AI 동선 -> 구간 경로
+- taru: 타루 대화(질문) -> 카드 셔플(card_select) -> 카드 선택(장소 한줄 요약)
+        (taro 앱은 URL 에 연결되어 있지 않아서 /api/chats 의 같은 흐름을 사용)
+- wiki: 위키 검색 -> 장소 상세 -> 후기 작성
+
+- 가상 사용자마다 requests.Session 하나 (연결 재사용), 요청은 asyncio 이벤트 루프에서 스레드로 보냄
+- 상태 코드 400 이상(단계별로 정상 안내인 코드는 제외)이거나 연결 실패/타임아웃이면 오류
+- 다음 단계에 필요한 값을 못 얻으면 그 회차는 중단 (journeys 의 aborted)
+- RPS 는 단계별 완료 요청 수 / 전체 측정 시간 (램프업 포함)
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if __package__ in (None, ""):
+    sys.path.insert(0, str(ROOT))
+
+import requests  # noqa: E402
+
+from bench import fake_upstream, stats  # noqa: E402
+
+X, Y = 126.9780, 37.5665  # 서울시청
+DAY = "월요일"
+SCENARIOS = ("main", "taru", "wiki")
+DEFAULT_SERVER_CMD = f"{shlex.quote(sys.executable)} manage.py runserver --noreload {{addr}}"
+
+
+class Abort(Exception):
+    """다음 단계에 필요한 값을 얻지 못해 이번 회차를 중단"""
+
+
+class Recorder:
+    """단계별 지연 시간/오류/상태 코드 집계"""
+
+    def __init__(self):
+        self.steps = {}
+        self.journeys = {}
+
+    def step(self, name, seconds, status, ok):
+        s = self.steps.setdefault(name, {"latencies": [], "errors": 0, "statuses": {}})
+        s["latencies"].append(seconds)
+        if not ok:
+            s["errors"] += 1
+        key = str(status)
+        s["statuses"][key] = s["statuses"].get(key, 0) + 1
+
+    def journey(self, name, seconds, completed):
+        j = self.journeys.setdefault(name, {"latencies": [], "aborted": 0})
+        if completed:
+            j["latencies"].append(seconds)
+        else:
+            j["aborted"] += 1
+
+    def report(self, elapsed):
+        steps = {}
+        for name, s in self.steps.items():
+            steps[name] = stats.summarize(s["latencies"], elapsed=elapsed, errors=s["errors"])
+            steps[name]["statuses"] = s["statuses"]
+        journeys = {}
+        for name, j in self.journeys.items():
+            journeys[name] = stats.summarize(j["latencies"], elapsed=elapsed)
+            journeys[name]["aborted"] = j["aborted"]
+            del journeys[name]["errors"], journeys[name]["error_rate"]
+        return steps, journeys
+
+
+class VirtualUser:
+    def __init__(self, base_url, recorder, think_ms=0, timeout=30.0, rng=None):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.think_ms = think_ms
+        self.timeout = timeout
+        self.rng = rng or random.Random()
+        self.session = requests.Session()
+        self.insecure = self.base_url.startswith("http://")
+
+    async def call(self, step, method, path, expect=(), **kwargs):
+        """요청 하나를 보내고 기록 -> 응답 (연결 실패/타임아웃이면 None)
+        - expect: 400 이상이어도 정상으로 볼 상태 코드 (정상적인 안내 응답)
+        """
+        if self.think_ms:
+            await asyncio.sleep(self.rng.uniform(0, self.think_ms) / 1000)
+        kwargs.setdefault("timeout", self.timeout)
+        started = time.perf_counter()
+        try:
+            response = await asyncio.to_thread(self.session.request, method, self.base_url + path, **kwargs)
+        except requests.Timeout:
+            self.recorder.step(step, time.perf_counter() - started, "timeout", False)
+            return None
+        except requests.RequestException:
+            self.recorder.step(step, time.perf_counter() - started, "connection_error", False)
+            return None
+        ok = response.status_code < 400 or response.status_code in expect
+        self.recorder.step(step, time.perf_counter() - started, response.status_code, ok)
+        if self.insecure:
+            # SESSION_COOKIE_SECURE 라 http 로 띄운 서버에서는 세션 쿠키가 다시 전송되지 않음 (https 배포의 브라우저처럼 보냄)
+            for cookie in self.session.cookies:
+                cookie.secure = False
+        return response
+
+    def close(self):
+        self.session.close()
+
+
+def _json(response, *keys):
+    """성공 응답 본문에서 keys 를 따라간 값 (없거나 실패한 응답이면 Abort)"""
+    if response is None or response.status_code >= 300:
+        raise Abort
+    try:
+        value = response.json()
+        for key in keys:
+            value = value[key]
+    except (ValueError, KeyError, IndexError, TypeError):
+        raise Abort
+    return value
+
+
+# 시나리오 ------------------------------------------------------------------------
+
+async def main_journey(user):
+    """메인 -> 검색 -> 찜하기 -> AI 동선 -> 구간 경로"""
+    await user.call("main.recommend", "GET", "/api/places/recommend", params={"x": X, "y": Y, "radius": 2000})
+    await user.call("main.top10_keyword", "GET", "/api/places/top10_keyword")
+
+    found = await user.call(
+        "main.search", "GET", "/api/places/google_place", params={"q": "카페", "x": X, "y": Y, "radius": 2000},
+    )
+    place_ids = [p["place_id"] for p in _json(found, "google_place") if p.get("place_id")]
+    if not place_ids:
+        raise Abort
+
+    session_key = None
+    for place_id in user.rng.sample(place_ids, min(3, len(place_ids))):
+        saved = await user.call("main.save_place", "GET", "/api/places/save_place", params={"place_id": place_id})
+        session_key = _json(saved, "session_key")
+
+    # 고른 장소 중 그 요일에 영업하는 곳이 부족하면 400 (장소 데이터 부족 안내) - 오류로 세지 않고 회차만 중단
+    routes = await user.call(
+        "main.ai_routes", "GET", "/api/routes/ai_routes",
+        params={"session_key": session_key, "day": DAY, "x": X, "y": Y}, expect=(400,),
+    )
+    stops = _json(routes, "result")
+    if not stops:
+        raise Abort
+
+    # 현재 위치 -> 첫 장소 (두 곳 이상이면 첫 장소 -> 두 번째 장소)
+    origin = {"longitude": X, "latitude": Y} if len(stops) < 2 else stops[0]
+    destination = stops[0] if len(stops) < 2 else stops[1]
+    await user.call("main.path", "POST", "/api/routes/path", params={
+        "transport": "transit",
+        "origin_x": origin["longitude"], "origin_y": origin["latitude"],
+        "destination_x": destination["longitude"], "destination_y": destination["latitude"],
+    })
+
+
+async def taru_journey(user):
+    """타루 대화 -> 카드 셔플 -> 카드 선택"""
+    await user.call("taru.slot_question", "POST", "/api/chats/slot_question")
+    cards = await user.call("taru.card_select", "POST", "/api/chats/card_select", json={
+        "input_text": "조용한 카페에서 저녁에 산책하고 싶어", "x": X, "y": Y,
+    })
+    select = _json(cards, "select")
+    if not select:
+        raise Abort
+    picked = user.rng.choice(select)
+    await user.call("taru.place_summary", "GET", "/api/chats/place_summary", params={"place_id": picked["place_id"]})
+
+
+async def wiki_journey(user):
+    """위키 검색 -> 상세 -> 후기 작성"""
+    found = await user.call(
+        "wiki.search", "GET", "/api/wiki/search/", params={"place_name": "카페", "longitude": X, "latitude": Y},
+    )
+    places = [p for p in _json(found, "google_place") if p.get("place_id")]
+    if not places:
+        raise Abort
+    place_id = user.rng.choice(places)["place_id"]
+
+    await user.call("wiki.detail", "GET", "/api/wiki/detail/", params={"place_id": place_id})
+    await user.call("wiki.review", "POST", "/api/wiki/reviews", data={
+        "place_id": place_id,
+        "review_content": "부하 테스트로 작성한 후기입니다. 분위기가 좋아요.",
+        "review_score": user.rng.choice([3.0, 4.0, 5.0]),
+    })
+
+
+JOURNEYS = {"main": main_journey, "taru": taru_journey, "wiki": wiki_journey}
+
+
+# 실행 ----------------------------------------------------------------------------
+
+async def _run_user(index, scenario, args, recorder, deadline):
+    rng = random.Random(args.seed * 10_000 + index)
+    user = VirtualUser(args.target, recorder, think_ms=args.think_ms, timeout=args.timeout, rng=rng)
+    journey = JOURNEYS[scenario]
+    try:
+        if args.ramp and args.users > 1:
+            await asyncio.sleep(args.ramp * index / args.users)
+        done = 0
+        while time.perf_counter() < deadline and (not args.iterations or done < args.iterations):
+            journey_started = time.perf_counter()
+            try:
+                await journey(user)
+                completed = True
+            except Abort:
+                completed = False
+            recorder.journey(scenario, time.perf_counter() - journey_started, completed)
+            done += 1
+    finally:
+        user.close()
+
+
+async def run(args):
+    recorder = Recorder()
+    loop = asyncio.get_running_loop()
+    # asyncio.to_thread 기본 풀(최대 32개)에 막히지 않도록 가상 사용자 수만큼 스레드
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=args.users, thread_name_prefix="vu"))
+
+    started = time.perf_counter()
+    deadline = started + args.duration if args.duration else float("inf")
+    await asyncio.gather(*(
+        _run_user(i, args.scenario[i % len(args.scenario)], args, recorder, deadline)
+        for i in range(args.users)
+    ))
+    elapsed = time.perf_counter() - started
+    return recorder, elapsed
+
+
+# 서버 직접 띄우기 (--self-host) ----------------------------------------------------
+
+def _free_port(host):
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base_url, proc, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"서버가 종료됨 (exit {proc.returncode})")
+        try:
+            if requests.get(f"{base_url}/api/places/top10_keyword", timeout=2).status_code < 500:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"서버가 {timeout}초 안에 뜨지 않음: {base_url}")
+
+
+class SelfHost:
+    """가짜 외부 API + 임시 SQLite DB 로 Django 서버 실행 (with 블록이 끝나면 정리)"""
+
+    def __init__(self, args):
+        self.args = args
+        self.fake = self.proc = self.tmpdir = self.log = None
+
+    def __enter__(self):
+        args = self.args
+        faults = fake_upstream.Faults(
+            latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate,
+            timeout_rate=args.timeout_rate, timeout_s=args.timeout_s,
+            per_upstream=fake_upstream._parse_upstream(args.upstream), seed=args.seed,
+        )
+        self.fake, fake_url = fake_upstream.start_in_thread(faults=faults)
+
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="taroute-load-")
+        env = {
+            **os.environ,
+            **fake_upstream.settings_env(fake_url),
+            "SQLITE_PATH": os.path.join(self.tmpdir.name, "load.sqlite3"),
+            "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+            "PYTHONUNBUFFERED": "1",
+        }
+        subprocess.run(
+            [sys.executable, "manage.py", "migrate", "--noinput", "-v", "0"], cwd=ROOT, env=env, check=True,
+        )
+
+        addr = f"127.0.0.1:{_free_port('127.0.0.1')}"
+        self.log = open(args.server_log or os.path.join(self.tmpdir.name, "server.log"), "w")
+        self.proc = subprocess.Popen(
+            shlex.split(args.server_cmd.format(addr=addr)), cwd=ROOT, env=env,
+            stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        base_url = f"http://{addr}"
+        try:
+            _wait_ready(base_url, self.proc)
+        except SystemExit:
+            self.__exit__(None, None, None)
+            raise
+        print(f"# 서버: {base_url} / 가짜 외부 API: {fake_url}", file=sys.stderr)
+        return base_url
+
+    def upstream_counts(self):
+        return dict(self.fake.get_app().counts) if self.fake else {}
+
+    def __exit__(self, *exc):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        if self.log:
+            self.log.close()
+        if self.fake:
+            self.fake.shutdown()
+            self.fake.server_close()
+        if self.tmpdir:
+            self.tmpdir.cleanup()
+        return False
+
+
+# 결과 / 비교 ---------------------------------------------------------------------
+
+def format_table(steps):
+    lines = [f"{'step':<22}{'count':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err%':>7}"]
+    for name, s in steps.items():
+        lines.append(
+            f"{name:<22}{s['count']:>7}{s['rps']:>9.2f}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}"
+            f"{s['p99_ms']:>9.1f}{s['error_rate'] * 100:>6.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def compare(current, baseline, threshold):
+    """단계별 p95 / rps / 오류율 비교 결과 줄 목록과 회귀 여부"""
+    lines, regressed = [], False
+    for name, now in current.get("steps", {}).items():
+        before = baseline.get("steps", {}).get(name)
+        if not before:
+            continue
+        flags = []
+        if before["p95_ms"] and now["p95_ms"] / before["p95_ms"] - 1 > threshold:
+            flags.append("p95 느려짐")
+        if before["rps"] and 1 - now["rps"] / before["rps"] > threshold:
+            flags.append("rps 감소")
+        if now["error_rate"] > before["error_rate"] + 0.01:
+            flags.append("오류 증가")
+        regressed = regressed or bool(flags)
+        lines.append(
+            f"{name}: p95 {before['p95_ms']} -> {now['p95_ms']} ms, rps {before['rps']} -> {now['rps']}, "
+            f"err {before['error_rate']:.2%} -> {now['error_rate']:.2%}" + (f"  <-- {', '.join(flags)}" if flags else "")
+        )
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="사용자 흐름 시나리오 부하 테스트")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--target", help="측정할 서버 주소 (예: http://127.0.0.1:8000)")
+    target.add_argument("--self-host", action="store_true", help="가짜 외부 API + 임시 DB 로 서버를 직접 띄워서 측정")
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("-u", "--users", type=int, default=10, help="동시 가상 사용자 수")
+    parser.add_argument("-d", "--duration", type=float, default=30, help="측정 시간(초, 0 이면 --iterations 까지)")
+    parser.add_argument("-n", "--iterations", type=int, default=0, help="가상 사용자별 시나리오 반복 수 (0 이면 제한 없음)")
+    parser.add_argument("--ramp", type=float, default=0, help="가상 사용자를 이 시간(초)에 걸쳐 나눠서 시작")
+    parser.add_argument("--think-ms", type=float, default=0, help="요청 사이 대기(ms, 0~값 사이 무작위)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="요청 타임아웃(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (없으면 stdout)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 비율 (기본 0.2 = 20%%)")
+
+    host = parser.add_argument_group("--self-host 설정")
+    host.add_argument("--server-cmd", default=DEFAULT_SERVER_CMD, help="서버 실행 명령 ({addr} 에 주소가 들어감)")
+    host.add_argument("--server-log", help="서버 출력 저장 파일 (없으면 측정 후 삭제)")
+    host.add_argument("--latency", type=float, default=0, help="가짜 외부 API 응답 지연(ms)")
+    host.add_argument("--jitter", type=float, default=0, help="지연 편차(ms, ±)")
+    host.add_argument("--error-rate", type=float, default=0.0, help="가짜 외부 API 503 비율")
+    host.add_argument("--timeout-rate", type=float, default=0.0, help="가짜 외부 API 504 비율")
+    host.add_argument("--timeout-s", type=float, default=30.0, help="타임아웃 때 기다리는 시간(초)")
+    host.add_argument("--upstream", action="append", help="upstream 별 설정, 예) openai:latency_ms=900,error_rate=0.1")
+    args = parser.parse_args(argv)
+
+    if not args.duration and not args.iterations:
+        parser.error("--duration 과 --iterations 중 하나는 0 보다 커야 합니다")
+
+    host = SelfHost(args) if args.self_host else None
+    with host or nullcontext(args.target) as base_url:
+        args.target = base_url
+        recorder, elapsed = asyncio.run(run(args))
+        upstream_counts = host.upstream_counts() if host else None
+
+    steps, journeys = recorder.report(elapsed)
+    result = {
+        "meta": {
+            "target": "self-host" if args.self_host else args.target,
+            "server_cmd": args.server_cmd if args.self_host else None,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "users": args.users,
+            "scenarios": args.scenario,
+            "duration_s": round(elapsed, 3),
+            "ramp_s": args.ramp,
+            "think_ms": args.think_ms,
+        },
+        "steps": steps,
+        "journeys": journeys,
+    }
+    if upstream_counts is not None:
+        result["meta"]["upstream_calls"] = upstream_counts
+
+    print(format_table(steps), file=sys.stderr)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        lines, regressed = compare(result, baseline, args.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
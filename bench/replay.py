@@ -0,0 +1,151 @@
+"""
+외부 API 응답 녹화/재생 (requests 트랜스포트 어댑터)
+
+core.http.session 에 어댑터를 붙여서 구글/카카오/티맵/OpenAI 호출을 네트워크 없이 처리함
+
+    with replaying("bench/fixtures/upstream.jsonl"):
+        google.search_slot(...)          # 녹화된 응답으로 처리
+
+    with recording("bench/fixtures/new.jsonl"):
+        google.search_slot(...)          # 실제 API 호출 + 응답을 JSONL 로 저장 (API 키 필요)
+
+JSONL 한 줄 = 녹화된 응답 하나
+    {"upstream": "google", "operation": "search_nearby",
+     "method": "POST", "url": "https://places.googleapis.com/v1/places:searchNearby",
+     "body_contains": "...",   # (선택) 요청 본문에 이 문자열이 있어야 매칭
+     "status": 200, "body": {...}}
+- url 은 쿼리스트링을 뺀 주소, fnmatch 패턴 사용 가능 (예: ".../v1/places/*")
+- 위에서부터 처음 매칭되는 줄을 사용 (구체적인 항목을 먼저, 일반적인 항목을 나중에)
+"""
+import fnmatch
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "upstream.jsonl"
+
+
+def load_fixtures(path=FIXTURES):
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("//"):
+                entries.append(json.loads(line))
+    return entries
+
+
+def _plain_url(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def _body_text(request):
+    body = request.body or b""
+    return body.decode("utf-8", "replace") if isinstance(body, bytes) else body
+
+
+def build_response(request, status, body, headers=None):
+    """requests.Response 만들기 (body 는 dict/list 면 JSON, 문자열이면 그대로)"""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = requests.status_codes._codes.get(status, ("",))[0].upper()
+    if isinstance(body, (dict, list)):
+        response._content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json; charset=utf-8"})
+    else:
+        response._content = (body or "").encode("utf-8")
+        response.headers = CaseInsensitiveDict({"Content-Type": "text/plain; charset=utf-8"})
+    response.headers.update(headers or {})
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """녹화된 응답으로만 답하는 어댑터 (매칭되는 녹화가 없으면 ConnectionError)"""
+
+    def __init__(self, entries):
+        super().__init__()
+        self.entries = entries
+        self.calls = 0
+        self.unmatched = []
+
+    def match(self, request):
+        url = _plain_url(request.url)
+        body = None
+        for entry in self.entries:
+            if entry.get("method", "GET").upper() != request.method:
+                continue
+            if not fnmatch.fnmatchcase(url, entry["url"]):
+                continue
+            needle = entry.get("body_contains")
+            if needle:
+                body = _body_text(request) if body is None else body
+                if needle not in body:
+                    continue
+            return entry
+        return None
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        entry = self.match(request)
+        if entry is None:
+            self.unmatched.append(f"{request.method} {_plain_url(request.url)}")
+            raise requests.ConnectionError(f"녹화된 응답 없음: {request.method} {request.url}", request=request)
+        return build_response(request, entry.get("status", 200), entry.get("body"), entry.get("headers"))
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """실제로 호출하고 응답을 JSONL 로 덧붙여 저장 (JSON 이 아닌 응답은 문자열로)"""
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        entry = {
+            "method": request.method,
+            "url": _plain_url(request.url),
+            "status": response.status_code,
+            "body": body,
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return response
+
+
+@contextmanager
+def mounted(adapter, session=None):
+    """core.http.session 의 https:// 어댑터를 잠시 바꿔 끼움"""
+    if session is None:
+        from core import http
+        session = http.session
+    previous = session.adapters.get("https://")
+    session.mount("https://", adapter)
+    try:
+        yield adapter
+    finally:
+        session.mount("https://", previous)
+
+
+def replaying(path=FIXTURES, session=None):
+    return mounted(ReplayAdapter(load_fixtures(path)), session)
+
+
+def recording(path, session=None):
+    return mounted(RecordingAdapter(path), session)
@@ -0,0 +1,273 @@
+"""
+오프라인 벤치마크 - 녹화된 외부 API 응답(bench/fixtures/upstream.jsonl)으로 엔드포인트/함수 성능 측정
+
+    python bench/run.py                          # 전체 측정, 결과 JSON 을 stdout 으로
+    python bench/run.py -o before.json           # 결과를 파일로
+    python bench/run.py --only endpoints -n 100  # 엔드포인트만, 100회씩
+    python bench/run.py --cold                   # 요청마다 응답 캐시(구글 상세/카카오 키워드/티맵 구간)를 비우고 측정
+    python bench/run.py --compare before.json    # 이전 결과와 p50 비교 (--threshold 비율 이상 느려지면 종료 코드 1)
+
+- 엔드포인트: Django 테스트 클라이언트로 순차 호출 (네트워크/워커 없이 앱 자체 처리 시간), 테스트 DB 사용
+- 함수: 엔드포인트 안에서 쓰이는 순수 계산 함수를 timeit 방식으로 반복 측정
+- 외부 API 는 bench/replay.py 어댑터가 녹화 응답으로 대신 답함 (녹화에 없는 호출은 오류로 집계)
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from bench import replay, stats  # noqa: E402
+from core import profiling  # noqa: E402
+
+X, Y = 126.9780, 37.5665  # 서울시청
+DAY = "월요일"
+
+
+def _response_caches():
+    from places.services import kakao
+    return [kakao.keyword_cache]
+
+
+def clear_caches():
+    cache.clear()
+    for c in _response_caches():
+        c.clear()
+
+
+# 엔드포인트 시나리오 ---------------------------------------------------------------
+
+def _saved_session(client, place_ids):
+    """장소 찜하기로 세션을 만들어 session_key 반환 (ai_routes 용)"""
+    session_key = None
+    for place_id in place_ids:
+        response = client.get("/api/places/save_place", {"place_id": place_id})
+        session_key = response.json()["session_key"]
+    return session_key
+
+
+def endpoint_scenarios(fixtures):
+    """이름 -> (client -> response) 호출 함수"""
+    place_ids = [
+        e["body"]["id"] for e in fixtures
+        if e.get("operation") == "place_details" and "*" not in e["url"]
+    ]
+    route_client = Client()
+    session_key = _saved_session(route_client, place_ids[:6])
+
+    return {
+        "recommend": lambda c: c.get("/api/places/recommend", {"x": X, "y": Y, "radius": 2000}),
+        "category_search": lambda c: c.get("/api/places/category_search", {"x": X, "y": Y, "category": "all"}),
+        "card_select": lambda c: c.post(
+            "/api/chats/card_select",
+            {"input_text": "조용한 카페에서 저녁에 산책하고 싶어", "x": X, "y": Y},
+            content_type="application/json",
+        ),
+        "ai_routes": lambda c: route_client.get(
+            "/api/routes/ai_routes", {"session_key": session_key, "day": DAY, "x": X, "y": Y},
+        ),
+        "place_detail": lambda c: c.get("/api/wiki/detail/", {"place_id": place_ids[0]}),
+    }
+
+
+def bench_endpoints(adapter, fixtures, iterations, warmup, cold, names=None):
+    client = Client()
+    results = {}
+    for name, call in endpoint_scenarios(fixtures).items():
+        if names and name not in names:
+            continue
+        for _ in range(warmup):
+            call(client)
+
+        latencies, errors = [], 0
+        queries = profiling.QueryTimer()
+        calls_before = adapter.calls
+        with connection.execute_wrapper(queries):
+            for _ in range(iterations):
+                if cold:
+                    clear_caches()
+                started = time.perf_counter()
+                response = call(client)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+
+        summary = stats.summarize(latencies, errors=errors)
+        summary["upstream_calls"] = round((adapter.calls - calls_before) / iterations, 2)
+        summary["db_queries"] = round(queries.count / iterations, 2)
+        results[name] = summary
+    return results
+
+
+# 함수 마이크로벤치마크 -------------------------------------------------------------
+
+def function_cases(fixtures):
+    """이름 -> 인자 없는 호출 함수 (입력은 녹화 응답으로 한 번 만들어 둠)"""
+    from core import times
+    from places.services import google, schedule, tsp_route, travel_time
+
+    places = google.search_slot(x=X, y=Y, radius=2000)
+    slots = {"radius": "1시간 거리", "budget": "적당한 가격", "vibe": "조용한 분위기", "category": "카페 디저트", "time": "저녁"}
+    keywords = [(src, w) for src in slots.values() for w in src.split() if len(w) >= 2]
+
+    details = {
+        e["body"]["id"]: google.search_detail(e["body"]["id"])
+        for e in fixtures if e.get("operation") == "place_details" and "*" not in e["url"]
+    }
+    filtered = tsp_route.filter(DAY, details)
+    matrix = travel_time.travel_matrix(filtered, refine=False)
+    order = tsp_route.tsp_route(filtered, cycle=False, mylat=X, mylng=Y, matrix=matrix)
+    hours = [e["body"]["regularOpeningHours"] for e in fixtures if e.get("operation") == "place_details" and "*" not in e["url"]]
+
+    return {
+        "google.keyword_match": lambda: google.keyword_match(places, keywords),
+        "times.format_running": lambda: [times.format_running(h) for h in hours],
+        "travel_time.travel_matrix": lambda: travel_time.travel_matrix(filtered, refine=False),
+        "tsp_route.tsp_route": lambda: tsp_route.tsp_route(filtered, cycle=False, mylat=X, mylng=Y, matrix=matrix),
+        "schedule.build_itinerary": lambda: schedule.build_itinerary(
+            filtered, order, times.day_index(DAY), 10 * 60, mylat=Y, mylng=X, matrix=matrix,
+        ),
+    }
+
+
+def _timeit(fn, repeat, target=0.05):
+    """한 라운드가 target 초 정도 되도록 호출 수를 정해서 repeat 라운드 측정 -> 호출당 시간(초) 목록"""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= target / 5 or number >= 1_000_000:
+            break
+        number *= 5
+    number = max(1, int(number * target / max(elapsed, 1e-9)))
+
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - started) / number)
+    return number, rounds
+
+
+def bench_functions(fixtures, repeat, names=None):
+    results = {}
+    for name, fn in function_cases(fixtures).items():
+        if names and name not in names:
+            continue
+        number, rounds = _timeit(fn, repeat)
+        results[name] = {
+            "number": number,
+            "repeat": repeat,
+            "best_us": round(min(rounds) * 1e6, 3),
+            "median_us": round(statistics.median(rounds) * 1e6, 3),
+        }
+    return results
+
+
+# 결과 / 비교 ---------------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def meta(args, fixtures_path):
+    return {
+        "commit": _git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "machine": platform.machine(),
+        "fixtures": os.path.relpath(Path(fixtures_path).resolve(), ROOT),
+        "iterations": args.iterations,
+        "cold": args.cold,
+    }
+
+
+def compare(current, baseline, threshold):
+    """p50(엔드포인트) / median(함수) 비교 결과 줄 목록과 회귀 여부"""
+    lines, regressed = [], False
+    for section, key in (("endpoints", "p50_ms"), ("functions", "median_us")):
+        for name, now in current.get(section, {}).items():
+            before = baseline.get(section, {}).get(name)
+            if not before or not before.get(key):
+                continue
+            ratio = now[key] / before[key] - 1
+            flag = ""
+            if ratio > threshold:
+                flag, regressed = "  <-- 느려짐", True
+            elif ratio < -threshold:
+                flag = "  빨라짐"
+            lines.append(f"{section}/{name}: {before[key]} -> {now[key]} {key} ({ratio:+.1%}){flag}")
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="녹화된 외부 API 응답으로 오프라인 벤치마크")
+    parser.add_argument("--fixtures", default=str(replay.FIXTURES), help="녹화 응답 JSONL")
+    parser.add_argument("--only", choices=["endpoints", "functions"], help="한쪽만 측정")
+    parser.add_argument("--select", nargs="*", help="측정할 엔드포인트/함수 이름")
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="엔드포인트별 측정 요청 수")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=7, help="함수별 측정 라운드 수")
+    parser.add_argument("--cold", action="store_true", help="요청마다 응답 캐시 비우기")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (없으면 stdout)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 비율 (기본 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    setup_test_environment()
+    settings.ALLOWED_HOSTS = ["*"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    fixtures = replay.load_fixtures(args.fixtures)
+    with replay.mounted(replay.ReplayAdapter(fixtures)) as adapter:
+        result = {"meta": meta(args, args.fixtures)}
+        if args.only != "functions":
+            result["endpoints"] = bench_endpoints(adapter, fixtures, args.iterations, args.warmup, args.cold, args.select)
+        if args.only != "endpoints":
+            result["functions"] = bench_functions(fixtures, args.repeat, args.select)
+        if adapter.unmatched:
+            result["meta"]["unmatched_upstream"] = sorted(set(adapter.unmatched))
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        lines, regressed = compare(result, baseline, args.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
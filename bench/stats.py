@@ -0,0 +1,33 @@
+"""
+벤치마크/부하 테스트 공용 통계 (지연 시간 목록 -> 백분위 요약)
+"""
+import math
+
+
+def percentile(sorted_values, p):
+    """정렬된 목록의 p 백분위 (nearest-rank, 비어 있으면 0)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, elapsed=None, errors=0):
+    """지연 시간(초) 목록 -> {"count", "rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "errors", "error_rate"}
+    - elapsed(초): 전체 측정 시간 (없으면 지연 시간 합계, 순차 실행 기준)
+    """
+    values = sorted(latencies)
+    count = len(values)
+    elapsed = sum(values) if elapsed is None else elapsed
+    ms = lambda seconds: round(seconds * 1000, 3)  # noqa: E731
+    return {
+        "count": count,
+        "rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": ms(sum(values) / count) if count else 0.0,
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+        "max_ms": ms(values[-1]) if values else 0.0,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+    }
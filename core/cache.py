@@ -0,0 +1,67 @@
+# 크기 제한(LRU) + 만료 시간(TTL)이 있는 프로세스 내 캐시
+# - 외부 API 응답처럼 같은 요청이 반복되는 결과를 잠깐 들고 있을 때 사용
+# - 적중/미스/축출 횟수는 core.metrics 카운터로 집계 (cache 라벨 = 캐시 이름)
+import threading
+import time
+from collections import OrderedDict
+
+from . import metrics
+
+_hits = metrics.counter("cache_hits_total", "캐시 적중 횟수", ["cache"])
+_misses = metrics.counter("cache_misses_total", "캐시 미스 횟수 (없음 또는 만료)", ["cache"])
+_evictions = metrics.counter("cache_evictions_total", "크기 제한으로 밀려난 항목 수", ["cache"])
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, name, maxsize=1024, ttl=600):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (만료 시각, 값), 오래 안 쓴 것이 앞쪽
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(key)
+                _hits.inc(cache=self.name)
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+        _misses.inc(cache=self.name)
+        return default
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        evicted = 0
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                evicted += 1
+        if evicted:
+            _evictions.inc(evicted, cache=self.name)
+
+    def get_or_set(self, key, loader, ttl=None):
+        """캐시에 있으면 그 값, 없으면 loader() 결과를 저장 후 반환 (loader 예외는 저장하지 않고 그대로 올림)"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
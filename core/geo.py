@@ -0,0 +1,47 @@
+# 위도/경도 컬럼이 있는 모델용 반경 검색
+# - DB 에서는 (latitude, longitude) 복합 인덱스로 bounding box 범위만 먼저 걸러내고
+# - 가져온 행만 하버사인 거리로 정확히 다시 거름
+import math
+
+from django.db import models
+
+from .distance import EARTH_RADIUS_KM, haversine
+
+
+def bounding_box(lat, lng, m):
+    """(lat, lng) 중심 반경 m 미터를 감싸는 (최소 위도, 최대 위도, 최소 경도, 최대 경도)
+    - haversine 과 같은 지구 반지름을 써야 경계에 걸친 점이 bbox 에서 빠지지 않음
+    - 경도 폭은 원의 동서 끝이 아니라 원이 닿는 최대 경도 (asin(sin d / cos lat))
+    """
+    d = m / (EARTH_RADIUS_KM * 1000)  # 각거리(라디안)
+    dlat = math.degrees(d)
+    ratio = math.sin(d) / max(math.cos(math.radians(lat)), 1e-6)
+    dlng = 180.0 if ratio >= 1 else math.degrees(math.asin(ratio))
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+
+class GeoQuerySet(models.QuerySet):
+    lat_field = "latitude"
+    lng_field = "longitude"
+
+    def within_bbox(self, lat, lng, m):
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, m)
+        return self.filter(**{
+            f"{self.lat_field}__gte": min_lat, f"{self.lat_field}__lte": max_lat,
+            f"{self.lng_field}__gte": min_lng, f"{self.lng_field}__lte": max_lng,
+        })
+
+    def within_radius(self, lat, lng, m):
+        """반경 m 미터 안의 객체 목록 (가까운 순, 각 객체에 distance_m 속성 추가)
+        - 거리 계산 후 정렬한 결과라 QuerySet 이 아닌 리스트를 반환
+        """
+        lat, lng = float(lat), float(lng)
+        found = []
+        for obj in self.within_bbox(lat, lng, m):
+            d = haversine(lat, lng, getattr(obj, self.lat_field), getattr(obj, self.lng_field)) * 1000
+            if d <= m:
+                obj.distance_m = round(d)
+                found.append((d, obj))
+        # 반올림 전 거리로 정렬 (1m 안쪽 차이도 순서가 DB 순서에 좌우되지 않도록)
+        found.sort(key=lambda f: f[0])
+        return [obj for _, obj in found]
@@ -0,0 +1,53 @@
+# 한글 자모 분해 / 초성 추출 (검색어 자동완성, 초성 검색용)
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"  # 0번은 받침 없음
+
+_BASE = 0xAC00  # '가'
+_LAST = 0xD7A3  # '힣'
+_CHOSUNG_SET = frozenset(CHOSUNG)
+
+
+def _is_syllable(ch):
+    return _BASE <= ord(ch) <= _LAST
+
+
+def normalize(text):
+    # 공백 제거 + 영문 소문자
+    return "".join((text or "").split()).lower()
+
+
+def decompose(text):
+    """완성형 글자를 자모로 풀어쓰기 (예: '강남' -> 'ㄱㅏㅇㄴㅏㅁ')
+    - 입력 중인 글자('강나')도 풀어쓰면 '강남'의 앞부분이 되므로 타이핑 중 검색에 사용
+    """
+    out = []
+    for ch in normalize(text):
+        if _is_syllable(ch):
+            code = ord(ch) - _BASE
+            cho, rest = divmod(code, 21 * 28)
+            jung, jong = divmod(rest, 28)
+            out.append(CHOSUNG[cho])
+            out.append(JUNGSUNG[jung])
+            if jong:
+                out.append(JONGSUNG[jong])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def chosung(text):
+    """초성만 뽑기 (예: '강남역' -> 'ㄱㄴㅇ'), 한글이 아닌 글자는 그대로"""
+    out = []
+    for ch in normalize(text):
+        if _is_syllable(ch):
+            out.append(CHOSUNG[(ord(ch) - _BASE) // (21 * 28)])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_chosung_query(text):
+    """검색어가 초성으로만 이루어져 있는지 (예: 'ㄱㄴ')"""
+    text = normalize(text)
+    return bool(text) and all(ch in _CHOSUNG_SET for ch in text)
@@ -0,0 +1,115 @@
+# 외부 API 호출 계측
+# - services 모듈의 외부 호출은 http.get/post (또는 SDK 호출은 http.timed) 로 감싸서
+#   upstream(google/kakao/tmap/openai)·operation 별 지연 시간, 응답 코드, 타임아웃, 캐시 적중을 core.metrics 에 기록
+# - 요청 처리 중이면 호출 시간을 요청별 타이밍에도 더함 (core.middleware.ServerTimingMiddleware 가 Server-Timing 헤더로 내보냄)
+import contextvars
+import time
+from contextlib import contextmanager
+
+import requests
+
+from . import metrics
+
+_duration = metrics.histogram(
+    "upstream_request_duration_seconds", "외부 API 호출 시간(초)", ["upstream", "operation"],
+)
+_requests = metrics.counter(
+    "upstream_requests_total", "외부 API 호출 수 (status = HTTP 코드 / timeout / error)", ["upstream", "operation", "status"],
+)
+_cache = metrics.counter(
+    "upstream_cache_total", "외부 API 응답 캐시 조회 결과 (result = hit / miss)", ["upstream", "operation", "result"],
+)
+
+# 커넥션 재사용용 공용 세션 (같은 호스트로 반복 호출 시 TCP/TLS 연결을 다시 맺지 않음)
+session = requests.Session()
+
+
+class RequestTiming:
+    """요청 하나 동안의 외부 호출 시간 합계 (upstream 별, 초)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.upstreams = {}  # upstream -> [호출 수, 시간 합계]
+
+    def add(self, upstream, elapsed):
+        entry = self.upstreams.setdefault(upstream, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+
+    @property
+    def upstream_total(self):
+        return sum(elapsed for _, elapsed in self.upstreams.values())
+
+
+_current = contextvars.ContextVar("request_timing", default=None)
+
+
+def start_request():
+    """요청별 타이밍 시작 - 반환한 토큰은 finish_request 에 넘김"""
+    return _current.set(RequestTiming())
+
+
+def finish_request(token):
+    timing = _current.get()
+    _current.reset(token)
+    return timing
+
+
+def bind(fn):
+    """스레드 풀에서 실행할 함수에 현재 요청의 타이밍을 이어 붙임 (executor.submit(http.bind(fn), ...))"""
+    ctx = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return ctx.run(fn, *args, **kwargs)
+    return run
+
+
+def _status_of(exc):
+    if isinstance(exc, requests.Timeout) or "Timeout" in type(exc).__name__:
+        return "timeout"
+    return "error"
+
+
+def _record(upstream, operation, status, elapsed):
+    _duration.observe(elapsed, upstream=upstream, operation=operation)
+    _requests.inc(upstream=upstream, operation=operation, status=status)
+    timing = _current.get()
+    if timing is not None:
+        timing.add(upstream, elapsed)
+
+
+@contextmanager
+def timed(upstream, operation):
+    """SDK 등 requests 가 아닌 외부 호출 계측 (예외 없이 끝나면 status="ok")"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        _record(upstream, operation, _status_of(e), time.perf_counter() - started)
+        raise
+    _record(upstream, operation, "ok", time.perf_counter() - started)
+
+
+def request(upstream, operation, method, url, **kwargs):
+    """requests 호출 + 계측 (예외는 그대로 올림)"""
+    started = time.perf_counter()
+    try:
+        response = session.request(method, url, **kwargs)
+    except requests.RequestException as e:
+        _record(upstream, operation, _status_of(e), time.perf_counter() - started)
+        raise
+    _record(upstream, operation, str(response.status_code), time.perf_counter() - started)
+    return response
+
+
+def get(upstream, operation, url, **kwargs):
+    return request(upstream, operation, "GET", url, **kwargs)
+
+
+def post(upstream, operation, url, **kwargs):
+    return request(upstream, operation, "POST", url, **kwargs)
+
+
+def cache_result(upstream, operation, hit):
+    """외부 API 응답 캐시 조회 결과 기록"""
+    _cache.inc(upstream=upstream, operation=operation, result="hit" if hit else "miss")
@@ -0,0 +1,43 @@
+# 로깅 설정용 포매터/필터 (settings.LOGGING 에서 사용)
+# - JsonFormatter: 한 줄에 JSON 하나 (수집기에서 바로 파싱)
+# - DebugSamplingFilter: DEBUG 로그는 일부만 남김 (INFO 이상은 모두 통과)
+# 로그 메시지는 logger.debug("... %s", value) 처럼 인자를 따로 넘겨서,
+# 해당 레벨이 꺼져 있으면 문자열 포매팅 자체가 일어나지 않도록 함
+import json
+import logging
+import random
+from datetime import datetime, timezone
+
+# LogRecord 기본 속성 (이 외의 속성은 extra= 로 넘긴 값으로 보고 JSON 에 포함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DebugSamplingFilter(logging.Filter):
+    """DEBUG 이하 로그를 rate 비율만 통과시킴 (0이면 모두 버림, 1이면 모두 통과)"""
+
+    def __init__(self, rate=1.0, name=""):
+        super().__init__(name)
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return self.rate > 0 and random.random() < self.rate
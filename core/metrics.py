@@ -0,0 +1,149 @@
+# 프로세스 내 지표(카운터/히스토그램) 모음
+# - 캐시 적중률, 외부 API 지연 시간 등 운영 지표를 메모리에 모아 두고 /metrics 에서 Prometheus 텍스트 형식으로 내보냄
+# - 워커(프로세스)마다 따로 집계되므로 스크레이퍼 쪽에서 합산
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _label_text(labelnames, values):
+    if not labelnames:
+        return ""
+    pairs = []
+    for name, value in zip(labelnames, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    """단조 증가 카운터 (라벨 값 조합별로 따로 셈)"""
+    kind = "counter"
+
+    def __init__(self, name, help="", labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨은 {self.labelnames} 이어야 합니다.")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _label_text(self.labelnames, key), value) for key, value in items]
+
+
+class Histogram:
+    """관측값 분포 (누적 버킷 + 합계 + 개수, 라벨 값 조합별로 따로 셈)"""
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, name, help="", labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # 라벨 -> [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    _key = Counter._key
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def count(self, **labels):
+        entry = self._values.get(self._key(labels))
+        return entry[-1] if entry else 0
+
+    def sum(self, **labels):
+        entry = self._values.get(self._key(labels))
+        return entry[-2] if entry else 0.0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(entry)) for key, entry in self._values.items())
+        result = []
+        for key, entry in items:
+            names = self.labelnames + ("le",)
+            for bound, n in zip(self.buckets, entry):
+                result.append((f"{self.name}_bucket", _label_text(names, key + (repr(float(bound)),)), n))
+            result.append((f"{self.name}_bucket", _label_text(names, key + ("+Inf",)), entry[-1]))
+            result.append((f"{self.name}_sum", _label_text(self.labelnames, key), entry[-2]))
+            result.append((f"{self.name}_count", _label_text(self.labelnames, key), entry[-1]))
+        return result
+
+
+def _get_or_create(cls, name, help, labelnames, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, help, labelnames, **kwargs)
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"{name}: 이미 다른 형식으로 등록된 지표입니다.")
+        return metric
+
+
+def counter(name, help="", labelnames=()):
+    """이름으로 카운터를 가져옴 (없으면 등록)"""
+    return _get_or_create(Counter, name, help, labelnames)
+
+
+def histogram(name, help="", labelnames=(), buckets=Histogram.DEFAULT_BUCKETS):
+    """이름으로 히스토그램을 가져옴 (없으면 등록)"""
+    return _get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+
+def render():
+    """등록된 지표 전체를 Prometheus 텍스트 형식으로"""
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    lines = []
+    for metric in metrics:
+        if metric.help:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{labels} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _allowed(request):
+    # 스크레이퍼는 Authorization: Bearer <METRICS_TOKEN>, 사람은 스태프 로그인으로 확인 (둘 다 아니면 거부)
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token and request.headers.get("Authorization") == f"Bearer {token}":
+        return True
+    user = getattr(request, "user", None)
+    return bool(user is not None and user.is_staff)
+
+
+def metrics_view(request):
+    """GET /metrics - 스태프 또는 METRICS_TOKEN 을 가진 스크레이퍼만 (토큰이 비어 있으면 스태프만)"""
+    if not _allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type="text/plain; version=0.0.4; charset=utf-8")
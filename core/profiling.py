@@ -0,0 +1,186 @@
+# 요청 프로파일링 (core.middleware.ProfilingMiddleware 에서 사용)
+# - cprofile: cProfile 로 함수별 호출 수/시간 (정확하지만 요청이 2배 정도 느려짐)
+# - sample: 별도 스레드가 interval 마다 요청 스레드의 스택을 찍어서 함수별 비율 집계 (부하가 작아 샘플링 운영용)
+# - DB 쿼리 수/시간은 두 방식 모두 connection.execute_wrapper 로 측정
+# - 결과는 프로세스별 링 버퍼(최근 N개)에 보관하고 /api/wiki/debug/profiles/ 에서 조회 (스태프 전용)
+import cProfile
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+MODES = ("cprofile", "sample")
+
+_lock = threading.Lock()
+_ids = itertools.count(1)
+_buffer = deque(maxlen=getattr(settings, "PROFILE_BUFFER_SIZE", 50))
+
+
+def _location(filename, lineno, name):
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base):
+        filename = os.path.relpath(filename, base)
+    return f"{filename}:{lineno}({name})"
+
+
+class QueryTimer:
+    """execute_wrapper - 실행된 쿼리 수와 시간 합계"""
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.elapsed += time.perf_counter() - started
+
+
+class _Sampler(threading.Thread):
+    """대상 스레드의 스택을 interval 초마다 찍어서 함수별 샘플 수 집계"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="request-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.inclusive = Counter()  # 스택 어딘가에 있던 횟수
+        self.exclusive = Counter()  # 스택 맨 위(실제 실행 중)였던 횟수
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            seen = set()
+            top = True
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_filename, code.co_firstlineno, code.co_name)
+                if top:
+                    self.exclusive[key] += 1
+                    top = False
+                if key not in seen:
+                    seen.add(key)
+                    self.inclusive[key] += 1
+                frame = frame.f_back
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def top(self, n):
+        total = self.samples or 1
+        return [
+            {
+                "function": _location(*key),
+                "samples": count,
+                "self_samples": self.exclusive[key],
+                "percent": round(count * 100 / total, 1),
+            }
+            for key, count in self.inclusive.most_common(n)
+        ]
+
+
+class Profile:
+    """요청 하나의 프로파일 - with 블록 안의 실행을 측정"""
+
+    def __init__(self, mode="sample", top_n=30, interval=0.005):
+        self.mode = mode
+        self.top_n = top_n
+        self.interval = interval
+        self.queries = QueryTimer()
+        self.elapsed = 0.0
+        self._profiler = None
+        self._sampler = None
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self.queries))
+        if self.mode == "cprofile":
+            try:
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+            except ValueError:
+                # 다른 프로파일러가 이미 켜져 있으면(동시 요청, Python 3.12+) 샘플링으로 대체
+                self._profiler = None
+                self.mode = "sample"
+        if self.mode == "sample":
+            self._sampler = _Sampler(threading.get_ident(), self.interval)
+            self._sampler.start()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        self._stack.close()
+        return False
+
+    def top(self):
+        if self._sampler is not None:
+            return self._sampler.top(self.top_n)
+        stats = pstats.Stats(self._profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top_n]
+        return [
+            {
+                "function": _location(*key),
+                "calls": ncalls,
+                "tottime_ms": round(tottime * 1000, 2),
+                "cumtime_ms": round(cumtime * 1000, 2),
+            }
+            for key, (_, ncalls, tottime, cumtime, _callers) in rows
+        ]
+
+
+def record(request, response, profile):
+    """링 버퍼에 결과 저장 후 id 반환"""
+    entry = {
+        "id": next(_ids),
+        "created_at": timezone.now(),
+        "method": request.method,
+        "path": request.get_full_path(),
+        "status": response.status_code,
+        "mode": profile.mode,
+        "duration_ms": round(profile.elapsed * 1000, 1),
+        "db_queries": profile.queries.count,
+        "db_time_ms": round(profile.queries.elapsed * 1000, 1),
+        "top": profile.top(),
+    }
+    with _lock:
+        _buffer.append(entry)
+    return entry["id"]
+
+
+def entries():
+    """보관 중인 프로파일 (최근 것부터)"""
+    with _lock:
+        return list(reversed(_buffer))
+
+
+def get(profile_id):
+    with _lock:
+        return next((e for e in _buffer if e["id"] == profile_id), None)
+
+
+def clear():
+    with _lock:
+        _buffer.clear()
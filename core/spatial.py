@@ -0,0 +1,81 @@
+# 격자(grid) 공간 인덱스 - 좌표 근처 항목 k개를 외부 API 없이 찾기
+import heapq
+import math
+from collections import defaultdict
+
+from .distance import haversine
+
+KM_PER_LAT_DEGREE = 111.32
+
+
+class GridIndex:
+    """위경도 점을 cell_km 크기 격자에 나눠 담아 두고, 가까운 칸부터 넓혀 가며 검색
+    - 서울/수도권처럼 좁은 범위의 점 수백~수천 개 기준 (경도 칸 크기는 평균 위도로 계산)
+    """
+
+    def __init__(self, points, cell_km=1.0):
+        # points: (위도, 경도, 항목) 목록
+        self.cell_km = cell_km
+        self.points = [(float(lat), float(lng), item) for lat, lng, item in points]
+        mean_lat = (sum(p[0] for p in self.points) / len(self.points)) if self.points else 37.5
+        self._dlat = cell_km / KM_PER_LAT_DEGREE
+        self._dlng = cell_km / (KM_PER_LAT_DEGREE * math.cos(math.radians(mean_lat)))
+
+        self._cells = defaultdict(list)
+        for i, (lat, lng, _) in enumerate(self.points):
+            self._cells[self._cell(lat, lng)].append(i)
+        if self._cells:
+            rows = [c[0] for c in self._cells]
+            cols = [c[1] for c in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cell(self, lat, lng):
+        return math.floor(lat / self._dlat), math.floor(lng / self._dlng)
+
+    def _ring(self, row, col, r):
+        # (row, col) 에서 r 칸 떨어진 테두리 칸들
+        if r == 0:
+            yield row, col
+            return
+        for c in range(col - r, col + r + 1):
+            yield row - r, c
+            yield row + r, c
+        for rr in range(row - r + 1, row + r):
+            yield rr, col - r
+            yield rr, col + r
+
+    def _max_ring(self, row, col):
+        # 이 반경을 넘으면 모든 칸을 다 본 것
+        r0, r1, c0, c1 = self._bounds
+        return max(abs(row - r0), abs(row - r1), abs(col - c0), abs(col - c1))
+
+    def nearest(self, lat, lng, k=1, max_km=None):
+        """(거리 km, 항목) 을 가까운 순으로 최대 k개"""
+        if not self.points or k <= 0:
+            return []
+        row, col = self._cell(lat, lng)
+        last_ring = self._max_ring(row, col)
+        if max_km is not None:
+            last_ring = min(last_ring, math.ceil(max_km / (self.cell_km * 0.9)) + 1)
+
+        heap = []  # 최대 힙 (-거리, 번호)
+        for r in range(last_ring + 1):
+            # r 번째 테두리 칸의 점은 최소 (r - 1) 칸 거리만큼 떨어져 있음
+            # (경도 칸 크기는 위도에 따라 조금씩 달라서 여유를 둠)
+            if len(heap) >= k and (r - 1) * self.cell_km * 0.9 > -heap[0][0]:
+                break
+            for cell in self._ring(row, col, r):
+                for i in self._cells.get(cell, ()):
+                    p_lat, p_lng, _ = self.points[i]
+                    d = haversine(lat, lng, p_lat, p_lng)
+                    if max_km is not None and d > max_km:
+                        continue
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d, i))
+                    elif d < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d, i))
+
+        return [(d, self.points[i][2]) for d, i in sorted((-nd, i) for nd, i in heap)]
@@ -0,0 +1,313 @@
+import math
+import random
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import times
+from core.cache import TTLCache
+from core.distance import haversine
+from core.geo import bounding_box
+from core.spatial import GridIndex
+from core.text_index import TextIndex
+from core.times import MINUTES_PER_WEEK, week_minute
+from places.models import SubwayLines
+
+
+def _period(day, open_at, close_at, close_day=None):
+    """(요일, "HH:MM", "HH:MM") -> regularOpeningHours.periods 항목"""
+    oh, om = map(int, open_at.split(":"))
+    ch, cm = map(int, close_at.split(":"))
+    return {
+        "open": {"day": day, "hour": oh, "minute": om},
+        "close": {"day": day if close_day is None else close_day, "hour": ch, "minute": cm},
+    }
+
+
+def _hours(*periods, descriptions=()):
+    return times.compile_hours({"periods": list(periods), "weekdayDescriptions": list(descriptions)})
+
+
+SUN, MON, SAT = 0, 1, 6
+
+
+class OpeningHoursTests(SimpleTestCase):
+    """core.times.OpeningHours 의 주 기준 분 조회 (bisect + 토요일 -> 일요일 넘김)"""
+
+    def test_overnight_wraps_saturday_into_sunday(self):
+        h = _hours(_period(SAT, "20:00", "02:00", close_day=SUN))
+        self.assertTrue(h.is_open_at(week_minute(SAT, 23 * 60)))
+        self.assertTrue(h.is_open_at(week_minute(SUN, 60)))
+        self.assertFalse(h.is_open_at(week_minute(SUN, 2 * 60)))
+        # 토요일 23:00 에 들어가면 일요일 02:00 (다음 주 기준 분) 까지 영업
+        t = week_minute(SAT, 23 * 60)
+        self.assertEqual(h.closes_at(t), t + 3 * 60)
+        self.assertTrue(h.is_open_during(t, t + 3 * 60))
+        self.assertFalse(h.is_open_during(t, t + 3 * 60 + 1))
+        # 일요일 새벽은 전날 영업시간이 이어진 것
+        self.assertTrue(h.overlaps(SUN, 0, 30))
+        self.assertFalse(h.is_open_on(SUN))
+
+    def test_24h_days(self):
+        h = _hours(descriptions=[f"{d}: 24시간 영업" for d in times.DAYS])
+        self.assertEqual(h.all_day, frozenset(range(7)))
+        self.assertTrue(h.is_open_at(week_minute(MON, 3 * 60)))
+        self.assertEqual(h.closes_at(week_minute(MON, 0)), math.inf)
+        self.assertTrue(h.is_open_during(0, 3 * MINUTES_PER_WEEK))
+
+        # 월요일만 24시간이면 월요일 끝(화요일 00:00)에 닫음
+        monday = _hours(_period(MON, "00:00", "00:00"), descriptions=["월요일: 24시간 영업"])
+        self.assertEqual(monday.closes_at(week_minute(MON, 600)), week_minute(MON + 1))
+        self.assertEqual(monday.lines[MON], "월요일 24시간 영업")
+
+    def test_lunch_break(self):
+        h = _hours(_period(MON, "11:00", "15:00"), _period(MON, "17:00", "22:00"))
+        self.assertTrue(h.is_open_at(week_minute(MON, 14 * 60)))
+        self.assertFalse(h.is_open_at(week_minute(MON, 16 * 60)))
+        self.assertEqual(h.closes_at(week_minute(MON, 12 * 60)), week_minute(MON, 15 * 60))
+        self.assertFalse(h.is_open_during(week_minute(MON, 14 * 60), week_minute(MON, 18 * 60)))
+        self.assertEqual(h.next_open(week_minute(MON, 15 * 60)), week_minute(MON, 17 * 60))
+        self.assertTrue(h.overlaps(MON, 16 * 60, 17 * 60 + 1))
+        self.assertFalse(h.overlaps(MON, 15 * 60, 17 * 60))
+        self.assertEqual(h.day_lines(MON), ["월요일 11:00-22:00", "월요일 15:00-17:00"])
+
+    def test_empty_schedule(self):
+        h = _hours()
+        self.assertFalse(h.has_hours)
+        self.assertFalse(h.is_open_at(0))
+        self.assertIsNone(h.closes_at(0))
+        self.assertIsNone(h.next_open(0))
+        self.assertFalse(h.overlaps(MON, 0, times.MINUTES_PER_DAY))
+        self.assertEqual(h.open_days, set())
+
+    def test_next_open_across_week_boundary(self):
+        h = _hours(_period(MON, "10:00", "18:00"))
+        t = week_minute(SAT, 12 * 60)
+        self.assertEqual(h.next_open(t), MINUTES_PER_WEEK + week_minute(MON, 10 * 60))
+        # 다음 주로 넘어간 시각도 그대로 받음
+        later = MINUTES_PER_WEEK + week_minute(MON, 19 * 60)
+        self.assertEqual(h.next_open(later), 2 * MINUTES_PER_WEEK + week_minute(MON, 10 * 60))
+        self.assertTrue(h.is_open_at(MINUTES_PER_WEEK + week_minute(MON, 11 * 60)))
+
+
+class TextIndexTests(SimpleTestCase):
+    def test_rank_pool_caps_collected_matches(self):
+        index = TextIndex()
+        for i in range(500):
+            index.add(f"가게{i}", {"name": f"가게{i}", "score": i})
+        rank = lambda item: -item["score"]  # noqa: E731
+        # 추가한 순서로 pool 개까지만 모아서 정렬
+        top = index.search("가게", limit=3, rank=rank, pool=50)
+        self.assertEqual([t["score"] for t in top], [49, 48, 47])
+        top = index.search("ㄱㄱ", limit=3, rank=rank, pool=50)
+        self.assertEqual([t["score"] for t in top], [49, 48, 47])
+        # rank 가 없으면 limit 개에서 멈춤
+        self.assertEqual([t["score"] for t in index.search("가게", limit=3)], [0, 1, 2])
+
+    def test_prefix_before_substring(self):
+        index = TextIndex()
+        for name in ["서울숲", "숲속카페", "서울역"]:
+            index.add(name, name)
+        self.assertEqual(index.search("숲"), ["숲속카페", "서울숲"])
+        self.assertEqual(index.search("서우"), ["서울숲", "서울역"])  # 입력 중인 마지막 글자
+
+
+class GridIndexTests(SimpleTestCase):
+    """GridIndex.nearest 가 전체를 다 재 보는 방식(brute force)과 같은 결과인지"""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.points = [(37.45 + rng.random() * 0.2, 126.85 + rng.random() * 0.3, i) for i in range(400)]
+        self.grid = GridIndex(self.points, cell_km=1.0)
+
+    def brute(self, lat, lng, k, max_km=None):
+        found = sorted((haversine(lat, lng, p_lat, p_lng), i) for p_lat, p_lng, i in self.points)
+        if max_km is not None:
+            found = [f for f in found if f[0] <= max_km]
+        return found[:k]
+
+    def check(self, lat, lng, k, max_km=None):
+        got = self.grid.nearest(lat, lng, k=k, max_km=max_km)
+        expected = self.brute(lat, lng, k, max_km)
+        self.assertEqual([round(d, 9) for d, _ in got], [round(d, 9) for d, _ in expected])
+
+    def test_random_queries(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            lat, lng = 37.4 + rng.random() * 0.3, 126.8 + rng.random() * 0.4  # 범위 밖 포함
+            k = rng.choice([1, 3, 10])
+            with self.subTest(lat=lat, lng=lng, k=k):
+                self.check(lat, lng, k)
+                self.check(lat, lng, k, max_km=rng.choice([0.5, 2.0]))
+
+    def test_cell_boundaries(self):
+        # 질의 좌표가 격자 선 위/바로 옆일 때
+        dlat, dlng = self.grid._dlat, self.grid._dlng
+        for row in range(math.floor(37.46 / dlat), math.floor(37.64 / dlat), 3):
+            for col in range(math.floor(126.86 / dlng), math.floor(127.14 / dlng), 4):
+                for eps in (0.0, 1e-9, -1e-9):
+                    self.check(row * dlat + eps, col * dlng - eps, 3)
+
+    def test_empty_cells_and_index(self):
+        # 점 두 개가 멀리 떨어져 있고 질의 칸과 그 주변 칸은 모두 비어 있음
+        grid = GridIndex([(37.50, 126.90, "a"), (37.60, 127.10, "b")], cell_km=0.5)
+        self.assertEqual([item for _, item in grid.nearest(37.56, 127.02, k=2)], ["b", "a"])
+        self.assertEqual(grid.nearest(37.56, 127.02, k=1, max_km=1.0), [])
+        self.assertEqual(GridIndex([]).nearest(37.5, 127.0, k=3), [])
+        self.assertEqual(grid.nearest(37.5, 126.9, k=0), [])
+
+
+def _offset(lat, lng, m, bearing):
+    """(lat, lng) 에서 bearing(도) 방향으로 m 미터 떨어진 좌표 (구면 공식)"""
+    d = m / (6371.0 * 1000)
+    b, p1, l1 = math.radians(bearing), math.radians(lat), math.radians(lng)
+    p2 = math.asin(math.sin(p1) * math.cos(d) + math.cos(p1) * math.sin(d) * math.cos(b))
+    l2 = l1 + math.atan2(math.sin(b) * math.sin(d) * math.cos(p1), math.cos(d) - math.sin(p1) * math.sin(p2))
+    return math.degrees(p2), math.degrees(l2)
+
+
+class BoundingBoxTests(SimpleTestCase):
+    def test_circle_fits_inside_box(self):
+        # 원 둘레 위의 점(반경 m)이 모두 bbox 안에 있어야 within_radius 가 놓치지 않음
+        for lat, m in [(37.55, 50), (37.55, 1000), (37.55, 20000), (0.0, 5000), (70.0, 5000), (-33.9, 3000)]:
+            min_lat, max_lat, min_lng, max_lng = bounding_box(lat, 127.0, m)
+            for bearing in range(0, 360, 5):
+                p_lat, p_lng = _offset(lat, 127.0, m * 0.999999, bearing)
+                with self.subTest(lat=lat, m=m, bearing=bearing):
+                    self.assertTrue(min_lat <= p_lat <= max_lat)
+                    self.assertTrue(min_lng <= p_lng <= max_lng)
+
+    def test_box_is_tight(self):
+        # 남북 끝은 정확히 m 미터, 동서 폭도 m 미터에서 크게 벗어나지 않음
+        min_lat, max_lat, min_lng, max_lng = bounding_box(37.55, 127.0, 1000)
+        self.assertAlmostEqual(haversine(37.55, 127.0, max_lat, 127.0) * 1000, 1000, places=3)
+        self.assertAlmostEqual(haversine(37.55, 127.0, min_lat, 127.0) * 1000, 1000, places=3)
+        self.assertAlmostEqual(haversine(37.55, 127.0, 37.55, max_lng) * 1000, 1000, delta=1)
+        self.assertAlmostEqual(127.0 - min_lng, max_lng - 127.0)
+
+    def test_pole(self):
+        min_lat, max_lat, min_lng, max_lng = bounding_box(90.0, 0.0, 1000)
+        self.assertEqual((min_lng, max_lng), (-180.0, 180.0))
+
+
+class GeoQuerySetTests(TestCase):
+    """within_bbox/within_radius 가 전체 하버사인 비교(brute force)와 같은 결과인지"""
+
+    origin = (37.5665, 126.9780)
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(3)
+        lat0, lng0 = cls.origin
+        rows = [
+            SubwayLines(line="1", station=f"역{i}", latitude=lat0 + (rng.random() - 0.5) * 0.04,
+                        longitude=lng0 + (rng.random() - 0.5) * 0.05)
+            for i in range(300)
+        ]
+        # 반경 바로 안/밖, bbox 모서리(bbox 안이지만 원 밖)
+        for name, m, bearing in [("안", 999, 0), ("밖", 1001, 90), ("모서리", 1300, 45)]:
+            lat, lng = _offset(lat0, lng0, m, bearing)
+            rows.append(SubwayLines(line="2", station=name, latitude=lat, longitude=lng))
+        SubwayLines.objects.bulk_create(rows)
+
+    def brute(self, m):
+        lat0, lng0 = self.origin
+        found = []
+        for s in SubwayLines.objects.all():
+            d = haversine(lat0, lng0, s.latitude, s.longitude) * 1000
+            if d <= m:
+                found.append((d, s.id))
+        return [i for _, i in sorted(found)]
+
+    def test_within_radius_matches_brute_force(self):
+        for m in (100, 500, 1000, 1500, 3000):
+            with self.subTest(m=m):
+                got = SubwayLines.objects.within_radius(*self.origin, m)
+                self.assertEqual([s.id for s in got], self.brute(m))
+                self.assertEqual([s.distance_m for s in got], sorted(s.distance_m for s in got))
+                self.assertTrue(all(s.distance_m <= m for s in got))
+
+    def test_post_filter_drops_bbox_corners(self):
+        names = {s.station for s in SubwayLines.objects.within_bbox(*self.origin, 1000)}
+        self.assertIn("모서리", names)  # 위도/경도 범위로는 걸리지만
+        names = {s.station for s in SubwayLines.objects.within_radius(*self.origin, 1000)}
+        self.assertIn("안", names)
+        self.assertNotIn("밖", names)
+        self.assertNotIn("모서리", names)  # 실제 거리는 반경 밖
+
+    def test_within_bbox_is_superset_and_chains(self):
+        bbox_ids = set(SubwayLines.objects.within_bbox(*self.origin, 1000).values_list("id", flat=True))
+        self.assertTrue(set(self.brute(1000)) <= bbox_ids)
+        # QuerySet 이라 다른 조건과 이어 붙일 수 있음
+        only_line2 = SubwayLines.objects.filter(line="2").within_radius(*self.origin, 1000)
+        self.assertEqual([s.station for s in only_line2], ["안"])
+        self.assertEqual(SubwayLines.objects.within_radius(0.0, 0.0, 1000), [])
+
+
+class TTLCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("core.cache.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_expiry(self):
+        c = TTLCache("test", ttl=10)
+        c.set("a", 1)
+        c.set("b", 2, ttl=30)
+        self.now += 9.9
+        self.assertEqual(c.get("a"), 1)
+        self.now += 0.1  # 만료 시각부터는 없음
+        self.assertIsNone(c.get("a"))
+        self.assertEqual(c.get("b"), 2)
+        self.assertEqual(len(c), 1)  # 만료된 항목은 조회할 때 지움
+
+    def test_lru_eviction(self):
+        c = TTLCache("test", maxsize=2)
+        c.set("a", 1)
+        c.set("b", 2)
+        c.get("a")       # a 를 최근 사용으로
+        c.set("c", 3)    # 가장 오래 안 쓴 b 가 밀려남
+        self.assertEqual((c.get("a"), c.get("b"), c.get("c")), (1, None, 3))
+        self.assertEqual(len(c), 2)
+
+    def test_get_or_set(self):
+        c = TTLCache("test", ttl=10)
+        loader = mock.Mock(return_value="v")
+        self.assertEqual(c.get_or_set("k", loader), "v")
+        self.assertEqual(c.get_or_set("k", loader), "v")
+        self.assertEqual(loader.call_count, 1)
+        self.now += 10
+        c.get_or_set("k", loader)
+        self.assertEqual(loader.call_count, 2)
+
+        # loader 예외는 저장하지 않음 (다음 호출에서 다시 시도)
+        failing = mock.Mock(side_effect=[RuntimeError("boom"), "ok"])
+        with self.assertRaises(RuntimeError):
+            c.get_or_set("x", failing)
+        self.assertEqual(c.get_or_set("x", failing), "ok")
+
+
+class MetricsViewTests(TestCase):
+    def test_denied_by_default(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        user = User.objects.create_user("user", password="pw")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+    def test_staff_allowed(self):
+        staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("# TYPE", response.content.decode())
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_bearer_token(self):
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").status_code, 200)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_empty_token_does_not_match(self):
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer ").status_code, 403)
@@ -0,0 +1,156 @@
+# 메모리 검색 인덱스 (접두어 트라이 + n-gram), 한글은 자모 단위로 색인해서 입력 중인 글자도 매칭
+from collections import defaultdict
+
+from .hangul import chosung, decompose, is_chosung_query, normalize
+
+NGRAM = 3  # 자모 3개 = 받침 없는 한 글자 + 다음 초성 정도
+RANK_POOL = 200  # rank 정렬할 때 그룹마다 모으는 최대 후보 수 (한두 글자 검색어로 전체를 훑지 않도록)
+
+
+def _grams(text, n):
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _match_at(text, q, pos):
+    # text[pos:] 가 q 로 시작하는지, q 의 마지막 글자는 입력 중일 수 있으니 자모 접두어로 비교
+    # (자모 단위 비교만 하면 '역삼'이 '역사문'의 다음 글자 초성까지 이어 붙여 매칭되는 것 방지)
+    head = len(q) - 1
+    return (text.startswith(q[:head], pos) and pos + head < len(text)
+            and decompose(text[pos + head]).startswith(decompose(q[head])))
+
+
+def _contains(text, q):
+    return any(_match_at(text, q, pos) for pos in range(len(text) - len(q) + 1))
+
+
+class TextIndex:
+    """이름 -> 항목 검색 인덱스
+    - search(q): 자모 기준 접두어 일치 먼저, 그다음 부분 문자열 일치 (rank 가 없으면 각각 추가한 순서대로)
+    - 초성으로만 된 검색어('ㄱㄴ')는 초성 문자열에서 부분 문자열 검색
+    - key 를 주고 추가한 항목은 같은 key 로 다시 add 하면 갱신, discard 로 삭제
+    """
+
+    def __init__(self):
+        self._by_key = {}
+        self._dead = 0
+        self.items = []
+        self._names = []     # 공백 제거/소문자 이름
+        self._keys = []      # 자모 풀어쓴 이름
+        self._chosung = []   # 초성 문자열
+        self._trie = {}      # 글자 -> 자식 노드, 노드의 None 키에 해당 접두어를 가진 항목 번호 목록
+        self._grams = defaultdict(list)          # 자모 1~NGRAM 글자 -> 항목 번호 목록
+        self._chosung_grams = defaultdict(list)  # 초성 1~2 글자 -> 항목 번호 목록
+
+    def __len__(self):
+        return len(self.items) - self._dead
+
+    def add(self, name, item, key=None):
+        if key is not None and key in self._by_key:
+            i = self._by_key[key]
+            if self._names[i] == normalize(name):
+                self.items[i] = item  # 이름이 같으면 색인은 그대로 두고 항목만 교체
+                return
+            self.discard(key)
+        i = len(self.items)
+        if key is not None:
+            self._by_key[key] = i
+        jamo = decompose(name)
+        cho = chosung(name)
+        self.items.append(item)
+        self._names.append(normalize(name))
+        self._keys.append(jamo)
+        self._chosung.append(cho)
+
+        node = self._trie
+        for ch in jamo:
+            node = node.setdefault(ch, {})
+            node.setdefault(None, []).append(i)
+
+        for n in range(1, NGRAM + 1):
+            for g in _grams(jamo, n):
+                self._grams[g].append(i)
+        for n in (1, 2):
+            for g in _grams(cho, n):
+                self._chosung_grams[g].append(i)
+
+    def discard(self, key):
+        # 색인에서 바로 빼지는 않고 빈 자리로 표시 (검색 결과에서 제외)
+        i = self._by_key.pop(key, None)
+        if i is not None and self.items[i] is not None:
+            self.items[i] = None
+            self._dead += 1
+
+    @property
+    def garbage_ratio(self):
+        return self._dead / len(self.items) if self.items else 0.0
+
+    def _prefix(self, key):
+        node = self._trie
+        for ch in key:
+            node = node.get(ch)
+            if node is None:
+                return []
+        return node.get(None, [])
+
+    @staticmethod
+    def _candidates(grams, q, n):
+        # q 의 n-gram 목록들의 교집합 (가장 짧은 목록부터)
+        postings = sorted((grams.get(g, ()) for g in _grams(q, n)), key=len)
+        if not postings or not postings[0]:
+            return []
+        found = set(postings[0])
+        for p in postings[1:]:
+            found.intersection_update(p)
+            if not found:
+                break
+        return sorted(found)
+
+    def _finish(self, groups, limit, rank):
+        result = []
+        for group in groups:
+            group = [i for i in group if self.items[i] is not None]
+            if rank is not None:
+                group.sort(key=lambda i: rank(self.items[i]))
+            result.extend(group)
+            if len(result) >= limit:
+                break
+        return [self.items[i] for i in result[:limit]]
+
+    def search(self, q, limit=10, rank=None, pool=RANK_POOL):
+        """rank: 항목 -> 정렬 키 (접두어 일치/부분 일치 그룹 안에서 정렬), 없으면 추가한 순서
+        - rank 가 있으면 그룹마다 추가한 순서로 최대 pool 개까지 모아서 정렬
+          (그보다 많이 걸리는 짧은 검색어는 먼저 추가한 항목 중에서 고름, 중요한 항목을 먼저 add 할 것)
+        """
+        cap = limit if rank is None else max(limit, pool)
+
+        if is_chosung_query(q):
+            q = chosung(q)
+            hits = []
+            for i in self._candidates(self._chosung_grams, q, 2):
+                if self.items[i] is not None and q in self._chosung[i]:
+                    hits.append(i)
+                    if len(hits) >= cap:
+                        break
+            return self._finish([hits], limit, rank)
+
+        q = normalize(q)
+        key = decompose(q)
+        if not key:
+            return []
+        prefix = []
+        for i in self._prefix(key):
+            if self.items[i] is not None and _match_at(self._names[i], q, 0):
+                prefix.append(i)
+                if len(prefix) >= cap:
+                    break
+        rest = []
+        if len(prefix) < cap:
+            seen = set(prefix)
+            for i in self._candidates(self._grams, key, NGRAM):
+                if i not in seen and self.items[i] is not None and _contains(self._names[i], q):
+                    rest.append(i)
+                    if len(prefix) + len(rest) >= cap:
+                        break
+        return self._finish([prefix, rest], limit, rank)
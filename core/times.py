@@ -1,9 +1,41 @@
 # 영업시간 정보 데이터 가공
+import bisect
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+
 DAYS = ["일요일", "월요일", "화요일", "수요일", "목요일", "금요일", "토요일"]
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
 
 def format_time(h, m):
     return f"{h:02d}:{m:02d}"
 
+def format_minutes(mins):
+    # 하루 기준 분 -> "HH:MM" (자정 마감은 24:00, 다음날 새벽 마감은 새벽 시각으로 표시)
+    if mins > MINUTES_PER_DAY:
+        mins -= MINUTES_PER_DAY
+    return format_time(*divmod(mins, 60))
+
+def day_index(day):
+    # "월요일" / "월" 같은 요일 문자열 -> 구글 요일 번호(0=일요일), 알 수 없으면 None
+    if not day:
+        return None
+    for i, name in enumerate(DAYS):
+        if name.startswith(day):
+            return i
+    return None
+
+def week_minute(day, minute=0):
+    # 요일(0=일요일) + 하루 기준 분 -> 주 기준 분 (일요일 00:00 = 0)
+    return day * MINUTES_PER_DAY + minute
+
+def week_minute_of(dt):
+    # datetime -> 주 기준 분 (파이썬 weekday 는 월요일=0 이라 구글 요일 번호로 변환)
+    return week_minute((dt.weekday() + 1) % 7, dt.hour * 60 + dt.minute)
+
 def find_24h_days(weekday_descriptions):
     if not weekday_descriptions:
         return set()
@@ -21,100 +53,189 @@ def find_24h_days(weekday_descriptions):
         return set(range(7))
     return all_day
 
-def format_running(running_time):
-    result = []
-    all_breaks = []  # 모든 요일의 브레이크 타임을 저장할 리스트
 
+class OpeningHours:
+    """regularOpeningHours 를 한 번 파싱해 둔 결과
+    - days[d]: d요일(0=일요일)에 문을 여는 구간 (시작분, 종료분) 을 시작 시각 순으로 정렬한 튜플
+      (자정을 넘겨 끝나는 구간은 종료분이 1440 보다 큼)
+    - all_day: 24시간 영업 요일, unknown: 영업시간 데이터가 깨져서 판단할 수 없는 요일
+    - lines: format_running 결과 (화면 표시용 문자열)
+    """
+    __slots__ = ("days", "all_day", "unknown", "lines", "week", "_starts")
+
+    def __init__(self, days, all_day, unknown):
+        self.days = days
+        self.all_day = all_day
+        self.unknown = unknown
+        self.lines = tuple(_format_lines(self))
+        # 주 기준 분 구간 (겹치거나 맞닿은 구간은 병합, 토요일 밤 -> 일요일 새벽은 주 시작으로 넘김)
+        self.week = _week_intervals(days)
+        self._starts = [s for s, _ in self.week]
+
+    @property
+    def has_hours(self):
+        """영업시간 데이터가 있는지 (없으면 시간 제약 없이 취급하는 건 호출하는 쪽에서 결정)"""
+        return bool(self.week) or bool(self.unknown)
+
+    # 아래 시각 t 는 모두 주 기준 분 (week_minute), 한 주를 넘어가는 값도 허용
+    def _find(self, t):
+        # t 를 포함하는 구간의 인덱스 (없으면 None)
+        i = bisect.bisect_right(self._starts, t % MINUTES_PER_WEEK) - 1
+        if i >= 0 and t % MINUTES_PER_WEEK < self.week[i][1]:
+            return i
+        return None
+
+    def is_open_at(self, t):
+        """t 시각에 영업 중인지"""
+        return self._find(t) is not None
+
+    def closes_at(self, t):
+        """t 시각에 영업 중이면 계속 영업하는 마지막 시각, 아니면 None (연중무휴 24시간이면 inf)"""
+        i = self._find(t)
+        if i is None:
+            return None
+        if self.week == [(0, MINUTES_PER_WEEK)]:
+            return math.inf
+        tm = t % MINUTES_PER_WEEK
+        end = self.week[i][1]
+        if end == MINUTES_PER_WEEK and self.week[0][0] == 0:
+            end += self.week[0][1]  # 토요일 밤 영업이 일요일 새벽까지 이어지는 경우
+        return t + (end - tm)
+
+    def is_open_during(self, start, end):
+        """[start, end) 동안 쉬지 않고 계속 영업하는지 (브레이크타임, 마감 포함)"""
+        close = self.closes_at(start)
+        return close is not None and close >= end
+
+    def next_open(self, t):
+        """t 이후(포함) 가장 빨리 영업 중인 시각, 영업하는 날이 없으면 None"""
+        if not self.week:
+            return None
+        if self.is_open_at(t):
+            return t
+        tm = t % MINUTES_PER_WEEK
+        i = bisect.bisect_right(self._starts, tm)
+        if i < len(self._starts):
+            return t + (self._starts[i] - tm)
+        return t + (MINUTES_PER_WEEK - tm) + self._starts[0]
+
+    def is_open_on(self, day):
+        """해당 요일에 영업을 하는지 (휴무일이 아닌지)"""
+        return bool(self.days[day]) or day in self.unknown
+
+    @property
+    def open_days(self):
+        return {d for d in range(7) if self.is_open_on(d)}
+
+    def overlaps(self, day, start, end):
+        """d요일의 [start, end) 분 구간에 조금이라도 영업하는 시간이 있는지
+        - 전날 자정을 넘겨 이어지는 영업시간도 포함
+        """
+        t = week_minute(day, start)
+        opened = self.next_open(t)
+        return opened is not None and opened < t + (end - start)
+
+    def day_lines(self, day):
+        """lines 중 해당 요일로 시작하는 줄만 (요일별 영업시간 + 요일별 쉬는 시간)"""
+        return [line for line in self.lines if line.startswith(DAYS[day])]
+
+
+def _week_intervals(days):
+    spans = []
+    for d, intervals in enumerate(days):
+        for s, e in intervals:
+            s, e = week_minute(d, s), week_minute(d, e)
+            if e > MINUTES_PER_WEEK:
+                spans.append((s, MINUTES_PER_WEEK))
+                spans.append((0, e - MINUTES_PER_WEEK))
+            else:
+                spans.append((s, e))
+    spans.sort()
+
+    merged = []
+    for s, e in spans:
+        if merged and s <= merged[-1][1]:
+            if e > merged[-1][1]:
+                merged[-1] = (merged[-1][0], e)
+        else:
+            merged.append((s, e))
+    return merged
+
+
+def _compile(running_time):
     periods = (running_time or {}).get("periods", []) or []
     weekday_descriptions = (running_time or {}).get("weekdayDescriptions", []) or []
     all_day = find_24h_days(weekday_descriptions)
-    
-    for d in range(7):
-        
+
+    # 요일별로 한 번에 분류 (요일마다 periods 전체를 다시 훑지 않도록)
+    by_day = [[] for _ in range(7)]
+    open_only = set()
+    unknown = set()
+    for p in periods:
         try:
-            # 1) weekdayDescriptions가 24시간 영업
-            if d in all_day:
-                result.append(f"{DAYS[d]} 24시간 영업")
-                all_breaks.append([])
+            o = p.get("open")
+            if not o or o.get("day") not in range(7):
                 continue
-
-            
-            # 2) 예외처리: open과 close가 모두 있는 경우만 추가
-            day_periods = [
-                p for p in periods 
-                if p.get("open") and p.get("close") and 
-                p["open"].get("day") == d and 
-                p["open"].get("hour") is not None and 
-                p["open"].get("minute") is not None and
-                p["close"].get("hour") is not None and
-                p["close"].get("minute") is not None
-            ]
-            
-            # 3) 구글이 가끔 open만 주고 close를 생략(24시간 의미)하는 케이스
-            if not day_periods:
-                open_only = [
-                    p for p in periods
-                    if isinstance(p, dict)
-                    and p.get("open") and not p.get("close")
-                    and p["open"].get("day") == d
-                    and p["open"].get("hour") == 0
-                    and p["open"].get("minute") == 0
-                ]
-                if open_only:
-                    result.append(f"{DAYS[d]} 24시간 영업")
-                    all_breaks.append([])
-                    continue
-            
-            # 4) 영업 안 하는 날
-            if not day_periods:
-                result.append(f"{DAYS[d]} 휴무일")
-                all_breaks.append([])
+            d = o["day"]
+            c = p.get("close")
+            if not c:
+                # 구글이 가끔 open만 주고 close를 생략(24시간 의미)하는 케이스
+                if o.get("hour") == 0 and o.get("minute") == 0:
+                    open_only.add(d)
+                continue
+            if None in (o.get("hour"), o.get("minute"), c.get("hour"), c.get("minute")):
                 continue
+            start = o["hour"] * 60 + o["minute"]
+            end = c["hour"] * 60 + c["minute"]
+            if end <= start:  # 자정(00:00) 또는 다음날 새벽 마감
+                end += MINUTES_PER_DAY
+            by_day[d].append((start, end))
+        except Exception:
+            # 예외 발생 시 해당 요일은 정보 없음으로 처리
+            if isinstance(p, dict) and isinstance(p.get("open"), dict) and p["open"].get("day") in range(7):
+                unknown.add(p["open"]["day"])
 
-            # 5) 시간을 분 단위로 변환하여 전체 시간 계산
-            intervals = []
-            for p in day_periods:
-                start_mins = p["open"]["hour"] * 60 + p["open"]["minute"]
-                end_mins = p["close"]["hour"] * 60 + p["close"]["minute"]
-                if end_mins == 0:  # 자정은 24*60으로 변환
-                    end_mins = 24 * 60
-                intervals.append((start_mins, end_mins))
-            
-            # 정렬 후 전체 시간 범위 찾기
-            intervals.sort()
-            first_start = intervals[0][0]
-            last_end = intervals[-1][1]
-            
-            # 전체 시간 포맷팅
-            start_h, start_m = divmod(first_start, 60)
-            end_h, end_m = divmod(last_end, 60)
-            full_time = f"{format_time(start_h, start_m)}-{format_time(end_h, end_m)}"
-            
-            # 브레이크타임 계산
-            day_breaks = []
-            if len(intervals) > 1:
-                for i in range(len(intervals) - 1):
-                    end_time = intervals[i][1]
-                    next_start = intervals[i + 1][0]
-                    gap = next_start - end_time
-                    
-                    if 0 < gap <= 180:  # 3시간 이하만 브레이크타임으로 간주
-                        end_h, end_m = divmod(end_time, 60)
-                        next_h, next_m = divmod(next_start, 60)
-                        break_time = f"{format_time(end_h, end_m)}-{format_time(next_h, next_m)}"
-                        day_breaks.append(break_time)
-            
-            all_breaks.append(day_breaks)
-            result.append(f"{DAYS[d]} {full_time}")
+    days = []
+    full_day = set(all_day)
+    for d in range(7):
+        if d in all_day or (not by_day[d] and d in open_only):
+            full_day.add(d)
+            days.append(((0, MINUTES_PER_DAY),))
+        elif d in unknown:
+            days.append(())
+        else:
+            days.append(tuple(sorted(by_day[d])))
+    return OpeningHours(tuple(days), frozenset(full_day), frozenset(unknown - full_day))
 
-        except Exception as e:
-            # 예외 발생 시 해당 요일은 정보 없음으로 처리
+
+def _format_lines(hours):
+    result = []
+    all_breaks = []  # 모든 요일의 브레이크 타임을 저장할 리스트
+
+    for d in range(7):
+        intervals = hours.days[d]
+        if d in hours.all_day:
+            result.append(f"{DAYS[d]} 24시간 영업")
+            all_breaks.append([])
+        elif d in hours.unknown:
             result.append(f"{DAYS[d]} 정보 없음")
             all_breaks.append([])
-            continue
-    
+        elif not intervals:
+            result.append(f"{DAYS[d]} 휴무일")
+            all_breaks.append([])
+        else:
+            # 전체 시간 범위 + 3시간 이하 공백은 브레이크타임으로 간주
+            full_time = f"{format_minutes(intervals[0][0])}-{format_minutes(intervals[-1][1])}"
+            day_breaks = [
+                f"{format_minutes(end)}-{format_minutes(next_start)}"
+                for (_, end), (next_start, _) in zip(intervals, intervals[1:])
+                if 0 < next_start - end <= 180
+            ]
+            all_breaks.append(day_breaks)
+            result.append(f"{DAYS[d]} {full_time}")
+
     # 브레이크 타임이 모두 동일한 지 체크
-    if all_breaks and all(breaks == all_breaks[0] for breaks in all_breaks if breaks):
+    if all(breaks == all_breaks[0] for breaks in all_breaks if breaks):
         if all_breaks[0]:
             result.append(f"쉬는 시간 매일 {', '.join(all_breaks[0])}")
     else:
@@ -123,6 +244,30 @@ def format_running(running_time):
         for d in range(7):
             if all_breaks[d]:
                 result.append(f"{DAYS[d]} {', '.join(all_breaks[d])}")
-    
     return result
 
+
+# 같은 영업시간 데이터는 내용 해시로 한 번만 컴파일 (검색 결과에 같은 장소가 반복해서 등장)
+_CACHE_SIZE = 4096
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def compile_hours(running_time):
+    """regularOpeningHours -> OpeningHours (내용 해시 기준 LRU 캐시)"""
+    raw = json.dumps(running_time or {}, sort_keys=True, ensure_ascii=False, default=str)
+    key = hashlib.blake2b(raw.encode(), digest_size=16).digest()
+    with _cache_lock:
+        hours = _cache.get(key)
+        if hours is not None:
+            _cache.move_to_end(key)
+            return hours
+
+    hours = _compile(running_time)
+    with _cache_lock:
+        _cache[key] = hours
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return hours
+
+def format_running(running_time):
+    return list(compile_hours(running_time).lines)
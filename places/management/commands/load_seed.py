@@ -0,0 +1,213 @@
+# 시드 데이터(fixture) 대량 적재
+# python manage.py load_seed subway_lines.json wiki.json
+# - loaddata 는 행마다 save() 를 호출하고 좌표를 문자열로 넣어서 느림
+# - 파일을 조금씩 읽어 객체 단위로 파싱 -> 모델별로 모아서 bulk_create(upsert), 전체를 한 트랜잭션으로 처리
+# - bulk_create 는 시그널을 보내지 않으므로 리뷰 통계/위키 별점은 적재한 위키 장소만 마지막에 다시 계산
+import codecs
+import json
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+CHUNK_SIZE = 64 * 1024
+DETECT_SIZE = 1024 * 1024  # 인코딩 판별에 쓰는 앞부분 크기
+
+
+def _detect_encoding(path):
+    # 앞부분이 utf-8 로 읽히지 않으면 cp949 로 간주 (wiki.json 은 cp949)
+    with open(path, "rb") as f:
+        head = f.read(DETECT_SIZE)
+    try:
+        codecs.getincrementaldecoder("utf-8-sig")().decode(head, final=False)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp949"
+
+
+def _open_text(path, encoding=None):
+    """파일을 CHUNK_SIZE 씩 읽어 문자열 조각으로 돌려줌"""
+    decoder = codecs.getincrementaldecoder(encoding or _detect_encoding(path))()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                yield text
+            if not chunk:
+                return
+
+
+def iter_records(path, encoding=None):
+    """JSON 배열 파일에서 원소를 하나씩 꺼냄 (파일 전체를 메모리에 올리지 않음)"""
+    decoder = json.JSONDecoder()
+    chunks = _open_text(path, encoding)
+    buf = ""
+    pos = 0
+    eof = False
+
+    def more():
+        nonlocal buf, pos, eof
+        try:
+            buf = buf[pos:] + next(chunks)
+        except StopIteration:
+            buf = buf[pos:]
+            eof = True
+        pos = 0
+
+    def skip(chars):
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            more()
+
+    skip(" \t\r\n")
+    if pos >= len(buf) or buf[pos] != "[":
+        raise CommandError(f"{path}: JSON 배열 형식이 아닙니다.")
+    pos += 1
+
+    while True:
+        skip(" \t\r\n,")
+        if pos >= len(buf):
+            raise CommandError(f"{path}: 배열이 닫히지 않았습니다.")
+        if buf[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise CommandError(f"{path}: JSON 파싱 실패 (위치 {pos})")
+            more()  # 객체가 조각 경계에서 잘린 경우
+            continue
+        pos = end
+        yield obj
+
+
+def _timestamp_fields(model):
+    return [f for f in model._meta.concrete_fields if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)]
+
+
+def _stash_timestamps(objs, fields):
+    # bulk_create 는 auto_now/auto_now_add 값을 현재 시각으로 덮어쓰므로 파일에 있던 값을 기억해 둠
+    # (필드의 auto_now 설정을 끄면 같은 프로세스의 다른 저장에도 영향을 주므로 건드리지 않음)
+    return [(o, {f.attname: getattr(o, f.attname) for f in fields if getattr(o, f.attname) is not None}) for o in objs]
+
+
+def _restore_timestamps(model, stashed, fields):
+    # 덮어쓴 시각을 파일 값으로 되돌림 (bulk_update 는 auto_now 를 적용하지 않음 -> loaddata 의 raw 저장과 같은 결과)
+    changed = []
+    for obj, values in stashed:
+        if values and obj.pk is not None:
+            for attname, value in values.items():
+                setattr(obj, attname, value)
+            changed.append(obj)
+    if changed:
+        model.objects.bulk_update(changed, [f.name for f in fields])
+
+
+def _touched_wiki_places(model, objs):
+    # 리뷰 통계(점수 합/개수/평균, 위키 별점)를 다시 계산해야 하는 WikiPlace id
+    label = model._meta.label
+    if label == "wiki.WikiPlace":
+        return {o.pk for o in objs if o.pk is not None}
+    if label == "wiki.Review":
+        return {o.wiki_place_id for o in objs}
+    return set()
+
+
+def _build(model, record):
+    fields = record.get("fields") or {}
+    obj = model()
+    for name, value in fields.items():
+        field = model._meta.get_field(name)
+        if field.many_to_many:
+            continue  # 현재 시드 데이터에는 M2M 이 없음
+        # to_python 으로 문자열 좌표("127.09") -> float, 날짜 문자열 -> datetime 등 변환
+        setattr(obj, field.attname, field.to_python(value) if value is not None else None)
+    if record.get("pk") is not None:
+        obj.pk = model._meta.pk.to_python(record["pk"])
+    return obj
+
+
+class Command(BaseCommand):
+    help = "fixture(JSON 배열) 파일을 스트리밍으로 읽어 bulk upsert 로 적재합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="fixture 파일 경로")
+        parser.add_argument("--batch-size", type=int, default=1000, help="bulk_create 한 번에 넣을 행 수")
+        parser.add_argument("--encoding", default=None, help="파일 인코딩 (기본: utf-8, 실패 시 cp949)")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        counts = {}
+        started = time.perf_counter()
+
+        batch, batch_model = [], None
+        wiki_places = set()
+
+        def flush():
+            nonlocal batch
+            if not batch:
+                return
+            model = batch_model
+            pk_name = model._meta.pk.name
+            update_fields = [f.name for f in model._meta.concrete_fields if not f.primary_key]
+            with_pk = [o for o in batch if o.pk is not None]
+            without_pk = [o for o in batch if o.pk is None]
+            timestamps = _timestamp_fields(model)
+            stashed = _stash_timestamps(batch, timestamps) if timestamps else None
+            if with_pk:
+                model.objects.bulk_create(with_pk, update_conflicts=True,
+                                          unique_fields=[pk_name], update_fields=update_fields)
+            if without_pk:
+                model.objects.bulk_create(without_pk)
+            if stashed:
+                _restore_timestamps(model, stashed, timestamps)
+            wiki_places.update(_touched_wiki_places(model, batch))
+            label = model._meta.label
+            counts[label] = counts.get(label, 0) + len(batch)
+            batch = []
+
+        with transaction.atomic():
+            for path in options["files"]:
+                try:
+                    for record in iter_records(path, options["encoding"]):
+                        try:
+                            model = apps.get_model(record["model"])
+                        except (KeyError, LookupError):
+                            raise CommandError(f"{path}: 알 수 없는 모델 {record.get('model')}")
+                        if model is not batch_model or len(batch) >= batch_size:
+                            flush()
+                            batch_model = model
+                        batch.append(_build(model, record))
+                except FileNotFoundError:
+                    raise CommandError(f"파일을 찾을 수 없습니다: {path}")
+                except UnicodeDecodeError as e:
+                    raise CommandError(f"{path}: 인코딩을 판별하지 못했습니다. --encoding 으로 지정해주세요. ({e})")
+            flush()
+
+            # 시드 파일에는 total_review_score 가 없고 리뷰 시그널도 돌지 않았으므로 전체 재계산
+            if wiki_places:
+                WikiPlace = apps.get_model("wiki", "WikiPlace")
+                for place in WikiPlace.objects.filter(pk__in=wiki_places):
+                    place.update_review_stats()
+
+            # bulk_create 는 post_save 시그널을 보내지 않으므로 메모리 인덱스는 직접 초기화
+            transaction.on_commit(self._reset_indexes)
+
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        for label, n in counts.items():
+            self.stdout.write(f"  {label}: {n}행")
+        rate = total / elapsed if elapsed > 0 else float("inf")
+        self.stdout.write(self.style.SUCCESS(f"총 {total}행 적재 ({elapsed * 1000:.1f}ms, {rate:,.0f} rows/sec)"))
+
+    @staticmethod
+    def _reset_indexes():
+        from places.services import autocomplete, stations
+        stations.reset()
+        autocomplete.reset()
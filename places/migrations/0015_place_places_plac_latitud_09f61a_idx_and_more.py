@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('places', '0014_remove_routesnapshot_result'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['latitude', 'longitude'], name='places_plac_latitud_09f61a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subwaylines',
+            index=models.Index(fields=['latitude', 'longitude'], name='places_subw_latitud_96f785_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:07
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('places', '0015_place_places_plac_latitud_09f61a_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='kakao_place_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='last_seen_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='opening_hours',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='place',
+            name='address',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='place',
+            name='dong',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='place',
+            name='gplace_id',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='place',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='place',
+            name='number',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='place',
+            name='running_time',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+    ]
@@ -3,19 +3,30 @@ from django.db import models
 from django.utils import timezone
 from datetime import timedelta
 import secrets
+from core.geo import GeoQuerySet
 
 class Place(models.Model):
   id = models.AutoField(primary_key=True)
-  gplace_id = models.CharField(max_length=100, null=True, blank=True)
-  name = models.CharField(max_length=50)
-  address = models.CharField(max_length=50)
-  dong = models.CharField(max_length=50)
+  gplace_id = models.CharField(max_length=100, null=True, blank=True, unique=True)
+  kakao_place_id = models.CharField(max_length=50, null=True, blank=True, unique=True)
+  name = models.CharField(max_length=100)
+  address = models.CharField(max_length=255, blank=True, default="")
+  dong = models.CharField(max_length=50, blank=True, default="")
   longitude = models.FloatField()
   latitude = models.FloatField()
-  number = models.CharField(max_length=50)
-  running_time = models.CharField(max_length=50)
+  number = models.CharField(max_length=50, blank=True, default="")
+  running_time = models.CharField(max_length=50, blank=True, default="")
+  opening_hours = models.JSONField(null=True, blank=True) # 구글 regularOpeningHours 원본
   place_url = models.TextField(null=True, blank=True)
   created_at = models.DateTimeField(auto_now_add=True)
+  last_seen_at = models.DateTimeField(default=timezone.now, db_index=True) # 외부 API 검색 결과에 마지막으로 나온 시각
+
+  objects = GeoQuerySet.as_manager()
+
+  class Meta:
+    indexes = [
+      models.Index(fields=["latitude", "longitude"]),
+    ]
 
   # 인기순에는 장소의 위도경도이름을 보고 우리꺼랑 대조해서 일치하면 카운트를 가져와가지고 정렬 [구글-우리DB]
 
@@ -31,6 +42,13 @@ class SubwayLines(models.Model):
   longitude = models.FloatField()
   latitude = models.FloatField()
 
+  objects = GeoQuerySet.as_manager()
+
+  class Meta:
+    indexes = [
+      models.Index(fields=["latitude", "longitude"]),
+    ]
+
 def gen_short(n=8):
     # URL-safe 랜덤 토큰 일부만 사용 (짧게)
     return secrets.token_urlsafe(6)[:n]
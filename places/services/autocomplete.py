@@ -0,0 +1,116 @@
+# 검색바 자동완성 (지하철역 + 인기 검색 장소 + 위키 장소)
+# 구글 검색 전에 로컬 인덱스에서 바로 후보를 보여줌, 인기 장소는 click_num 순
+# - 인덱스는 프로세스(gunicorn 워커)마다 따로 있음: 시그널로 바로 반영되는 건 저장을 처리한 워커뿐이고,
+#   다른 워커는 AUTOCOMPLETE_TTL 초마다 DB 에서 다시 만들어서 따라잡음 (그동안은 이전 후보를 보여줄 수 있음)
+import threading
+import time
+
+from django.conf import settings
+
+from core.text_index import TextIndex
+from ..models import PopularKeyward
+from . import stations
+
+REBUILD_GARBAGE_RATIO = 0.5  # 삭제/이름 변경으로 빈 자리가 이 비율을 넘으면 새로 만듦
+
+_index = None
+_built_at = 0.0
+_lock = threading.Lock()
+
+
+def _station_entries():
+    for s in stations.station_groups():
+        yield {"type": "station", "name": s["station"], "lines": s["lines"],
+               "x": s["longitude"], "y": s["latitude"], "click_num": 0}
+
+
+def _place_entry(p):
+    return {"type": "place", "name": p.place_name, "place_id": p.place_id, "click_num": p.click_num}
+
+
+def _wiki_entry(w):
+    return {"type": "wiki", "name": w.shop_name, "place_id": w.google_place_id, "click_num": 0}
+
+
+def build_index():
+    from wiki.models import WikiPlace
+
+    index = TextIndex()
+    for entry in _station_entries():
+        index.add(entry["name"], entry, key=("station", entry["name"]))
+    # 짧은 검색어는 먼저 추가한 항목 중에서 후보를 고르므로 인기 장소를 클릭 수 순으로 추가
+    for p in PopularKeyward.objects.only("place_id", "place_name", "click_num").order_by("-click_num", "id"):
+        index.add(p.place_name, _place_entry(p), key=("place", p.place_id))
+    for w in WikiPlace.objects.exclude(shop_name__isnull=True).exclude(shop_name="").only("shop_name", "google_place_id"):
+        index.add(w.shop_name, _wiki_entry(w), key=("wiki", w.pk))
+    return index
+
+
+def _ttl():
+    return getattr(settings, "AUTOCOMPLETE_TTL", 300)
+
+
+def get_index():
+    """인덱스 (처음이면 만들고, AUTOCOMPLETE_TTL 이 지났으면 한 요청만 다시 만들고 나머지는 이전 인덱스로 응답)"""
+    global _index, _built_at
+    index = _index
+    if index is not None and time.monotonic() - _built_at < _ttl():
+        return index
+    if index is not None and not _lock.acquire(blocking=False):
+        return index  # 다른 요청이 다시 만드는 중
+    if index is None:
+        _lock.acquire()
+    try:
+        if _index is None or time.monotonic() - _built_at >= _ttl():
+            _index = build_index()
+            _built_at = time.monotonic()
+        return _index
+    finally:
+        _lock.release()
+
+
+def reset():
+    global _index
+    with _lock:
+        _index = None
+
+
+def _update(fn):
+    # 인덱스를 아직 안 만들었으면 다음 검색 때 최신 데이터로 만들어지므로 무시
+    with _lock:
+        if _index is None:
+            return
+        fn(_index)
+        garbage = _index.garbage_ratio
+    if garbage > REBUILD_GARBAGE_RATIO:
+        reset()
+
+
+# 시그널(places/signals.py)에서 행이 바뀔 때마다 호출
+def upsert_place(p):
+    if p.place_name:
+        _update(lambda index: index.add(p.place_name, _place_entry(p), key=("place", p.place_id)))
+
+def remove_place(p):
+    _update(lambda index: index.discard(("place", p.place_id)))
+
+def upsert_wiki(w):
+    if w.shop_name:
+        _update(lambda index: index.add(w.shop_name, _wiki_entry(w), key=("wiki", w.pk)))
+    else:
+        remove_wiki(w)
+
+def remove_wiki(w):
+    _update(lambda index: index.discard(("wiki", w.pk)))
+
+
+def _rank(entry):
+    # 클릭 수가 같으면 짧은 이름(입력한 검색어에 더 가까운 것) 먼저
+    return -entry["click_num"], len(entry["name"])
+
+
+def suggest(query, limit=10):
+    """검색어 자동완성 후보 (접두어 일치 먼저, 같은 그룹 안에서는 click_num 높은 순 -> 짧은 이름 순)"""
+    if not query or not query.strip():
+        return []
+    return get_index().search(query, limit=limit, rank=_rank)
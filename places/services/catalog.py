@@ -0,0 +1,211 @@
+# 장소 카탈로그 (write-behind)
+# - 구글/카카오 검색 결과에 나온 장소를 Place 테이블에 쌓아 둠 (last_seen_at 갱신)
+# - 요청 처리 중에는 큐에 넣기만 하고, 백그라운드 스레드가 모아서 bulk upsert
+# - 처음 보는 장소는 다른 쪽(구글 <-> 카카오) 키로 이미 저장된 같은 장소가 있으면 그 행에 키를 합침
+#   (이름이 같고 MERGE_RADIUS_M 안에 있으면 같은 장소로 봄)
+# - 지금은 기록만 함: 카탈로그 행에는 카테고리/사진/평점이 없어서 검색 응답을 대신할 수는 없음
+import logging
+import queue
+import re
+import threading
+import time
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from ..models import Place
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+FLUSH_INTERVAL = 2.0   # 초, 배치가 덜 찼어도 이 시간이 지나면 저장
+QUEUE_SIZE = 10000     # 큐가 가득 차면 새 기록은 버림 (요청을 막지 않도록)
+MERGE_RADIUS_M = 50    # 구글/카카오 같은 장소 판정 거리
+
+KEY_FIELDS = ("gplace_id", "kakao_place_id")
+
+_queue = queue.Queue(maxsize=QUEUE_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+stats = {"queued": 0, "dropped": 0, "written": 0, "merged": 0, "errors": 0}
+_stats_lock = threading.Lock()  # 요청 스레드들과 저장 스레드가 같이 올림
+
+
+def _count(key, n=1):
+    with _stats_lock:
+        stats[key] += n
+
+
+def _clip(field, value):
+    # CharField 길이 제한에 맞춰 자름
+    value = value or ""
+    max_length = Place._meta.get_field(field).max_length
+    return value[:max_length] if max_length else value
+
+
+def _from_google(p):
+    loc = p.get("location") or {}
+    if not p.get("id") or loc.get("latitude") is None or loc.get("longitude") is None:
+        return None
+    row = {
+        "gplace_id": p["id"],
+        "name": _clip("name", (p.get("displayName") or {}).get("text")),
+        "address": _clip("address", p.get("formattedAddress")),
+        "latitude": float(loc["latitude"]),
+        "longitude": float(loc["longitude"]),
+    }
+    if p.get("nationalPhoneNumber"):
+        row["number"] = _clip("number", p["nationalPhoneNumber"])
+    if p.get("regularOpeningHours"):
+        row["opening_hours"] = p["regularOpeningHours"]
+    return row
+
+
+def _from_kakao(d):
+    if not d.get("id") or not d.get("x") or not d.get("y"):
+        return None
+    row = {
+        "kakao_place_id": str(d["id"]),
+        "name": _clip("name", d.get("place_name")),
+        "address": _clip("address", d.get("road_address_name") or d.get("address_name")),
+        "latitude": float(d["y"]),
+        "longitude": float(d["x"]),
+    }
+    if d.get("phone"):
+        row["number"] = _clip("number", d["phone"])
+    if d.get("place_url"):
+        row["place_url"] = d["place_url"]
+    return row
+
+
+def _enqueue(rows):
+    _ensure_worker()
+    now = timezone.now()
+    for row in rows:
+        if row is None:
+            continue
+        row["last_seen_at"] = now
+        try:
+            _queue.put_nowait(row)
+            _count("queued")
+        except queue.Full:
+            _count("dropped")
+
+
+def record_google(places):
+    """구글 Places API 응답의 places 목록을 카탈로그에 기록 (요청 경로에서는 큐에 넣기만 함)"""
+    try:
+        _enqueue(_from_google(p) for p in places or [])
+    except Exception as e:  # 카탈로그 기록 실패가 검색 응답을 깨뜨리지 않도록
+        logger.warning("구글 장소 기록 실패: %s", e)
+
+
+def record_kakao(documents):
+    """카카오 로컬 API 응답의 documents 목록을 카탈로그에 기록"""
+    try:
+        _enqueue(_from_kakao(d) for d in documents or [])
+    except Exception as e:
+        logger.warning("카카오 장소 기록 실패: %s", e)
+
+
+def _norm_name(name):
+    # 공백/기호/대소문자 차이는 무시 ("스타벅스 강남역점" == "스타벅스강남역점")
+    return re.sub(r"[\W_]+", "", (name or "").lower())
+
+
+def _merge(key_field, row):
+    """다른 쪽 키로만 저장된 같은 장소가 있으면 그 행에 이 키와 값을 채우고 True"""
+    name = _norm_name(row["name"])
+    if not name:
+        return False
+    candidates = Place.objects.filter(**{f"{key_field}__isnull": True}).within_radius(
+        row["latitude"], row["longitude"], MERGE_RADIUS_M
+    )
+    for place in candidates:  # 가까운 순
+        if _norm_name(place.name) == name:
+            Place.objects.filter(pk=place.pk).update(**row)
+            return True
+    return False
+
+
+def _upsert(rows):
+    # 같은 장소가 여러 번 나오면 마지막 값만, (키 컬럼, 채워진 컬럼) 이 같은 것끼리 한 번에 upsert
+    # 구글 행을 먼저 저장하고 카카오 행을 처리해서, 한 배치에 둘 다 처음 나와도 한 행으로 합쳐짐
+    written = 0
+    for key_field in KEY_FIELDS:
+        latest = {row[key_field]: row for row in rows if key_field in row}
+        if not latest:
+            continue
+
+        known = set(Place.objects.filter(**{f"{key_field}__in": list(latest)}).values_list(key_field, flat=True))
+        merged = [key for key in latest if key not in known and _merge(key_field, latest[key])]
+        for key in merged:
+            del latest[key]
+        if merged:
+            _count("merged", len(merged))
+
+        groups = {}
+        for row in latest.values():
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for fields, group in groups.items():
+            update_fields = [f for f in fields if f != key_field]
+            Place.objects.bulk_create(
+                [Place(**row) for row in group],
+                update_conflicts=True, unique_fields=[key_field], update_fields=update_fields,
+            )
+        written += len(latest) + len(merged)
+    return written
+
+
+def _save(rows):
+    if not rows:
+        return 0
+    try:
+        written = _upsert(rows)
+        _count("written", written)
+        return written
+    except Exception:
+        _count("errors")
+        logger.exception("장소 저장 실패 (%d건)", len(rows))
+        return 0
+
+
+def flush():
+    """큐에 쌓인 기록을 지금 바로 저장 (테스트/관리 명령용)"""
+    rows = []
+    while True:
+        try:
+            rows.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return _save(rows)
+
+
+def _run():
+    while True:
+        # 첫 기록이 들어오면 FLUSH_INTERVAL 동안(또는 BATCH_SIZE 만큼) 더 모았다가 저장
+        rows = [_queue.get()]
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        while len(rows) < BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                rows.append(_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        close_old_connections()
+        try:
+            _save(rows)
+        finally:
+            close_old_connections()
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="place-catalog", daemon=True)
+            _worker.start()
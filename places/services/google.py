@@ -1,11 +1,17 @@
+import logging
 import re, requests
 from django.conf import settings
+from django.core.cache import cache
 from ..models import PopularKeyward
+from . import catalog
+from core import http
 from core.distance import calculate_distance
-from core.times import format_running
+from core.times import format_running, compile_hours
 from datetime import datetime, time as dt_time
 
-BASE = "https://places.googleapis.com/v1/places"
+logger = logging.getLogger(__name__)
+
+BASE = settings.GOOGLE_PLACES_BASE
 
 culture_types = [
     # --- 문화 관련 (5개) ---
@@ -88,11 +94,12 @@ def search_place(text_query, x, y, radius, rankPreference=None, priceLevel=None)
         },
         "priceLevels": priceLevel,  # 가격대 "PRICE_LEVEL_INEXPENSIVE", "PRICE_LEVEL_MODERATE"
     }
-    r = requests.post(f"{BASE}:searchText", headers=_headers(), json=body, timeout=15)
+    r = http.post("google", "search_text", f"{BASE}:searchText", headers=_headers(), json=body, timeout=15)
     r.raise_for_status()  # 200대가 아니면 에러 발생
 
     data = r.json()
     places = data.get("places", [])
+    catalog.record_google(places[:10])
 
     google_place = []
     
@@ -158,17 +165,47 @@ def build_photo_url(photo_name: str, max_width_px: int = 800) -> str:
         f"?key={settings.GOOGLE_API_KEY}&maxWidthPx={max_width_px}"
     )
 
-# 1.2 장소를 저장하기 위해, 프론트로부터 place_id를 받고 세부 데이터 응답
-def search_detail(place_id):
+# 장소 상세 조회 필드
+# - DETAIL_FIELDS: 상세정보만 (장소 저장/동선처럼 리뷰가 필요 없는 곳, 리뷰가 빠져서 더 저렴한 SKU 로 과금)
+# - REVIEW_FIELDS: 상세정보 + 리뷰 (장소 요약/위키 상세, search_detail_with_reviews/get_google_reviews)
+DETAIL_FIELDS = "id,displayName,formattedAddress,location,regularOpeningHours,photos,nationalPhoneNumber,rating,userRatingCount"
+REVIEW_FIELDS = DETAIL_FIELDS + ",reviews"
+DETAIL_TTL = 60 * 10  # 상세 응답 재사용 시간(초)
+
+def fetch_place(place_id, reviews=True):
+    """places/{id} 원본 응답 (reviews=False 면 리뷰 없는 필드만 요청)
+    - 두 필드 셋은 따로 캐시하고, 리뷰 없는 조회는 리뷰 포함 캐시가 있으면 그걸 재사용
+    - DETAIL_TTL 동안은 캐시된 응답을 재사용 (장소 요약, 위키 상세가 같은 응답을 공유)
+    """
+    full_key = f"google:place:{place_id}"
+    key = full_key if reviews else f"{full_key}:basic"
+    cached = cache.get_many([full_key] if reviews else [full_key, key])
+    p = cached.get(full_key, cached.get(key))
+    http.cache_result("google", "place_details", p is not None)
+    if p is not None:
+        return p
+
     params = {
         "languageCode": "ko",
         "regionCode": "KR",
-        "fields": "id,displayName,formattedAddress,location,regularOpeningHours,photos",
+        "fields": REVIEW_FIELDS if reviews else DETAIL_FIELDS,
     }
-    r = requests.get(f"{BASE}/{place_id}", params=params, headers=_headers(), timeout=15)
+    r = http.get("google", "place_details", f"{BASE}/{place_id}", params=params, headers=_headers(), timeout=15)
     r.raise_for_status()
     p = r.json()
+    cache.set(key, p, DETAIL_TTL)
+    return p
 
+# 1.2 장소를 저장하기 위해, 프론트로부터 place_id를 받고 세부 데이터 응답
+def search_detail(place_id):
+    return _detail_from(fetch_place(place_id, reviews=False))
+
+def search_detail_with_reviews(place_id, limit=5):
+    """상세정보와 리뷰를 한 번의 호출로 함께 반환 (search_detail + get_google_reviews)"""
+    p = fetch_place(place_id)
+    return _detail_from(p), _reviews_from(p, place_id, limit)
+
+def _detail_from(p):
     photos = p.get("photos", [])[:1]
     place_photos = {
         build_photo_url(p["name"], max_width_px=800)
@@ -187,6 +224,7 @@ def search_detail(place_id):
         "address" : p.get("formattedAddress"),
         "location" : p.get("location"),
         "running_time" : time,
+        "opening_hours" : running_time, # 원본 영업시간 (동선 추천에서 요일/시간 판단용)
         "place_photos" : place_photos
     }
 
@@ -203,49 +241,43 @@ def get_google_reviews(place_id, limit=5):
         dict: {"reviews": [리뷰 텍스트 리스트], "google_rating": 구글평점, "google_rating_count": 총리뷰수, "review_count": 크롤링한리뷰수}
     """
     try:
-        # 구글 Places API에서 리뷰 포함하여 장소 정보 조회
-        params = {
-            "languageCode": "ko",
-            "regionCode": "KR", 
-            "fields": "id,displayName,reviews,rating,userRatingCount",
-        }
-        
-        r = requests.get(f"{BASE}/{place_id}", params=params, headers=_headers(), timeout=20)
-        r.raise_for_status()
-        
-        data = r.json()
-        reviews_data = data.get("reviews", [])
-        
-        # 구글 장소 평점 정보 (개별 리뷰 별점이 아닌 장소 전체 평점)
-        google_rating = data.get("rating", 0)  # 구글 장소 평점
-        google_rating_count = data.get("userRatingCount", 0)  # 총 리뷰 수
-        
-        # 리뷰 텍스트 추출 (빈 리뷰는 제외)
-        review_texts = []
-        
-        for review in reviews_data[:limit]:
-            text_data = review.get("text", {})
-            review_text = text_data.get("text", "").strip()
-            
-            if review_text and len(review_text) >= 10:  # 최소 10자 이상인 리뷰만
-                review_texts.append(review_text)
-        
-        print(f"구글 리뷰 {len(review_texts)}개 수집 완료 (구글평점: {google_rating}/5.0, 총 리뷰수: {google_rating_count}) (장소ID: {place_id})")
-        
-        return {
-            "reviews": review_texts,
-            "google_rating": google_rating,  # 구글 장소 평점
-            "google_rating_count": google_rating_count,  # 총 리뷰 수
-            "review_count": len(review_texts)  # 크롤링한 리뷰 수
-        }
+        # 구글 Places API에서 리뷰 포함하여 장소 정보 조회 (상세 조회와 같은 응답 재사용)
+        return _reviews_from(fetch_place(place_id), place_id, limit)
         
     except requests.RequestException as e:
-        print(f"구글 리뷰 수집 실패 (장소ID: {place_id}): {e}")
+        logger.warning("구글 리뷰 수집 실패 (장소ID: %s): %s", place_id, e)
         return {"reviews": [], "google_rating": 0, "google_rating_count": 0, "review_count": 0}
     except Exception as e:
-        print(f"구글 리뷰 처리 중 오류 (장소ID: {place_id}): {e}")
+        logger.exception("구글 리뷰 처리 중 오류 (장소ID: %s)", place_id)
         return {"reviews": [], "google_rating": 0, "google_rating_count": 0, "review_count": 0}
 
+def _reviews_from(data, place_id, limit=5):
+    reviews_data = data.get("reviews", [])
+    
+    # 구글 장소 평점 정보 (개별 리뷰 별점이 아닌 장소 전체 평점)
+    google_rating = data.get("rating", 0)  # 구글 장소 평점
+    google_rating_count = data.get("userRatingCount", 0)  # 총 리뷰 수
+    
+    # 리뷰 텍스트 추출 (빈 리뷰는 제외)
+    review_texts = []
+    
+    for review in reviews_data[:limit]:
+        text_data = review.get("text", {})
+        review_text = text_data.get("text", "").strip()
+        
+        if review_text and len(review_text) >= 10:  # 최소 10자 이상인 리뷰만
+            review_texts.append(review_text)
+    
+    logger.debug("구글 리뷰 %d개 수집 완료 (구글평점: %s/5.0, 총 리뷰수: %s) (장소ID: %s)",
+                 len(review_texts), google_rating, google_rating_count, place_id)
+    
+    return {
+        "reviews": review_texts,
+        "google_rating": google_rating,  # 구글 장소 평점
+        "google_rating_count": google_rating_count,  # 총 리뷰 수
+        "review_count": len(review_texts)  # 크롤링한 리뷰 수
+    }
+
 # 4. 타로 페이지
 def search_slot(x, y, radius):
 
@@ -264,10 +296,11 @@ def search_slot(x, y, radius):
         "includedTypes": culture_types + leisure_types + food_types + cafe_types,
     }
 
-    r = requests.post(f"{BASE}:searchNearby", headers=_headers(), json=body, timeout=15)
+    r = http.post("google", "search_nearby", f"{BASE}:searchNearby", headers=_headers(), json=body, timeout=15)
     r.raise_for_status()  # 200대가 아니면 에러 발생
     data = r.json()
     places = data.get("places") or []
+    catalog.record_google(places)
 
     culture_places = []
     leisure_places = []
@@ -285,10 +318,8 @@ def search_slot(x, y, radius):
             cafe_places.append(p)
         else:
             food_places.append(p)
-    print(f"문화 장소: {len(culture_places)}개")
-    print(f"관광/여가 장소: {len(leisure_places)}개")
-    print(f"카페 장소: {len(cafe_places)}개")
-    print(f"음식점 장소: {len(food_places)}개")
+    logger.debug("분류 결과 - 문화 %d개, 관광/여가 %d개, 카페 %d개, 음식점 %d개",
+                 len(culture_places), len(leisure_places), len(cafe_places), len(food_places))
     
     google_place = []
     # 랜덤하게 가져온 20개의 장소를 각 카테고리별로 분류
@@ -465,12 +496,13 @@ def search_category_places(
         api_url = f"{BASE}:searchNearby"
     
     try:
-        r = requests.post(api_url, headers=_headers(), json=body, timeout=20)
+        r = http.post("google", "category_search", api_url, headers=_headers(), json=body, timeout=20)
         status = r.status_code
         r.raise_for_status()
         data = r.json()
 
         places = data.get("places", [])
+        catalog.record_google(places)
         
         # 장소 데이터 변환 및 필터링
         filtered_places = []
@@ -517,7 +549,7 @@ def search_category_places(
         raise RuntimeError(f"Places API error {status}") from e
 
     except Exception as e:
-        print(f"카테고리 장소 검색 실패: {e}")
+        logger.exception("카테고리 장소 검색 실패")
         return []
 
 def _extract_place_data(place, center_x, center_y):
@@ -633,26 +665,9 @@ def _check_time_filter(opening_hours, time_filter):
     
     start_hour, end_hour = time_ranges[time_filter]
     
-    # 각 요일별 영업시간 체크
-    for period in opening_hours.get("periods", []):
-        open_time = period.get("open", {})
-        close_time = period.get("close", {})
-        
-        if not open_time or not close_time:
-            continue
-        
-        open_hour = open_time.get("hour", 0)
-        close_hour = close_time.get("hour", 24)
-        
-        # 24시간 영업인 경우
-        if close_hour == 0:
-            close_hour = 24
-        
-        # 영업시간이 필터 시간과 겹치는지 확인
-        if _time_overlap(open_hour, close_hour, start_hour, end_hour):
-            return True
-    
-    return False
+    # 요일별 영업시간 구간 중 하나라도 필터 시간과 겹치면 통과
+    hours = compile_hours(opening_hours)
+    return any(hours.overlaps(d, start_hour * 60, end_hour * 60) for d in range(7))
 
 def _check_days_filter(opening_hours, days_filter):
     """방문요일 필터 체크"""
@@ -668,19 +683,9 @@ def _check_days_filter(opening_hours, days_filter):
     # 필터에서 요청한 요일들의 숫자 변환
     filter_day_numbers = [day_mapping.get(day) for day in days_filter if day in day_mapping]
     
-    # 영업하는 요일들 추출
-    operating_days = set()
-    for period in opening_hours.get("periods", []):
-        open_day = period.get("open", {}).get("day")
-        if open_day is not None:
-            operating_days.add(open_day)
-    
     # 필터 요일 중 하나라도 영업하면 통과
-    return any(day_num in operating_days for day_num in filter_day_numbers)
-
-def _time_overlap(start1, end1, start2, end2):
-    """두 시간 범위가 겹치는지 확인"""
-    return max(start1, start2) < min(end1, end2)
+    hours = compile_hours(opening_hours)
+    return any(hours.is_open_on(day_num) for day_num in filter_day_numbers)
 
 def _sort_places(places, sort_by):
     """장소 리스트 정렬"""
@@ -1,41 +1,47 @@
+import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 
-from ..services import google
-from ..models import SubwayLines
-from django.db.models import Q #검색어 일부가 포함된 지하철역 검색  
+from core import http
+from core.cache import TTLCache
+from ..services import google, stations, catalog
 
+logger = logging.getLogger(__name__)
 
-LOCAL = "https://dapi.kakao.com/v2/local"
-ROUTE = "https://apis-navi.kakaomobility.com/v1/directions"
+LOCAL = settings.KAKAO_LOCAL_BASE
+ROUTE = settings.KAKAO_NAVI_BASE
 
 def _headers():
     return {"Authorization": f"KakaoAK {settings.KAKAO_REST_API_KEY}"}
 
 # 1.1 현위치 표시
-def locate_dong(query): 
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kakao")
+
+def _search_address(query):
     params = {"query":query}
-    r = requests.get(f"{LOCAL}/search/address.json", headers=_headers(), params=params, timeout=5)
+    r = http.get("kakao", "address", f"{LOCAL}/search/address.json", headers=_headers(), params=params, timeout=5)
     r.raise_for_status() #200대가 아니면 에러 발생
-    data = r.json()
+    return r.json()
+
+def locate_dong(query): 
+    # 카카오 주소 검색은 백그라운드로 보내고 그동안 지하철역 검색
+    future = _executor.submit(http.bind(_search_address), query)
     address_list = []
 
-    #DB에서 지하철역정보 검색하여 위도경도 반환
+    #메모리 인덱스에서 지하철역정보 검색하여 위도경도 반환
     q = query.strip()
     if q.endswith("역"): #00역인 경우 '역' 제거
         q = q[:-1].strip()
 
-    subway = SubwayLines.objects.filter(
-        Q(station__icontains=q)
-    )
-    stations = subway[:10]  # 너무 많이 안 주도록 상한
-    for s in stations:
+    for s in stations.search_stations(q, limit=10):  # 너무 많이 안 주도록 상한
         address_list.append({
-            "address_name": f"{s.station} ({s.line})",
-            "x": s.longitude,
-            "y": s.latitude,
+            "address_name": f"{s['station']} ({s['line']})",
+            "x": s["longitude"],
+            "y": s["latitude"],
         })
 
+    data = future.result()
     if data["documents"]: 
         #카카오API의 위도경도 목록
         for document in data["documents"]:
@@ -64,9 +70,10 @@ def _search_category(category, x, y, radius, size=10):
         "radius": radius,
         "size":size,
     }
-    r = requests.get(f"{LOCAL}/search/category.json", headers=_headers(), params=params, timeout=15)
+    r = http.get("kakao", "category", f"{LOCAL}/search/category.json", headers=_headers(), params=params, timeout=15)
     r.raise_for_status()
     places = (r.json() or {}).get("documents", [])
+    catalog.record_kakao(places)
 
     # 2) place_name, x, y 반환 => 구글 장소 세부데이터 요청 필요 (places/google_place)
     return [
@@ -102,7 +109,7 @@ def recommend_place(x, y, radius=2000, category_group_code=None, limit=7):
                     photos = list(place_info.get("place_photos", []))[:1]  # set을 리스트로 변환 후 첫 번째 항목만 가져오기, # 구글 사진 추가
                     p["place_photos"] = photos
 
-                    print(f"data: {p}")
+                    logger.debug("카테고리 추천 장소: %s", p)
 
                     p["review_count"] = res[0].get("review_count", 0) # 구글 리뷰 개수 추가
                     p["place_id"] = res[0].get("place_id", "") # 구글 장소 ID 추가
@@ -138,18 +145,55 @@ def recommend_place(x, y, radius=2000, category_group_code=None, limit=7):
     
     return mixed_results
 
+# 키워드 검색 결과 캐시
+# - 카페/맛집/공원 같은 같은 키워드를 같은 동네에서 사용자마다 반복 검색하므로
+#   (키워드, 중심 좌표를 스냅한 격자 칸, 반경, 개수, 정렬) 단위로 documents 목록을 잠깐 보관
+# - 중심 좌표는 격자 칸 중앙으로 맞춰서 요청 (같은 칸 안의 요청은 같은 결과를 공유)
+#   => 응답의 distance 는 칸 중앙 기준이므로 정확한 거리가 필요하면 호출하는 쪽에서 다시 계산
+KEYWORD_CELL_DEG = 0.005   # 약 550m(위도) x 450m(경도)
+KEYWORD_TTL = 600          # 초
+keyword_cache = TTLCache("kakao_keyword", maxsize=2048, ttl=KEYWORD_TTL)
+
+
+def _snap(value):
+    if value is None or value == "":
+        return None
+    cell = round(float(value) / KEYWORD_CELL_DEG)
+    return cell, round(cell * KEYWORD_CELL_DEG, 6)
+
+
+def keyword_search(query, x, y, radius, size=15, sort=None, timeout=15):
+    """카카오 키워드 검색 documents 목록 (캐시 우선, 반환값은 복사본이라 수정해도 됨)"""
+    sx, sy = _snap(x), _snap(y)
+    key = (query.strip(), sx and sx[0], sy and sy[0], int(radius), size, sort)
+    loaded = False
+
+    def load():
+        nonlocal loaded
+        loaded = True
+        params = {
+            "query": query,
+            "x": sx[1] if sx else x,
+            "y": sy[1] if sy else y,
+            "radius": radius,
+            "size": size,
+        }
+        if sort:
+            params["sort"] = sort
+        r = http.get("kakao", "keyword", f"{LOCAL}/search/keyword.json", headers=_headers(), params=params, timeout=timeout)
+        r.raise_for_status()
+        documents = (r.json() or {}).get("documents", [])
+        catalog.record_kakao(documents)  # 카탈로그 기록은 실제로 받아 온 경우에만
+        return documents
+
+    documents = keyword_cache.get_or_set(key, load)
+    http.cache_result("kakao", "keyword", not loaded)
+    return [dict(d) for d in documents]
+
+
 # 6.2 AI 루트 추천 관련 카테고리 검색
 def look_category(q, x, y, radius, size=1):
-    params = {
-        "query": q,
-        "x": x,
-        "y": y,
-        "radius": radius,
-        "size":size,
-    }
-    r = requests.get(f"{LOCAL}/search/keyword.json", headers=_headers(), params=params, timeout=15)
-    r.raise_for_status()
-    data = (r.json() or {}).get("documents", [])
+    data = keyword_search(q, x, y, radius, size=size)
     
     if data and len(data) > 0:
         data_type = data[0].get("category_group_code", "")
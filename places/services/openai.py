@@ -1,7 +1,9 @@
 import requests
 from django.conf import settings
 
-BASE = "https://api.openai.com/v1/chat/completions"
+from core import http
+
+BASE = f"{settings.OPENAI_API_BASE}/chat/completions"
 
 # 키워드 추출용 슬롯
 SLOT_SCHEMA = {
@@ -115,7 +117,7 @@ def create_question(input_text: str = "지금 질문 리스트 5개를 뽑아줘
         }
     }
 
-    r = requests.post(BASE, headers=_headers(), json=body, timeout=(5, 20))
+    r = http.post("openai", "question", BASE, headers=_headers(), json=body, timeout=(5, 20))
     try:
         r.raise_for_status()
     except requests.HTTPError as e:
@@ -156,7 +158,7 @@ def create_chat(input_text: str, lang: str = "ko", model: str = "gpt-4o-mini"):
         }
     }
 
-    r = requests.post(BASE, headers=_headers(), json=body, timeout=(5, 20))
+    r = http.post("openai", "chat", BASE, headers=_headers(), json=body, timeout=(5, 20))
     try:
         r.raise_for_status()
     except requests.HTTPError as e:
@@ -204,7 +206,7 @@ def create_accurate_summary(place_name: str, reviews: list, lang: str = "ko", mo
         "temperature": 0.3  # 정확하고 일관성 있는 요약을 위해 낮은 temperature 사용
     }
     
-    r = requests.post(BASE, headers=_headers(), json=body, timeout=(5, 20))
+    r = http.post("openai", "place_summary", BASE, headers=_headers(), json=body, timeout=(5, 20))
     try:
         r.raise_for_status()
     except requests.HTTPError as e:
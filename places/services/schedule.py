@@ -0,0 +1,115 @@
+# 동선 시간표 짜기 (TSP 방문 순서 + 구간 이동시간 + 영업시간 -> 도착/출발 시각)
+from core.times import DAYS, MINUTES_PER_DAY, compile_hours, format_time
+from .travel_time import legs_minutes, travel_matrix
+
+# 카테고리별 기본 체류 시간(분)
+STAY_MINUTES = {
+    "FD6": 60,  # 음식점
+    "CE7": 45,  # 카페
+    "AT4": 90,  # 관광명소
+    "CT1": 90,  # 문화시설
+}
+DEFAULT_STAY = 60
+MIN_STAY = 30   # 마감이 가까우면 이 시간까지는 줄여서 방문
+MAX_WAIT = 60   # 영업 시작까지 이 시간보다 오래 기다려야 하면 건너뜀
+
+
+def _simulate(order, hours, stays, matrix, origin, start):
+    # order 순서대로 방문해 보면서 시간표와 건너뛴 장소(사유)를 계산
+    stops, skipped = [], []
+    t, prev = start, None
+    for idx in order:
+        travel = origin[idx] if prev is None else matrix[prev][idx]
+        arrive = t + travel
+        h = hours[idx]
+        stay = stays[idx]
+
+        if h is None:  # 영업시간 정보가 없으면 제약 없이 방문
+            begin = arrive
+        else:
+            begin = h.next_open(arrive)
+            if begin is None:
+                skipped.append((idx, "영업하는 요일이 아닙니다."))
+                continue
+            if begin - arrive > MAX_WAIT:
+                skipped.append((idx, f"영업 시작까지 {begin - arrive}분을 기다려야 합니다."))
+                continue
+            left = h.closes_at(begin) - begin
+            if left < MIN_STAY:
+                skipped.append((idx, f"도착 후 {left}분 뒤 영업이 끝납니다."))
+                continue
+            stay = min(stay, left)
+
+        stops.append((idx, travel, arrive, begin, begin + stay))
+        t, prev = begin + stay, idx
+    return stops, skipped
+
+
+def _repair(order, hours, stays, matrix, origin, start):
+    # 건너뛴 장소를 방문 가능한 위치 중 끝나는 시각이 가장 이른 곳에 끼워 넣기 (cheapest insertion)
+    stops, skipped = _simulate(order, hours, stays, matrix, origin, start)
+    for idx, _ in list(skipped):
+        visited = [s[0] for s in stops]
+        best = None
+        for pos in range(len(visited) + 1):
+            trial = visited[:pos] + [idx] + visited[pos:]
+            t_stops, _ = _simulate(trial, hours, stays, matrix, origin, start)
+            if len(t_stops) != len(trial):
+                continue
+            end = t_stops[-1][4]
+            if best is None or end < best[0]:
+                best = (end, t_stops)
+        if best is not None:
+            stops = best[1]
+    visited = {s[0] for s in stops}
+    skipped = [(idx, reason) for idx, reason in skipped if idx not in visited]
+    return stops, skipped
+
+
+def _clock(week_min, day):
+    # 주 기준 분 -> "HH:MM" (출발 요일을 넘기면 요일을 붙여서 표시)
+    d, m = divmod(week_min, MINUTES_PER_DAY)
+    text = format_time(*divmod(m, 60))
+    return text if d % 7 == day else f"{DAYS[d % 7]} {text}"
+
+
+def build_itinerary(places, order, day, start_minute, mylat=None, mylng=None, matrix=None):
+    """TSP 방문 순서를 영업시간에 맞춰 시간표로 만들기
+    - places: tsp_route.filter 결과 (opening_hours 포함), order: tsp_route 경로
+    - day: 방문 요일 번호(0=일요일), start_minute: 출발 시각(하루 기준 분)
+    - 반환: (시간표 리스트, 건너뛴 장소 리스트)
+    """
+    if matrix is None:
+        matrix = travel_matrix(places)
+
+    if mylat is not None and mylng is not None:
+        origin = [minutes for minutes, _ in legs_minutes([
+            ((mylat, mylng), (float(p["location"]["latitude"]), float(p["location"]["longitude"])))
+            for p in places
+        ])]
+    else:
+        origin = [0] * len(places)
+
+    hours = []
+    for p in places:
+        h = compile_hours(p["opening_hours"]) if p.get("opening_hours") else None
+        hours.append(h if h is not None and h.has_hours else None)
+    stays = [STAY_MINUTES.get(p.get("type"), DEFAULT_STAY) for p in places]
+
+    start = day * MINUTES_PER_DAY + start_minute
+    stops, skipped = _repair(list(order), hours, stays, matrix, origin, start)
+
+    itinerary = [{
+        "place_name": places[idx].get("place_name"),
+        "travel_minutes": travel,
+        "arrival": _clock(arrive, day),
+        "start": _clock(begin, day),
+        "departure": _clock(depart, day),
+        "wait_minutes": begin - arrive,
+        "stay_minutes": depart - begin,
+        "latitude": places[idx]["location"]["latitude"],
+        "longitude": places[idx]["location"]["longitude"],
+    } for idx, travel, arrive, begin, depart in stops]
+
+    skipped = [{"place_name": places[idx].get("place_name"), "reason": reason} for idx, reason in skipped]
+    return itinerary, skipped
@@ -0,0 +1,112 @@
+# 지하철역 메모리 인덱스 (역 이름 부분 검색, 좌표로 가까운 역 찾기)
+# subway_lines 데이터는 작고 거의 바뀌지 않아서 한 번 읽어 두고 메모리에서 검색
+# - 이름 검색은 기존 DB 조회(station__icontains, id 순서, 앞에서 10개)와 같은 결과
+# - 검색어가 초성으로만 이루어져 있으면('ㄱㄴ') 역 이름의 초성에서 같은 방식으로 부분 검색
+#   (입력 중인 글자 매칭은 검색창 자동완성(autocomplete.py)에서)
+import json
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+from core import hangul
+from core.spatial import GridIndex
+from ..models import SubwayLines
+
+SEED_FILE = Path(settings.BASE_DIR) / "subway_lines.json"
+
+_index = None
+_grid = None
+_lock = threading.Lock()
+
+
+def _rows():
+    rows = list(SubwayLines.objects.values_list("station", "line", "longitude", "latitude").order_by("id"))
+    if rows:
+        return rows
+    # DB 에 아직 데이터를 넣지 않았으면 시드 파일에서 읽음
+    if SEED_FILE.exists():
+        with open(SEED_FILE, encoding="utf-8") as f:
+            return [
+                (r["fields"]["station"], r["fields"]["line"],
+                 float(r["fields"]["longitude"]), float(r["fields"]["latitude"]))
+                for r in json.load(f)
+            ]
+    return []
+
+
+def build_index():
+    # (소문자 역 이름, 초성, 항목) 목록, DB id 순서
+    return [
+        (station.lower(), hangul.chosung(station),
+         {"station": station, "line": line, "longitude": lng, "latitude": lat})
+        for station, line, lng, lat in _rows()
+    ]
+
+
+def station_groups():
+    """역 이름별로 노선을 묶은 목록 (같은 역이 여러 노선에 있으면 첫 번째 좌표 사용)"""
+    grouped = {}
+    for station, line, lng, lat in _rows():
+        entry = grouped.get(station)
+        if entry is None:
+            grouped[station] = {"station": station, "lines": [line], "longitude": lng, "latitude": lat}
+        elif line not in entry["lines"]:
+            entry["lines"].append(line)
+    return list(grouped.values())
+
+
+def build_grid():
+    return GridIndex((s["latitude"], s["longitude"], s) for s in station_groups())
+
+
+def get_index():
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = build_index()
+    return _index
+
+
+def get_grid():
+    global _grid
+    if _grid is None:
+        with _lock:
+            if _grid is None:
+                _grid = build_grid()
+    return _grid
+
+
+def reset():
+    # 역 데이터가 바뀌면 다음 검색 때 다시 만듦
+    global _index, _grid
+    with _lock:
+        _index = None
+        _grid = None
+
+
+def search_stations(query, limit=10):
+    """역 이름 부분 일치 검색 (대소문자 무시, id 순서로 limit 개, 빈 검색어면 앞에서부터)
+    - 초성만 입력하면 역 이름 초성에서 부분 일치 ('ㄱㄴ' -> 강남, 강남구청 ...)
+    """
+    if hangul.is_chosung_query(query):
+        q, key = hangul.normalize(query), 1
+    else:
+        q, key = (query or "").lower(), 0
+    result = []
+    for entry in get_index():
+        name, item = entry[key], entry[2]
+        if q in name:
+            result.append(item)
+            if len(result) >= limit:
+                break
+    return result
+
+
+def nearest_stations(lat, lng, k=3, max_km=None):
+    """좌표에서 가까운 역 k개 (역 이름별로 노선 묶음, distance 는 직선거리 km)"""
+    return [
+        {**s, "distance": round(d, 2)}
+        for d, s in get_grid().nearest(float(lat), float(lng), k=k, max_km=max_km)
+    ]
@@ -1,9 +1,12 @@
 import re
-import requests
 from django.conf import settings
+from django.core.cache import cache
 
-BASE = "https://apis.openapi.sk.com/transit/routes"
-ROUTE = "https://apis.openapi.sk.com/tmap/routes"
+from core import http
+
+BASE = settings.TMAP_TRANSIT_BASE    # 대중교통
+ROUTE = settings.TMAP_ROUTE_BASE     # 자동차/도보
+LEG_TTL = 60*60*24  # 구간 소요시간 캐시(1일)
 
 def _headers():
     return {
@@ -12,6 +15,34 @@ def _headers():
             "Accept": "application/json",
     }
 
+# 구간 소요시간(분) 캐시 - 동선 최적화(travel_time)에서 재사용
+# 좌표는 소수점 4자리(약 10m)로 맞춰서 같은 출발/도착지면 같은 키가 되도록 함
+def _leg_key(mode, startX, startY, endX, endY):
+    return "tmap:leg:%s:%.4f:%.4f:%.4f:%.4f" % (mode, float(startX), float(startY), float(endX), float(endY))
+
+def remember_leg(mode, startX, startY, endX, endY, minutes):
+    cache.set(_leg_key(mode, startX, startY, endX, endY), minutes, LEG_TTL)
+
+def cached_leg(mode, startX, startY, endX, endY):
+    return cached_legs([(mode, startX, startY, endX, endY)])[0]
+
+def cached_legs(legs):
+    """[(mode, startX, startY, endX, endY), ...] -> 구간별 소요시간(분) 리스트 (없으면 None)
+    - 캐시는 get_many 한 번으로 조회 (동선 행렬처럼 구간이 많을 때 왕복 횟수를 줄임)
+    - 반대 방향 구간도 소요시간이 비슷하니 같이 찾아봄
+    """
+    keys = [
+        (_leg_key(mode, sx, sy, ex, ey), _leg_key(mode, ex, ey, sx, sy))
+        for mode, sx, sy, ex, ey in legs
+    ]
+    found = cache.get_many({key for pair in keys for key in pair}) if keys else {}
+    result = []
+    for (mode, *_), (forward, backward) in zip(legs, keys):
+        minutes = found.get(forward, found.get(backward))
+        http.cache_result("tmap", mode, minutes is not None)
+        result.append(minutes)
+    return result
+
 # 6.1 등록된 카드의 동선 안내(도보)
 # 지도에 마커찍기 위한 위도경도 포인트 추출
 def map_points(features):
@@ -44,7 +75,7 @@ def walk_route(startX, startY, endX, endY, startName=None, endName=None):
         "endName":endName
     }
     # f"{BASE}:searchNearby"
-    r = requests.post(f"{ROUTE}/pedestrian?version=1", headers=_headers(), json=payload, timeout=5)
+    r = http.post("tmap", "pedestrian", f"{ROUTE}/pedestrian?version=1", headers=_headers(), json=payload, timeout=5)
     r.raise_for_status()
     features = r.json().get("features") or []
     data = features[0].get("properties") or {}
@@ -52,6 +83,7 @@ def walk_route(startX, startY, endX, endY, startName=None, endName=None):
     walk_distance = round((data.get("totalDistance") or 0)/1000, 1)
     walk_time = round((data.get("totalTime") or 0) / 60)
     walk_step = round((data.get("totalDistance") or 0) / 0.7)
+    remember_leg("walk", startX, startY, endX, endY, walk_time)
 
     points = map_points(features)
 
@@ -76,7 +108,7 @@ def traffic_route(startX, startY, endX, endY, lang=0, format="json", count=5):
         "count": count
     }
 
-    r = requests.post(BASE, headers=_headers(), json=payload, timeout=5)
+    r = http.post("tmap", "transit", BASE, headers=_headers(), json=payload, timeout=5)
     r.raise_for_status() #200대가 아니면 에러 발생
 
     data = (r.json().get("metaData") or {}).get("plan") or {}
@@ -92,6 +124,8 @@ def traffic_route(startX, startY, endX, endY, lang=0, format="json", count=5):
     trans_time = round(itin.get("totalTime", 0) / 60)
     trans_distance = round(itin.get("totalDistance", 0) / 1000, 1)
     trans_fare = itin.get("fare", {}).get("regular", {}).get("totalFare", 0)
+    if itineraries:
+        remember_leg("transit", startX, startY, endX, endY, trans_time)
 
     # 구간별 시간, 거리, 노선번호, 승하차정보
     segments = []
@@ -157,7 +191,7 @@ def car_route(startX, startY, endX, endY, lang=0, format="json", count=5):
         "count": count
     }
 
-    r = requests.post(ROUTE, headers=_headers(), json=payload, timeout=5)
+    r = http.post("tmap", "car", ROUTE, headers=_headers(), json=payload, timeout=5)
     r.raise_for_status() #200대가 아니면 에러 발생
 
     data = r.json()
@@ -167,6 +201,7 @@ def car_route(startX, startY, endX, endY, lang=0, format="json", count=5):
     car_distance = round(properties.get("totalDistance", 0)/1000, 1) # 0.0km
     car_time = round(properties.get("totalTime", 0)/60) # 0분
     car_fare = properties.get("taxiFare", 0) + properties.get("totalFare", 0) # 택시요금 + 톨비
+    remember_leg("car", startX, startY, endX, endY, car_time)
 
     car_routes = []
 
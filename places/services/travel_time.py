@@ -0,0 +1,144 @@
+# 장소 간 이동시간(분) 행렬
+# - 티맵으로 실제 조회한 적 있는 구간은 캐시된 소요시간을 그대로 사용
+# - 없는 구간은 직선거리(하버사인) + 이동수단별 속도 모델로 추정하고, 백그라운드에서 티맵으로 채워 둠
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from core.distance import calculate_distance
+from . import tmap
+
+logger = logging.getLogger(__name__)
+
+# 이동수단별 (속도 km/h, 우회 계수, 고정 소요시간 분) - 대중교통은 대기/환승, 자동차는 주차 시간 포함
+SPEED_MODEL = {
+    "walk": (4.5, 1.3, 0),
+    "transit": (18, 1.0, 8),
+    "car": (25, 1.0, 3),
+}
+WALK_LIMIT_KM = 1.0  # auto 모드에서 이 거리 이하는 도보, 넘으면 대중교통
+
+REFINE_WORKERS = 2
+REFINE_LIMIT = 20  # 요청 한 번에 백그라운드로 조회할 최대 구간 수
+# 백그라운드 조회는 유료 API 라 settings.TMAP_REFINE_PER_MINUTE 로 분당 전체 조회 수를 제한
+# (공유 캐시(redis 등)면 모든 워커 합산, 로컬 메모리 캐시면 프로세스마다)
+
+_executor = ThreadPoolExecutor(max_workers=REFINE_WORKERS, thread_name_prefix="travel-time")
+_inflight = set()
+_inflight_lock = threading.Lock()
+
+
+def resolve_mode(mode, km):
+    if mode == "auto":
+        return "walk" if km <= WALK_LIMIT_KM else "transit"
+    return mode
+
+
+def estimate_minutes(km, mode="auto"):
+    """직선거리(km) -> 추정 이동시간(분)"""
+    speed, detour, overhead = SPEED_MODEL[resolve_mode(mode, km)]
+    return round(km * detour / speed * 60) + overhead
+
+
+def _point(p):
+    return float(p["location"]["latitude"]), float(p["location"]["longitude"])
+
+
+def leg_minutes(start, end, mode="auto"):
+    """(위도, 경도) 두 지점 사이 이동시간(분)과 캐시 적중 여부"""
+    return legs_minutes([(start, end)], mode)[0]
+
+
+def legs_minutes(pairs, mode="auto"):
+    """[(출발, 도착), ...] -> [(이동시간(분), 캐시 적중 여부), ...] (캐시 조회는 한 번에)"""
+    kms = [calculate_distance(*start, *end) for start, end in pairs]
+    modes = [resolve_mode(mode, km) for km in kms]
+    # 티맵 좌표는 X=경도, Y=위도
+    cached = tmap.cached_legs([
+        (m, start[1], start[0], end[1], end[0]) for m, (start, end) in zip(modes, pairs)
+    ])
+    return [
+        (minutes, True) if minutes is not None else (estimate_minutes(km, m), False)
+        for minutes, km, m in zip(cached, kms, modes)
+    ]
+
+
+def _refine(mode, start, end):
+    args = dict(startX=start[1], startY=start[0], endX=end[1], endY=end[0])
+    try:
+        # 조회 결과는 tmap 쪽에서 구간 캐시에 저장됨
+        if mode == "walk":
+            tmap.walk_route(**args)
+        elif mode == "transit":
+            tmap.traffic_route(count=1, **args)
+        else:
+            tmap.car_route(count=1, **args)
+    except (requests.RequestException, ValueError, LookupError, AttributeError) as e:
+        logger.warning("구간 조회 실패 %s %s->%s: %s", mode, start, end, e)
+    finally:
+        with _inflight_lock:
+            _inflight.discard((mode, start, end))
+
+
+def _take_budget(n):
+    """이번 분(minute)의 티맵 조회 예산에서 최대 n 개를 가져옴 -> 가져온 개수"""
+    limit = getattr(settings, "TMAP_REFINE_PER_MINUTE", 60)
+    key = f"tmap:refine_budget:{int(time.time() // 60)}"
+    cache.add(key, 0, 120)
+    try:
+        used = cache.incr(key, n)
+    except ValueError:  # 그 사이 만료됨
+        cache.set(key, n, 120)
+        used = n
+    return max(0, min(n, limit - (used - n)))
+
+
+def refine_later(legs):
+    """캐시에 없는 구간을 백그라운드에서 티맵으로 조회 (같은 구간 중복 조회 방지, 분당 조회 수 제한)"""
+    if not settings.TMAP_API_KEY:
+        return 0
+    picked = []
+    with _inflight_lock:
+        for mode, start, end in legs:
+            if len(picked) >= REFINE_LIMIT:
+                break
+            key = (mode, start, end)
+            if key not in _inflight:
+                _inflight.add(key)
+                picked.append(key)
+    if not picked:
+        return 0
+
+    allowed = _take_budget(len(picked))
+    if allowed < len(picked):
+        logger.debug("티맵 조회 예산 초과: %d개 중 %d개만 조회", len(picked), allowed)
+        with _inflight_lock:
+            _inflight.difference_update(picked[allowed:])
+    for mode, start, end in picked[:allowed]:
+        _executor.submit(_refine, mode, start, end)
+    return allowed
+
+
+def travel_matrix(places, mode="auto", refine=True):
+    """장소 간 이동시간(분) n x n 리스트 (matrix[i][j] = i -> j)"""
+    points = [_point(p) for p in places]
+    n = len(points)
+    matrix = [[0] * n for _ in range(n)]
+    cells = [(i, j) for i in range(n) for j in range(n) if i != j]
+    legs = legs_minutes([(points[i], points[j]) for i, j in cells], mode)
+
+    misses = []
+    for (i, j), (minutes, hit) in zip(cells, legs):
+        matrix[i][j] = minutes
+        if not hit and i < j:
+            km = calculate_distance(*points[i], *points[j])
+            misses.append((resolve_mode(mode, km), points[i], points[j]))
+
+    if refine and misses:
+        refine_later(misses)
+    return matrix
@@ -1,37 +1,51 @@
+import logging
+
 import networkx as nx
 from core.distance import calculate_distance
+from core.times import compile_hours, day_index
+from . import stations
 from .kakao import look_category
 from rest_framework.exceptions import ValidationError
 
+logger = logging.getLogger(__name__)
+
+NEAR_STATION_KM = 1.0  # 동선 요약에 붙일 가까운 역 최대 거리 (이보다 멀면 None)
+
 def filter(day, data):
   result = []
+  d = day_index(day)
 
   for place_id, place_info in data.items():
-    times = place_info.get("running_time", [])
     name = place_info.get('place_name')
     location = place_info.get('location')
 
-    # 해당 요일 라인만 추출
-    filter_data = [line for line in times if line.startswith(day)]
+    if "opening_hours" in place_info:
+      # 해당 요일 영업 여부/영업시간 라인은 컴파일된 영업시간에서 가져옴
+      hours = compile_hours(place_info.get("opening_hours"))
+      is_open = d is not None and hours.is_open_on(d)
+      filter_data = hours.day_lines(d) if is_open else []
+    else:
+      # opening_hours 없이 저장된 이전 세션 데이터는 표시용 문자열로 판단
+      times = place_info.get("running_time", [])
+      filter_data = [line for line in times if line.startswith(day)]
+      is_open = not any("휴무" in line for line in filter_data)
+
+    if filter_data and is_open: #해당 요일에 영업 중인 장소의 데이터 반환
+      # 카카오 카테고리 검색
+      data_type = look_category(name, location.get("x"), location.get("y"), radius=2000)
 
-    # 휴무일 체크
-    is_closed = any("휴무" in line for line in filter_data)
-
-    # 카카오 카테고리 검색
-    data_type = look_category(name, location.get("x"), location.get("y"), radius=2000)
-
-    if filter_data and not is_closed: #해당 요일에 영업 중인 장소의 데이터 반환
       result.append({
           "place_name": name,
           "times": filter_data,
           "location":location,
-          "type": data_type
+          "type": data_type,
+          "opening_hours": place_info.get("opening_hours")
       })
   
   return result
 
 def find_nearest_place(places, mylat, mylng):
-    min_distance = 0
+    min_distance = float("inf")
     nearest_idx = 0
     
     for i, place in enumerate(places):
@@ -45,8 +59,8 @@ def find_nearest_place(places, mylat, mylng):
             
     return nearest_idx
 
-def build_distance_matrix(places, mylat=None, mylng=None):
-    # 2차원 km 리스트로 반환
+def build_distance_matrix(places, mylat=None, mylng=None, matrix=None):
+    # 엣지 가중치: matrix(이동시간 분, travel_time.travel_matrix)가 있으면 그 값, 없으면 직선거리 km
     n = len(places)
 
     if n <= 1:
@@ -62,8 +76,12 @@ def build_distance_matrix(places, mylat=None, mylng=None):
 
     for i in range(n):
         for j in range(i+1, n):
-            d = calculate_distance(G.nodes[i]["latitude"], G.nodes[i]["longitude"],
-                                   G.nodes[j]["latitude"], G.nodes[j]["longitude"])
+            if matrix is not None:
+                # 그래프가 무방향이라 왕복 평균을 가중치로 사용
+                d = (matrix[i][j] + matrix[j][i]) / 2
+            else:
+                d = calculate_distance(G.nodes[i]["latitude"], G.nodes[i]["longitude"],
+                                       G.nodes[j]["latitude"], G.nodes[j]["longitude"])
             G[i][j]["weight"] = d
             G[j][i]["weight"] = d
 
@@ -80,61 +98,65 @@ def check_type(places, path):
     categories = [places[i].get("type") for i in path]
     category_set = set(categories)
 
-    print(f"경로 카테고리: {categories}")
-    print(f"카테고리 종류: {category_set}")
+    debug = logger.isEnabledFor(logging.DEBUG)  # 꺼져 있으면 아래 반복문에서 로그 작업을 전혀 하지 않음
+    if debug:
+        logger.debug("경로 카테고리: %s (종류: %s)", categories, category_set)
     
     # 만약 FD6와 CE7만 있다면 제약조건 무시 (예외 처리)
     if category_set <= {"FD6", "CE7"}:
-        print("FD6와 CE7만 있어 제약조건 무시함")
+        logger.debug("FD6와 CE7만 있어 제약조건 무시함")
         return True
         
     for i in range(len(path)-1):
         a, b = places[i], places[i+1]
         a_type = a.get("type")
         b_type = b.get("type")
-        print(f"검사: {i}번째({a_type}) → {i+1}번째({b_type})")
+        if debug:
+            logger.debug("검사: %d번째(%s) → %d번째(%s)", i, a_type, i + 1, b_type)
 
         # 관광 <-> 문화 연속 제한, 다른 선택지가 없으면 허용
         if (a.get("type") == "AT4" and b.get("type") == "CT1") or \
             (a.get("type") == "CT1" and b.get("type") == "AT4"):
-            print(f"  ❌ 관광↔문화 연속 배치됨")
             # 경로의 길이가 짧으면(선택지가 적으면) 허용
             if len(path) <= 4:
-                print("  ✅ 경로가 짧아 제약 무시")
+                if debug:
+                    logger.debug("관광↔문화 연속 배치됨 - 경로가 짧아 제약 무시")
                 continue
-            print("  ❌ 경로 제약 위반: 관광↔문화 규칙")
+            logger.debug("경로 제약 위반: 관광↔문화 규칙")
             return False
         
         # 식당 -> 카페가 이어서 오도록
         if a.get("type") == "FD6" and b.get("type") != "CE7":
-            print(f"  ❌ 식당({a_type}) 다음 카페({b_type})가 아님")
             # 타입에 카페가 없으면 무시
             if "CE7" not in category_set:
-                print("  ✅ 카페가 없어서 제약 무시")
                 continue
             # 카페가 있지만 경로상 배치 불가능한 경우도 허용
             if categories.count("CE7") < categories.count("FD6"):
-                print("  ✅ 카페 수가 식당보다 적어 제약 무시")
                 continue
-            print("  ❌ 경로 제약 위반: 식당→카페 규칙")
+            if debug:
+                logger.debug("경로 제약 위반: 식당(%s) 다음 카페(%s)가 아님", a_type, b_type)
             return False
 
-    print("✅ 모든 제약 조건 통과!")
+    logger.debug("모든 제약 조건 통과")
     return True
 
-def tsp_route(places, cycle=False, mylat=None, mylng=None, start_idx=None, end_idx=None):
+def _visit_once(path):
+    # 이동시간 가중치는 삼각부등식을 만족하지 않을 수 있어서 TSP 근사가 같은 노드를 다시 지나갈 수 있음
+    # -> 처음 방문한 순서만 남김
+    return list(dict.fromkeys(path))
+
+def tsp_route(places, cycle=False, mylat=None, mylng=None, start_idx=None, end_idx=None, matrix=None):
     # 근사 TSP 경로 구하기, cycle=False 일반 경로(시작!=끝), weight 가중치 default
     if not places:
         return []
 
-    G, nearest_idx = build_distance_matrix(places, mylat, mylng)
+    G, nearest_idx = build_distance_matrix(places, mylat, mylng, matrix=matrix)
     # 사용자와 가까운 장소를 start_idx
     if start_idx is None and nearest_idx is not None:
         start_idx = nearest_idx
 
     for i in range(10): # 여러번 반복해서 조건 만족하는 값 찾기
-        path = nx.approximation.traveling_salesman_problem(G, cycle=cycle, weight="weight")
-        print(f"\n===== 시도 {i+1} =====")
+        path = _visit_once(nx.approximation.traveling_salesman_problem(G, cycle=cycle, weight="weight"))
 
         # path는 노드 인덱스 리스트. cycle=True면 마지막이 첫 노드로 돌아오는 형식일 수 있음.
         def rotate_to_start(seq, start):
@@ -145,18 +167,14 @@ def tsp_route(places, cycle=False, mylat=None, mylng=None, start_idx=None, end_i
         
         if start_idx is not None:
             path = rotate_to_start(path, start_idx)
-            print(f"시작점 {start_idx}로 경로 조정")
 
-        print(f"경로: {path}")
+        logger.debug("시도 %d - 경로: %s (시작점 %s)", i + 1, path, start_idx)
         if check_type(places, path):
-                print("✅ 유효한 경로 찾음!")
-                return path
-        else:
-            print("❌ 제약조건 불만족, 다시 시도")
+            return path
         
-    print("\n⚠️ 10번 시도했지만 조건 만족 경로 못 찾음, 제약 없이 반환")
+    logger.info("10번 시도했지만 조건 만족 경로 못 찾음, 제약 없이 반환 (장소 %d개)", len(places))
     # 조건에 만족하지 않으면 제약 없이 반환
-    path = nx.approximation.traveling_salesman_problem(G, cycle=cycle, weight="weight") 
+    path = _visit_once(nx.approximation.traveling_salesman_problem(G, cycle=cycle, weight="weight"))
 
     if start_idx is not None:
         path = rotate_to_start(path, start_idx)
@@ -164,14 +182,17 @@ def tsp_route(places, cycle=False, mylat=None, mylng=None, start_idx=None, end_i
     return path
 
 def route_info(places, path):
-    # 동선 정보 가공
+    # 동선 정보 가공 (가까운 지하철역은 메모리 격자 인덱스에서 찾음, 외부 API 호출 없음)
     data = []
     for i in path:
         p = places[i]
+        lat, lng = p["location"]["latitude"], p["location"]["longitude"]
+        near = stations.nearest_stations(lat, lng, k=1, max_km=NEAR_STATION_KM)
         data.append({
             "place_name": p.get("place_name"),
             "running_time": p.get("times"),
-            "latitude": p["location"]["latitude"],
-            "longitude": p["location"]["longitude"]
+            "latitude": lat,
+            "longitude": lng,
+            "nearest_station": near[0] if near else None,
         })
     return data
\ No newline at end of file
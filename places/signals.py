@@ -0,0 +1,35 @@
+# 메모리 검색 인덱스(자동완성, 지하철역)를 DB 변경에 맞춰 갱신
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from wiki.models import WikiPlace
+from .models import PopularKeyward, SubwayLines
+from .services import autocomplete, stations
+
+
+@receiver(post_save, sender=PopularKeyward)
+def popular_keyword_saved(sender, instance, **kwargs):
+    autocomplete.upsert_place(instance)
+
+
+@receiver(post_delete, sender=PopularKeyward)
+def popular_keyword_deleted(sender, instance, **kwargs):
+    autocomplete.remove_place(instance)
+
+
+@receiver(post_save, sender=WikiPlace)
+def wiki_place_saved(sender, instance, **kwargs):
+    autocomplete.upsert_wiki(instance)
+
+
+@receiver(post_delete, sender=WikiPlace)
+def wiki_place_deleted(sender, instance, **kwargs):
+    autocomplete.remove_wiki(instance)
+
+
+# 역 데이터는 거의 바뀌지 않으니 바뀌면 통째로 다시 만듦 (loaddata 포함)
+@receiver(post_save, sender=SubwayLines)
+@receiver(post_delete, sender=SubwayLines)
+def subway_lines_changed(sender, **kwargs):
+    stations.reset()
+    autocomplete.reset()
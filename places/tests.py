@@ -1,3 +1,540 @@
-from django.test import TestCase
+import io
+import json
+import os
+import queue
+import tempfile
+import time
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from core.distance import calculate_distance
+from places.models import Place, PopularKeyward, SubwayLines
+from places.views import PlaceViewSet
+from places.services import autocomplete, catalog, google, kakao, schedule, stations, tmap, travel_time, tsp_route
+from wiki.models import WikiPlace
+
+
+def _response(body):
+    r = mock.Mock()
+    r.json.return_value = body
+    return r
+
+
+class FetchPlaceTests(SimpleTestCase):
+    """장소 상세 조회가 필요한 필드 셋만 요청하고 캐시를 나눠 쓰는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    @mock.patch("places.services.google.http.get")
+    def test_detail_without_reviews(self, get):
+        get.return_value = _response({"id": "p1", "displayName": {"text": "장소"}})
+        self.assertEqual(google.search_detail("p1")["place_name"], "장소")
+        self.assertNotIn("reviews", get.call_args.kwargs["params"]["fields"])
+
+        google.fetch_place("p1")  # 리뷰가 필요하면 따로 조회
+        self.assertIn("reviews", get.call_args.kwargs["params"]["fields"])
+        self.assertEqual(get.call_count, 2)
+
+    @mock.patch("places.services.google.http.get")
+    def test_detail_reuses_review_response(self, get):
+        get.return_value = _response({"id": "p1", "displayName": {"text": "장소"}, "reviews": []})
+        google.search_detail_with_reviews("p1")
+        google.search_detail("p1")
+        self.assertEqual(get.call_count, 1)
+
+
+def _place(name, *periods, kind="CE7", lat=37.5665, lng=126.978):
+    return {
+        "place_name": name,
+        "location": {"latitude": lat, "longitude": lng},
+        "opening_hours": {"periods": list(periods)} if periods else None,
+        "type": kind,
+    }
+
+
+def _open(day, start, end, close_day=None):
+    sh, sm = divmod(start, 60)
+    eh, em = divmod(end % (24 * 60), 60)
+    return {
+        "open": {"day": day, "hour": sh, "minute": sm},
+        "close": {"day": day if close_day is None else close_day, "hour": eh, "minute": em},
+    }
+
+
+MON, TUE = 1, 2
+
+
+class BuildItineraryTests(SimpleTestCase):
+    """schedule.build_itinerary - 방문 순서를 영업시간에 맞춘 시간표"""
+
+    def build(self, places, start, order=None, day=MON, minutes=10):
+        n = len(places)
+        matrix = [[0 if i == j else minutes for j in range(n)] for i in range(n)]
+        return schedule.build_itinerary(places, order or list(range(n)), day, start, matrix=matrix)
+
+    def test_waits_for_opening(self):
+        place = _place("카페", _open(MON, 12 * 60, 18 * 60))
+        itinerary, skipped = self.build([place], 11 * 60 + 30)
+        self.assertEqual(skipped, [])
+        self.assertEqual(itinerary[0]["arrival"], "11:30")
+        self.assertEqual(itinerary[0]["start"], "12:00")
+        self.assertEqual(itinerary[0]["wait_minutes"], 30)
+
+        itinerary, skipped = self.build([place], 10 * 60)  # 두 시간 기다려야 하면 건너뜀
+        self.assertEqual(itinerary, [])
+        self.assertIn("120분", skipped[0]["reason"])
+
+    def test_skips_closing_and_closed_places(self):
+        closing = _place("곧 마감", _open(MON, 9 * 60, 10 * 60 + 20))
+        closed = _place("화요일만", _open(TUE, 9 * 60, 18 * 60))
+        no_hours = _place("정보 없음")
+        itinerary, skipped = self.build([closing, closed, no_hours], 10 * 60)
+        self.assertEqual([s["place_name"] for s in itinerary], ["정보 없음"])
+        self.assertEqual({s["place_name"] for s in skipped}, {"곧 마감", "화요일만"})
+        self.assertIn("영업이 끝납니다", next(s["reason"] for s in skipped if s["place_name"] == "곧 마감"))
+
+    def test_reinserts_skipped_stop(self):
+        # B 는 11시에 닫아서 A 다음으로는 못 가지만, A 앞에 넣으면 둘 다 방문 가능
+        a = _place("A", _open(MON, 10 * 60, 22 * 60))
+        b = _place("B", _open(MON, 10 * 60, 11 * 60))
+        itinerary, skipped = self.build([a, b], 10 * 60)
+        self.assertEqual(skipped, [])
+        self.assertEqual([s["place_name"] for s in itinerary], ["B", "A"])
+        self.assertEqual(itinerary[1]["start"], "10:55")
+
+    def test_overnight_closing(self):
+        bar = _place("바", _open(MON, 18 * 60, 2 * 60, close_day=TUE), kind="FD6")
+        itinerary, skipped = self.build([bar], 23 * 60 + 30)
+        self.assertEqual(skipped, [])
+        self.assertEqual(itinerary[0]["start"], "23:30")
+        self.assertEqual(itinerary[0]["departure"], "화요일 00:30")
+
+        # 월요일 새벽 01:00 은 전날(일요일) 밤 영업이 이어지는 시간, 02:00 마감까지 남은 시간만큼만 머묾
+        sunday_bar = _place("바", _open(0, 20 * 60, 2 * 60, close_day=MON), kind="FD6")
+        itinerary, _ = self.build([sunday_bar], 60)
+        self.assertEqual(itinerary[0]["stay_minutes"], 60)
+
+        itinerary, skipped = self.build([sunday_bar], 100)  # 마감까지 30분(MIN_STAY) 안 남으면 건너뜀
+        self.assertEqual(itinerary, [])
+        self.assertEqual(len(skipped), 1)
+
+    def test_fifteen_stops_under_50ms(self):
+        places = [
+            _place(f"장소{i}", _open(MON, 9 * 60, 20 * 60), lat=37.5 + i / 1000, lng=126.9 + i / 1000)
+            for i in range(15)
+        ]
+        started = time.perf_counter()
+        itinerary, skipped = self.build(places, 9 * 60, order=list(reversed(range(15))), minutes=15)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(len(itinerary) + len(skipped), 15)
+        self.assertLess(elapsed, 0.05)
+
+
+class AiRoutesDayTests(TestCase):
+    def test_unknown_day_is_rejected(self):
+        store = SessionStore()
+        store["saved_places"] = {}
+        store.create()
+        params = {"session_key": store.session_key, "x": 126.978, "y": 37.5665}
+
+        response = self.client.get("/api/routes/ai_routes", {**params, "day": "Mon"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/routes/ai_routes", {**params, "day": "월요일"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["result"], [])
+
+    @mock.patch("places.services.travel_time.refine_later")
+    @mock.patch("places.services.tsp_route.look_category", return_value="CE7")
+    def test_route_starts_nearest_to_user(self, *_):
+        # 세션에 처음 담은 장소가 사용자에게서 가장 먼 곳 (x=경도, y=위도)
+        store = SessionStore()
+        store["saved_places"] = {
+            f"p{i}": {
+                "place_name": name,
+                "location": {"x": lng, "y": 37.5665, "latitude": 37.5665, "longitude": lng},
+                "opening_hours": {"periods": [_open(MON, 9 * 60, 22 * 60)]},
+            }
+            for i, (name, lng) in enumerate([("먼곳", 127.05), ("중간", 127.01), ("가까운곳", 126.98)])
+        }
+        store.create()
+        response = self.client.get("/api/routes/ai_routes", {
+            "session_key": store.session_key, "x": 126.978, "y": 37.5665, "day": "월요일", "start_time": "10:00",
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p["place_name"] for p in response.json()["result"]], ["가까운곳", "중간", "먼곳"])
+        self.assertEqual(response.json()["itinerary"][0]["place_name"], "가까운곳")
+
+        # 동선 요약의 가까운 역 (1km 안에 없으면 None)
+        SubwayLines.objects.create(line="2호선", station="시청", latitude=37.5657, longitude=126.9769)
+        stations.reset()
+        self.addCleanup(stations.reset)
+        response = self.client.get("/api/routes/ai_routes", {
+            "session_key": store.session_key, "x": 126.978, "y": 37.5665, "day": "월요일", "start_time": "10:00",
+        })
+        near = [p["nearest_station"] and p["nearest_station"]["station"] for p in response.json()["result"]]
+        self.assertEqual(near, ["시청", None, None])
+
+    def test_find_nearest_place(self):
+        places = [_place("먼곳", lng=127.05), _place("가까운곳", lng=126.98), _place("중간", lng=127.01)]
+        self.assertEqual(tsp_route.find_nearest_place(places, 37.5665, 126.978), 1)
+
+
+class TravelMatrixTests(SimpleTestCase):
+    """travel_time.travel_matrix - 캐시된 티맵 구간 + 직선거리 추정, 백그라운드 조회 제한"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(travel_time._inflight.clear)
+        self.places = [
+            _place("시청", lat=37.5665, lng=126.9780),
+            _place("광화문", lat=37.5759, lng=126.9769),
+            _place("명동", lat=37.5636, lng=126.9827),
+        ]
+
+    def test_fallback_estimates(self):
+        matrix = travel_time.travel_matrix(self.places, refine=False)
+        km = calculate_distance(37.5665, 126.9780, 37.5759, 126.9769)
+        self.assertEqual(matrix[0][1], travel_time.estimate_minutes(km))
+        self.assertEqual(matrix[1][0], matrix[0][1])
+        self.assertEqual([matrix[i][i] for i in range(3)], [0, 0, 0])
+
+    def test_cached_legs_in_one_lookup(self):
+        km = calculate_distance(37.5665, 126.9780, 37.5759, 126.9769)
+        mode = travel_time.resolve_mode("auto", km)
+        tmap.remember_leg(mode, 126.9780, 37.5665, 126.9769, 37.5759, 7)  # 시청 -> 광화문만 조회해 둠
+        with mock.patch("places.services.tmap.cache.get_many", wraps=cache.get_many) as get_many:
+            matrix = travel_time.travel_matrix(self.places, refine=False)
+        self.assertEqual(get_many.call_count, 1)
+        self.assertEqual(matrix[0][1], 7)
+        self.assertEqual(matrix[1][0], 7)  # 반대 방향도 같은 구간 사용
+        self.assertEqual(matrix[0][2], travel_time.estimate_minutes(
+            calculate_distance(37.5665, 126.9780, 37.5636, 126.9827)))
+
+    @override_settings(TMAP_API_KEY="test", TMAP_REFINE_PER_MINUTE=3)
+    @mock.patch("places.services.travel_time._executor.submit")
+    def test_refine_budget(self, submit):
+        legs = [("walk", (37.5 + i / 100, 126.9), (37.6, 127.0)) for i in range(5)]
+        self.assertEqual(travel_time.refine_later(legs), 3)
+        self.assertEqual(submit.call_count, 3)
+        # 예산을 못 받은 구간은 진행 중 목록에서 빠져서 다음에 다시 시도할 수 있음
+        self.assertEqual(len(travel_time._inflight), 3)
+        self.assertEqual(travel_time.refine_later(legs), 0)
+        self.assertEqual(submit.call_count, 3)
+
+    def test_tsp_route_uses_matrix(self):
+        # 직선거리로는 0-1-2 순서지만 이동시간으로는 0-1 구간이 가장 오래 걸림
+        line = [_place(f"장소{i}", lat=37.5665, lng=126.978 + i / 100) for i in range(3)]
+        self.assertIn(tsp_route.tsp_route(line), ([0, 1, 2], [2, 1, 0]))
+        matrix = [[0, 100, 1], [100, 0, 1], [1, 1, 0]]
+        self.assertIn(tsp_route.tsp_route(line, matrix=matrix), ([0, 2, 1], [1, 2, 0]))
+
+
+class StationSearchTests(TestCase):
+    """메모리 역 검색이 기존 DB 조회(station__icontains, id 순, 10개)와 같은 결과인지"""
+
+    NAMES = ["강남", "강남구청", "강남대", "김포공항", "기흥", "역삼", "서울역", "신논현", "논현", "Dmc",
+             "강동", "강변", "구기"]
+
+    def setUp(self):
+        for i, name in enumerate(self.NAMES):
+            SubwayLines.objects.create(station=name, line=f"{i % 9 + 1}호선", longitude=127 + i / 100, latitude=37.5)
+        stations.reset()
+        self.addCleanup(stations.reset)
+
+    def expected(self, q):
+        return list(SubwayLines.objects.filter(station__icontains=q).order_by("id").values_list("station", flat=True)[:10])
+
+    def test_matches_icontains(self):
+        for q in ["강남", "논현", "역", "dmc", "기", "강나", "", "없는역"]:
+            with self.subTest(q=q):
+                self.assertEqual([s["station"] for s in stations.search_stations(q)], self.expected(q))
+
+    def test_chosung_query(self):
+        # 초성만 입력하면 역 이름 초성에서 부분 일치 (id 순서)
+        self.assertEqual([s["station"] for s in stations.search_stations("ㄱㄴ")], ["강남", "강남구청", "강남대"])
+        self.assertEqual([s["station"] for s in stations.search_stations("ㄴㅎ")], ["신논현", "논현"])
+        self.assertEqual([s["station"] for s in stations.search_stations("ㄱ ㄴ ㄱ ㅊ")], ["강남구청"])
+        self.assertEqual(len(stations.search_stations("ㄱ", limit=3)), 3)
+        self.assertEqual(stations.search_stations("ㅋㅋ"), [])
+
+    @mock.patch("places.services.kakao._search_address", return_value={"documents": []})
+    def test_locate_dong_bare_station_suffix(self, _):
+        # '역' 만 입력하면 접미사를 떼고 빈 검색어 -> 기존처럼 앞에서부터 10개
+        names = [a["address_name"].split(" (")[0] for a in kakao.locate_dong("역")]
+        self.assertEqual(names, self.expected(""))
+        names = [a["address_name"].split(" (")[0] for a in kakao.locate_dong("강남역")]
+        self.assertEqual(names, ["강남", "강남구청", "강남대"])
+        names = [a["address_name"].split(" (")[0] for a in kakao.locate_dong("ㄱㄴ")]
+        self.assertEqual(names, ["강남", "강남구청", "강남대"])
+
+
+class NearbyStationsViewTests(TestCase):
+    def setUp(self):
+        for i, (name, lng) in enumerate([("시청", 126.9769), ("종각", 126.9829), ("을지로입구", 126.9826)]):
+            SubwayLines.objects.create(station=name, line="2호선" if i != 1 else "1호선", longitude=lng,
+                                       latitude=37.5657 + i * 0.002)
+        SubwayLines.objects.create(station="시청", line="1호선", longitude=126.9772, latitude=37.5658)
+        stations.reset()
+        self.addCleanup(stations.reset)
+        self.view = PlaceViewSet.as_view({"get": "nearby_stations"})
+
+    def get(self, **params):
+        return self.view(APIRequestFactory().get("/api/places/nearby_stations", params))
+
+    def test_nearest_first_with_lines(self):
+        response = self.get(x=126.9770, y=37.5657)
+        self.assertEqual(response.status_code, 200)
+        found = response.data["stations"]
+        self.assertEqual([s["station"] for s in found], ["시청", "종각", "을지로입구"])
+        self.assertEqual(found[0]["lines"], ["2호선", "1호선"])  # 같은 역은 노선을 묶음
+        self.assertEqual([s["distance"] for s in found], sorted(s["distance"] for s in found))
+
+    def test_k_is_clamped(self):
+        self.assertEqual(len(self.get(x=126.977, y=37.5657, k=1).data["stations"]), 1)
+        self.assertEqual(len(self.get(x=126.977, y=37.5657, k=0).data["stations"]), 1)   # 최소 1
+        self.assertEqual(len(self.get(x=126.977, y=37.5657, k=99).data["stations"]), 3)  # 최대 10, 역은 3개뿐
+
+    def test_bad_params(self):
+        for params in [{}, {"x": 126.977}, {"x": "abc", "y": 37.5}, {"x": 126.977, "y": 37.5, "k": "many"}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.get(**params).status_code, 400)
+
+
+class AutocompleteTests(TestCase):
+    """검색바 자동완성 - 시그널로 바로 반영, 다른 워커 변경은 AUTOCOMPLETE_TTL 로 다시 만들어서 반영"""
+
+    def setUp(self):
+        autocomplete.reset()
+        stations.reset()
+        self.addCleanup(autocomplete.reset)
+        self.addCleanup(stations.reset)
+
+    def names(self, q):
+        return [s["name"] for s in autocomplete.suggest(q)]
+
+    def test_ranked_by_clicks(self):
+        PopularKeyward.objects.create(place_id="a", place_name="카페 하나", click_num=1)
+        PopularKeyward.objects.create(place_id="b", place_name="카페 둘", click_num=9)
+        self.assertEqual(self.names("카페")[:2], ["카페 둘", "카페 하나"])
+        self.assertIn("카페 하나", self.names("ㅋㅍㅎ"))
+
+    def test_signal_updates_this_process(self):
+        self.assertEqual(self.names("덕수궁돌담"), [])  # 인덱스 생성
+        PopularKeyward.objects.create(place_id="p1", place_name="덕수궁돌담길")
+        self.assertEqual(self.names("덕수궁돌담"), ["덕수궁돌담길"])
+        PopularKeyward.objects.filter(place_id="p1").first().delete()
+        self.assertEqual(self.names("덕수궁돌담"), [])
+
+    def test_rebuilds_after_ttl(self):
+        self.assertEqual(self.names("청계천광장"), [])
+        # 다른 워커가 저장한 것처럼 시그널 없이 추가
+        PopularKeyward.objects.bulk_create([PopularKeyward(place_id="p2", place_name="청계천광장")])
+        self.assertEqual(self.names("청계천광장"), [])
+        with override_settings(AUTOCOMPLETE_TTL=0):
+            self.assertEqual(self.names("청계천광장"), ["청계천광장"])
+
+
+class LoadSeedTests(TestCase):
+    """load_seed - 같은 파일을 두 번 넣어도 결과가 같고(upsert), 파일의 생성/수정 시각을 유지"""
+
+    RECORDS = [
+        {"model": "places.subwaylines", "pk": 1,
+         "fields": {"line": "2호선", "station": "시청", "longitude": "126.9769", "latitude": "37.5657"}},
+        {"model": "places.subwaylines", "pk": 2,
+         "fields": {"line": "1호선", "station": "종각", "longitude": "126.9829", "latitude": "37.5702"}},
+        {"model": "wiki.wikiplace", "pk": 1,
+         "fields": {"shop_name": "덕수궁", "google_place_id": "ChIJ_duksugung01",
+                    "created_at": "2025-08-22T10:36:44.194Z", "updated_at": "2025-08-22T10:36:44.197Z"}},
+    ]
+
+    def load(self, records):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+        self.addCleanup(os.unlink, f.name)
+        call_command("load_seed", f.name, stdout=io.StringIO())
+
+    def test_idempotent_upsert(self):
+        self.load(self.RECORDS)
+        self.load(self.RECORDS)
+        self.assertEqual(SubwayLines.objects.count(), 2)
+        self.assertEqual(WikiPlace.objects.count(), 1)
+        self.assertEqual(SubwayLines.objects.get(pk=1).longitude, 126.9769)
+
+        place = WikiPlace.objects.get(pk=1)
+        self.assertEqual(place.updated_at.isoformat(), "2025-08-22T10:36:44.197000+00:00")
+        self.assertTrue(WikiPlace._meta.get_field("updated_at").auto_now)
+
+        changed = [dict(r, fields=dict(r["fields"])) for r in self.RECORDS]
+        changed[0]["fields"]["station"] = "시청역"
+        self.load(changed)
+        self.assertEqual(SubwayLines.objects.get(pk=1).station, "시청역")
+        self.assertEqual(SubwayLines.objects.count(), 2)
+
+        # 적재 후 일반 저장은 auto_now 가 그대로 동작
+        loaded = place.updated_at
+        place.save()
+        self.assertGreater(WikiPlace.objects.get(pk=1).updated_at, loaded)
+
+    # wiki.json 과 같은 모양: 평균/개수는 있고 점수 합(total_review_score)은 없음
+    WIKI_RECORDS = [
+        {"model": "wiki.wikiplace", "pk": 1,
+         "fields": {"shop_name": "하이디라오 명동점", "google_place_id": "ChIJ_haidilao01",
+                    "average_review_score": "4.20", "total_review_count": 1,
+                    "created_at": "2025-08-22T10:36:44.194Z", "updated_at": "2025-08-22T10:36:44.197Z"}},
+        {"model": "wiki.review", "pk": 1,
+         "fields": {"wiki_place": 1, "review_content": "맛있어요", "review_score": "4.20", "session_key": "s",
+                    "created_at": "2025-08-22T10:40:00Z", "like_num": 0}},
+    ]
+
+    def check_review_stats_after_seed(self):
+        place = WikiPlace.objects.get(pk=1)
+        self.assertEqual((place.total_review_score, place.total_review_count), (Decimal("4.20"), 1))
+        self.assertEqual(place.blended_review_score, 4.2)
+
+        response = self.client.post(
+            "/api/wiki/reviews", {"place_id": "ChIJ_haidilao01", "review_content": "또 갈게요", "review_score": "5.0"}
+        )
+        self.assertEqual(response.status_code, 201)
+        place.refresh_from_db()
+        self.assertEqual((place.total_review_score, place.total_review_count), (Decimal("9.20"), 2))
+        self.assertEqual(place.average_review_score, Decimal("4.60"))
+        self.assertEqual(place.blended_review_score, 4.6)
+
+    def test_review_stats_after_load_seed(self):
+        self.load(self.WIKI_RECORDS)
+        self.check_review_stats_after_seed()
+
+    def test_review_stats_after_loaddata(self):
+        # loaddata 는 raw 저장이라 리뷰 시그널의 증감 대신 장소 전체 재계산
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+            json.dump(self.WIKI_RECORDS[::-1], f, ensure_ascii=False)  # 리뷰가 장소보다 먼저 와도
+        self.addCleanup(os.unlink, f.name)
+        call_command("loaddata", f.name, stdout=io.StringIO())
+        self.check_review_stats_after_seed()
+
+
+def _google_place(pid, name, lat, lng, **extra):
+    return {"id": pid, "displayName": {"text": name}, "formattedAddress": "서울", "location": {"latitude": lat, "longitude": lng}, **extra}
+
+
+def _kakao_doc(pid, name, lat, lng, **extra):
+    return {"id": pid, "place_name": name, "address_name": "서울", "x": str(lng), "y": str(lat), **extra}
+
+
+@mock.patch("places.services.catalog._ensure_worker")  # 백그라운드 스레드 대신 flush() 로 저장
+class CatalogTests(TestCase):
+    def setUp(self):
+        self.queue = queue.Queue(maxsize=catalog.QUEUE_SIZE)
+        patcher = mock.patch.object(catalog, "_queue", self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.before = dict(catalog.stats)
+
+    def delta(self, key):
+        return catalog.stats[key] - self.before[key]
+
+    def test_enqueue_then_flush(self, _):
+        catalog.record_google([_google_place("g1", "가게", 37.5, 127.0), {"id": "no-location"}])
+        catalog.record_kakao([_kakao_doc(1, "카페", 37.51, 127.01, phone="02-1")])
+        self.assertEqual(self.delta("queued"), 2)  # 좌표 없는 항목은 건너뜀
+        self.assertEqual(Place.objects.count(), 0)  # 요청 경로에서는 저장하지 않음
+
+        self.assertEqual(catalog.flush(), 2)
+        self.assertEqual(self.delta("written"), 2)
+        self.assertTrue(self.queue.empty())
+        cafe = Place.objects.get(kakao_place_id="1")
+        self.assertEqual((cafe.name, cafe.number, cafe.latitude), ("카페", "02-1", 37.51))
+        self.assertEqual(catalog.flush(), 0)
+
+    def test_full_queue_drops(self, _):
+        with mock.patch.object(catalog, "_queue", queue.Queue(maxsize=1)):
+            catalog.record_kakao([_kakao_doc(1, "a", 37.5, 127.0), _kakao_doc(2, "b", 37.5, 127.0)])
+        self.assertEqual((self.delta("queued"), self.delta("dropped")), (1, 1))
+
+    def test_upsert_updates_existing_row(self, _):
+        Place.objects.create(gplace_id="g1", name="옛이름", latitude=37.5, longitude=127.0, number="02-0")
+        catalog.record_google([
+            _google_place("g1", "중간", 37.5, 127.0),
+            _google_place("g1", "새이름", 37.5, 127.0, nationalPhoneNumber="02-9"),  # 같은 배치에서는 마지막 값
+        ])
+        self.assertEqual(catalog.flush(), 1)
+        place = Place.objects.get(gplace_id="g1")
+        self.assertEqual((place.name, place.number), ("새이름", "02-9"))
+        self.assertEqual(Place.objects.count(), 1)
+
+    def test_google_and_kakao_rows_merge(self, _):
+        # 같은 배치에서 처음 나온 구글/카카오 장소 (이름 공백 차이, 약 10m 떨어짐)
+        catalog.record_google([_google_place("g1", "스타벅스 강남역점", 37.49790, 127.02760)])
+        catalog.record_kakao([_kakao_doc(7, "스타벅스강남역점", 37.49799, 127.02762, place_url="http://k/7")])
+        catalog.flush()
+        place = Place.objects.get()
+        self.assertEqual((place.gplace_id, place.kakao_place_id, place.place_url), ("g1", "7", "http://k/7"))
+        self.assertEqual(self.delta("merged"), 1)
+
+        # 다음 배치에 다시 나와도 키로 찾아서 갱신 (행이 늘지 않음)
+        catalog.record_kakao([_kakao_doc(7, "스타벅스강남역점", 37.49799, 127.02762, phone="02-7")])
+        catalog.record_google([_google_place("g1", "스타벅스 강남역점", 37.49790, 127.02760)])
+        catalog.flush()
+        self.assertEqual(Place.objects.get().number, "02-7")
+
+    def test_different_or_distant_places_stay_separate(self, _):
+        catalog.record_google([_google_place("g1", "김밥천국", 37.5, 127.0)])
+        catalog.flush()
+        catalog.record_kakao([
+            _kakao_doc(1, "김밥나라", 37.5, 127.0),           # 같은 건물, 다른 이름
+            _kakao_doc(2, "김밥천국", 37.5 + 0.001, 127.0),   # 같은 이름, 약 110m
+        ])
+        catalog.flush()
+        self.assertEqual(Place.objects.count(), 3)
+        self.assertIsNone(Place.objects.get(gplace_id="g1").kakao_place_id)
+
+    def test_save_error_is_counted(self, _):
+        with mock.patch.object(catalog, "_upsert", side_effect=RuntimeError("db down")), \
+                self.assertLogs("places.services.catalog", "ERROR"):
+            self.assertEqual(catalog._save([{"gplace_id": "x"}]), 0)
+        self.assertEqual(self.delta("errors"), 1)
+
+
+@mock.patch("places.services.kakao.catalog.record_kakao")
+@mock.patch("places.services.kakao.http.get")
+class KeywordCacheTests(SimpleTestCase):
+    """카카오 키워드 검색 캐시 - 중심 좌표를 0.005도 격자 칸 중앙으로 맞춰서 같은 칸 요청끼리 공유"""
+
+    def setUp(self):
+        kakao.keyword_cache.clear()
+        self.addCleanup(kakao.keyword_cache.clear)
+
+    def test_same_cell_shares_one_request(self, get, _):
+        get.return_value = _response({"documents": [{"id": "1", "distance": "120"}]})
+        first = kakao.keyword_search("카페", 126.9781, 37.5664, 2000)
+        kakao.keyword_search("카페 ", "126.9779", "37.5668", 2000)  # 같은 칸, 공백 차이
+        self.assertEqual(get.call_count, 1)
+        params = get.call_args.kwargs["params"]
+        self.assertEqual((params["x"], params["y"]), (126.98, 37.565))  # 칸 중앙으로 요청
+
+        first[0]["distance"] = "변경"  # 반환값은 복사본
+        self.assertEqual(kakao.keyword_search("카페", 126.9781, 37.5664, 2000)[0]["distance"], "120")
+
+    def test_other_cell_or_params_miss(self, get, _):
+        get.return_value = _response({"documents": []})
+        kakao.keyword_search("카페", 126.9781, 37.5664, 2000)
+        kakao.keyword_search("카페", 126.9781 + 0.005, 37.5664, 2000)  # 옆 칸
+        kakao.keyword_search("카페", 126.9781, 37.5664, 1000)          # 다른 반경
+        kakao.keyword_search("카페", 126.9781, 37.5664, 2000, sort="distance")
+        kakao.keyword_search("식당", 126.9781, 37.5664, 2000)
+        self.assertEqual(get.call_count, 5)
+
+    def test_snap_boundaries(self, get, _):
+        self.assertEqual(kakao._snap(127.0024), (25400, 127.0))
+        self.assertEqual(kakao._snap("127.0026"), (25401, 127.005))
+        self.assertIsNone(kakao._snap(None))
+        self.assertIsNone(kakao._snap(""))
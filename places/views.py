@@ -1,3 +1,4 @@
+import logging
 import re
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
@@ -16,12 +17,15 @@ from .serializers import RouteSnapshotCreateSerializer, RouteSnapshotSerializer
 from .models import PopularKeyward, Place
 
 from .serializers import *
-from .services import kakao, tmap, google, openai, tsp_route
+from .services import kakao, tmap, google, openai, tsp_route, schedule, travel_time, autocomplete, stations
+from core.times import day_index
 
 import requests
 import json
 
 from django.shortcuts import get_object_or_404
+
+logger = logging.getLogger(__name__)
 class PlaceViewSet(viewsets.ViewSet):
   
   serializer_class = PlaceMixin #unable to guess serializer 경고 해소용
@@ -80,7 +84,25 @@ class PlaceViewSet(viewsets.ViewSet):
         return Response({"detail": "검색 결과 없음", "google_place": []}, status=204)
 
     return Response({"google_place" : places}, status=200)
-  
+
+  @extend_schema(
+    tags=["🔥메인페이지"], summary="1.3 검색바 / 검색어 자동완성",
+    parameters=[
+        OpenApiParameter(name="query", description="입력 중인 검색어 (초성 검색 가능)", required=True, type=str),
+        OpenApiParameter(name="limit", description="최대 후보 수 (기본 10)", required=False, type=int)
+    ],
+    description="지하철역, 인기 검색 장소, 위키 장소 이름에서 바로 찾음 (구글 호출 없음)"
+  )
+  @action(detail=False, methods=["GET"])
+  def autocomplete(self, request):
+    query = request.query_params.get("query", "")
+    try:
+        limit = min(max(int(request.query_params.get("limit", 10)), 1), 30)
+    except ValueError:
+        return Response({"detail": "limit 은 숫자여야 합니다."}, status=400)
+
+    return Response({"suggestions": autocomplete.suggest(query, limit=limit)}, status=200)
+
   @extend_schema(tags = ["🔥메인페이지"], summary="1.4 장소 찜(저장)하기", parameters=[SavePlaceSerializer])
   @action(detail=False, methods=["GET"])
   def save_place(self, request):
@@ -110,7 +132,7 @@ class PlaceViewSet(viewsets.ViewSet):
 
         # 현재 세션 ID 출력
         session_key = request.session.session_key
-        print(f"Current session key: {session_key}")
+        logger.debug("장소 저장 - session_key: %s", session_key)
                 
         request.session['saved_places'][place_id] = data
         request.session.modified = True  # 세션 변경사항 저장
@@ -206,6 +228,25 @@ class PlaceViewSet(viewsets.ViewSet):
 
     return Response({"address_list": address_list}, status=200)
 
+  @extend_schema(
+        tags=["🔥위치페이지"], summary="2.1 현위치 주변 지하철역",
+        parameters=[
+            OpenApiParameter(name="x", description="경도", required=True, type=float),
+            OpenApiParameter(name="y", description="위도", required=True, type=float),
+            OpenApiParameter(name="k", description="찾을 역 개수 (기본 3, 최대 10)", required=False, type=int)
+        ],
+        description="저장된 지하철역 좌표에서 가까운 역을 찾음 (외부 API 호출 없음), distance 단위 km")
+  @action(detail=False, methods=["GET"])
+  def nearby_stations(self, request):
+    try:
+        x = float(request.query_params.get("x"))
+        y = float(request.query_params.get("y"))
+        k = min(max(int(request.query_params.get("k", 3)), 1), 10)
+    except (TypeError, ValueError):
+        return Response({"detail": "x, y, k 값을 확인해주세요."}, status=400)
+
+    return Response({"stations": stations.nearest_stations(y, x, k=k)}, status=200)
+
   # 카테고리 페이지
   ######################################################################################################
   @extend_schema(
@@ -481,7 +522,7 @@ class ChatViewSet(viewsets.ViewSet):
                     radius = value / 60 * 12000
                 else:
                     radius = value * 1000  # km 단위로 가정 (3km -> 3000m)
-        print(f"radius {radius}")
+        logger.debug("장소 슬롯 검색 반경: %s", radius)
         places = google.search_slot(x=x, y=y, radius=radius)
 
         # ------------3) 장소의 리뷰에 하나씩 접근해서 세션에 저장된 값들이 포함되어있다면 장소 id, 이름 반환-----------
@@ -504,16 +545,15 @@ class ChatViewSet(viewsets.ViewSet):
         matches = google.keyword_match(places, keywords) # 키워드 매칭
         add_count = 0 # 장소 저장 카운트
 
+        debug = logger.isEnabledFor(logging.DEBUG)  # 매칭 상세 로그는 DEBUG 일 때만 (샘플링됨)
         for p in matches:
             place_id = p.get('place_id')
             
             if place_id and place_id not in p_id:
-                print(f"[MATCH] {p.get('place_name')} ({len(p.get('matches', []))} hits)")
-                for hit in p.get('matches', [])[:3]:
-                    print(
-                        f" - 리뷰#{hit['review_index']} "
-                        f"키워드='{hit['keyword']}' (원문='{hit['source_text']}') "
-                        f"내용='{hit['context']}'"
+                if debug:
+                    logger.debug(
+                        "키워드 매칭: %s (%d hits)", p.get('place_name'), len(p.get('matches', [])),
+                        extra={"hits": p.get('matches', [])[:3]},
                     )
                 
                 select.append({
@@ -528,6 +568,7 @@ class ChatViewSet(viewsets.ViewSet):
         # print(f"{add_count}개 장소 추가됨, 현재 총 {len(select)}개")
 
         while len(select) < 20 :
+            add_count = 0  # 이번 시도에서 추가된 수 (같은 결과만 돌아오면 멈추도록 매번 초기화)
             places_two = google.search_slot(x=x, y=y, radius=radius*1.5)
             for t in places_two:
                 t_id = t.get('place_id')
@@ -546,7 +587,7 @@ class ChatViewSet(viewsets.ViewSet):
             # print(f"이번 시도에서 {add_count}개 장소 추가됨, 현재 총 {len(select)}개")
         
             if add_count == 0:  # 더 이상 새로운 장소를 찾지 못하면 종료
-                print("더 이상 새로운 장소를 찾을 수 없습니다.")
+                logger.info("더 이상 새로운 장소를 찾을 수 없습니다. (현재 %d개)", len(select))
                 break
     
     except requests.HTTPError as e:
@@ -581,17 +622,10 @@ class ChatViewSet(viewsets.ViewSet):
         lang = 'ko'
     
     try:
-        # 1. 구글 장소 상세 정보 가져오기
-        place_detail = google.search_detail(place_id)
+        # 1~2. 구글 장소 상세 정보 + 리뷰 5개 (한 번의 호출로 함께 가져오기)
+        place_detail, google_review_data = google.search_detail_with_reviews(place_id, limit=5)
         place_name = place_detail.get('place_name', '알 수 없는 장소')
-        
-        # 2. 구글 리뷰 5개 크롤링
-        google_review_data = {"reviews": [], "review_count": 0}
-        try:
-            google_review_data = google.get_google_reviews(place_id, limit=5)
-            print(f"구글 리뷰 크롤링 완료: {google_review_data['review_count']}개")
-        except Exception as e:
-            print(f"구글 리뷰 크롤링 실패: {e}")
+        logger.debug("구글 리뷰 크롤링 완료: %d개", google_review_data['review_count'])
         
         # 3. AI 정확한 정보 한줄 요약 생성
         place_summary = None
@@ -602,9 +636,9 @@ class ChatViewSet(viewsets.ViewSet):
                     reviews=google_review_data["reviews"],
                     lang=lang
                 )
-                print(f"장소 AI 요약 생성 완료: {place_summary}")
+                logger.debug("장소 AI 요약 생성 완료: %s", place_summary)
             except Exception as e:
-                print(f"장소 AI 요약 생성 실패: {e}")
+                logger.warning("장소 AI 요약 생성 실패: %s", e)
                 place_summary = None
         
         # 4. 기본 메시지 (리뷰가 없거나 AI 요약 실패 시)
@@ -654,7 +688,7 @@ class PlaceRouteViewSet(viewsets.GenericViewSet):
     dx, dy = data["destination_x"], data["destination_y"]
 
     transport = data["transport"]
-    print(f"[DEBUG] 실행된 API: {transport}")
+    logger.debug("경로 조회 이동수단: %s", transport)
 
     # 2) API 호출
     params = dict( #자동차, 대중교통
@@ -710,7 +744,8 @@ class PlaceRouteViewSet(viewsets.GenericViewSet):
         OpenApiParameter(name="session_key", description="세션 키", required=True, type=str),
         OpenApiParameter(name="day", description="방문요일", required=True, type=str),
         OpenApiParameter(name="x", description="경도", required=True, type=float),
-        OpenApiParameter(name="y", description="위도", required=True, type=float)
+        OpenApiParameter(name="y", description="위도", required=True, type=float),
+        OpenApiParameter(name="start_time", description="출발 시각 (HH:MM, 기본 10:00)", required=False, type=str)
     ],
     summary="6.2 AI 추천 받기 / TSP 알고리즘"
   )
@@ -721,6 +756,18 @@ class PlaceRouteViewSet(viewsets.GenericViewSet):
     day = request.query_params.get('day')
     x = request.query_params.get('x')
     y = request.query_params.get('y')
+    start_time = request.query_params.get('start_time') or "10:00"
+
+    try:
+        hour, minute = map(int, start_time.split(":"))
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise ValueError
+    except ValueError:
+        return Response({'error': 'start_time 은 HH:MM 형식이어야 합니다.'}, status=400)
+
+    weekday = day_index(day)
+    if weekday is None:
+        return Response({'error': 'day 는 요일(예: 월요일)이어야 합니다.'}, status=400)
 
     try:
         session = Session.objects.get(session_key=session_key)
@@ -730,11 +777,20 @@ class PlaceRouteViewSet(viewsets.GenericViewSet):
         # 1) 세션에 담긴 장소에서 사용자가 선택한 요일의 영업정보 가져오기
         filter_data = tsp_route.filter(day, data)
 
-        # 2) NetworkX TSP 알고리즘으로 가게간의 직선거리를 엣지 가중치로 최적 경로 구하기
-        routes = tsp_route.tsp_route(filter_data, cycle=False, mylat=float(x), mylng=float(y))
+        # 2) NetworkX TSP 알고리즘으로 가게간의 이동시간을 엣지 가중치로 최적 경로 구하기
+        #    (티맵으로 조회한 적 있는 구간은 실제 소요시간, 나머지는 직선거리 기반 추정)
+        matrix = travel_time.travel_matrix(filter_data)
+        routes = tsp_route.tsp_route(filter_data, cycle=False, mylat=float(y), mylng=float(x), matrix=matrix)
         path = tsp_route.route_info(filter_data, routes)
 
-        return Response({'session_key': session_key, 'result': path})
+        # 3) 방문 순서에 이동시간/영업시간을 반영해 도착·출발 시각 계산 (못 가는 곳은 사유와 함께 제외)
+        itinerary, skipped = schedule.build_itinerary(
+            filter_data, routes, weekday, hour * 60 + minute,
+            mylat=float(y), mylng=float(x), matrix=matrix
+        )
+
+        return Response({'session_key': session_key, 'result': path,
+                         'itinerary': itinerary, 'skipped': skipped})
     except Session.DoesNotExist:
         return Response({'error': '세션을 찾을 수 없습니다.'}, status=404)
 
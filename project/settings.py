@@ -26,6 +26,20 @@ TMAP_API_KEY = os.getenv("TMAP_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# 외부 API 주소 - 부하 테스트/CI 에서는 가짜 서버(bench/fake_upstream.py)를 가리키도록 환경변수로 덮어씀
+GOOGLE_PLACES_BASE = env.str("GOOGLE_PLACES_BASE", "https://places.googleapis.com/v1/places")
+KAKAO_LOCAL_BASE = env.str("KAKAO_LOCAL_BASE", "https://dapi.kakao.com/v2/local")
+KAKAO_NAVI_BASE = env.str("KAKAO_NAVI_BASE", "https://apis-navi.kakaomobility.com/v1/directions")
+TMAP_TRANSIT_BASE = env.str("TMAP_TRANSIT_BASE", "https://apis.openapi.sk.com/transit/routes")
+TMAP_ROUTE_BASE = env.str("TMAP_ROUTE_BASE", "https://apis.openapi.sk.com/tmap/routes")
+OPENAI_API_BASE = env.str("OPENAI_API_BASE", "https://api.openai.com/v1")
+
+# 동선 이동시간을 백그라운드에서 티맵으로 채울 때 분당 최대 조회 수 (places/services/travel_time.py)
+TMAP_REFINE_PER_MINUTE = env.int("TMAP_REFINE_PER_MINUTE", 60)
+
+# 검색바 자동완성 인덱스를 DB 에서 다시 만드는 주기(초) - 워커마다 메모리에 있어서 다른 워커의 변경은 이 주기로 반영
+AUTOCOMPLETE_TTL = env.int("AUTOCOMPLETE_TTL", 300)
+
 # 추가 API 키들은 제거됨 (구글맵 리뷰만 사용)
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -88,12 +102,14 @@ SPECTACULAR_SETTINGS = {
 }
 
 MIDDLEWARE = [
+    'core.middleware.ServerTimingMiddleware',  # 가장 바깥에서 전체 처리 시간 측정 (Server-Timing 헤더)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware", #CORS 추가
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',  # 스태프 확인에 request.user 가 필요해서 인증 미들웨어 뒤
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -124,7 +140,8 @@ WSGI_APPLICATION = 'project.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # SQLITE_PATH 로 다른 파일을 쓸 수 있음 (bench/load.py --self-host 는 임시 DB 사용)
+        'NAME': env.str("SQLITE_PATH", str(BASE_DIR / 'db.sqlite3')),
     }
 }
 
@@ -204,3 +221,45 @@ SESSION_COOKIE_SAMESITE = 'None'
 CSRF_COOKIE_SAMESITE = 'None'
 
 FRONT_ORIGIN = env.str("FRONT_ORIGIN", "https://www.taroute.com").rstrip("/")
+
+
+# 로깅 - 한 줄 JSON 으로 stdout 출력
+# LOG_LEVEL=DEBUG 로 상세 로그를 켜고, LOG_DEBUG_SAMPLE_RATE 로 DEBUG 로그 중 남길 비율 조절
+LOG_LEVEL = env.str("LOG_LEVEL", "INFO").upper()
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "core.logging.JsonFormatter"},
+    },
+    "filters": {
+        "debug_sampling": {
+            "()": "core.logging.DebugSamplingFilter",
+            "rate": env.float("LOG_DEBUG_SAMPLE_RATE", 1.0),
+        },
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "json",
+            "filters": ["debug_sampling"],
+        },
+    },
+    "root": {"handlers": ["console"], "level": LOG_LEVEL},
+    "loggers": {
+        "django": {"handlers": ["console"], "level": "INFO", "propagate": False},
+        "django.db.backends": {"level": "INFO"},  # LOG_LEVEL=DEBUG 에서도 SQL 은 찍지 않음
+    },
+}
+
+
+# 요청 프로파일링 (core.middleware.ProfilingMiddleware)
+# PROFILE_SAMPLE_RATE=0.01 이면 요청 1%를 PROFILE_MODE(sample/cprofile) 로 측정, 결과는 /api/wiki/debug/profiles/ (스태프 전용)
+PROFILE_SAMPLE_RATE = env.float("PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_MODE = env.str("PROFILE_MODE", "sample")
+PROFILE_TOKEN = env.str("PROFILE_TOKEN", "")  # X-Profile-Token 으로 보내면 스태프 로그인 없이 X-Profile 사용
+PROFILE_BUFFER_SIZE = 50
+PROFILE_TOP_N = 30
+
+# /metrics 접근 - Prometheus 는 Authorization: Bearer <METRICS_TOKEN> 로 스크레이프, 비어 있으면 스태프 로그인만 허용
+METRICS_TOKEN = env.str("METRICS_TOKEN", "")
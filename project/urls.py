@@ -20,6 +20,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from drf_spectacular.views import SpectacularJSONAPIView, SpectacularRedocView, SpectacularSwaggerView
 
+from core.metrics import metrics_view
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -28,6 +30,7 @@ urlpatterns = [
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema-json'), name='redoc'),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema-json"), name="swagger-ui"),
     path('api/', include('places.urls')),  # places URLs에 api/ prefix 추가
+    path('metrics', metrics_view, name='metrics'),  # Prometheus 스크레이프용 지표
 ]
 
 # Media files 처리 (개발환경에서만) - 구체적인 패턴만 매치하도록 수정
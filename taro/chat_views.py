@@ -175,7 +175,7 @@ def chat_post_method(viewset_instance, request):
         return Response(response_serializer.data, status=status.HTTP_200_OK)
         
     except Exception as e:
-        logger.error(f"타루 대화 처리 중 오류: {e}")
+        logger.error("타루 대화 처리 중 오류: %s", e)
         return Response({
             "error": "대화 처리 중 오류가 발생했습니다.",
             "details": str(e)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('places', '0015_place_places_plac_latitud_09f61a_idx_and_more'),
+        ('taro', '0002_alter_tarocard_address_alter_tarocard_card_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tarocard',
+            index=models.Index(fields=['latitude', 'longitude'], name='taro_taroca_latitud_1b6adc_idx'),
+        ),
+    ]
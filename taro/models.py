@@ -6,6 +6,7 @@ Taro 앱 모델
 from django.db import models
 from django.utils import timezone
 from places.models import Place
+from core.geo import GeoQuerySet
 
 
 def default_json():
@@ -275,6 +276,8 @@ class TaroCard(models.Model):
         #"카드 생성 시간"
     )
 
+    objects = GeoQuerySet.as_manager()
+
     class Meta:
         verbose_name = "타로 카드"
         verbose_name_plural = "타로 카드들"
@@ -283,6 +286,7 @@ class TaroCard(models.Model):
             models.Index(fields=['card_position']),
             models.Index(fields=['kakao_place_id']),
             models.Index(fields=['google_place_id']),
+            models.Index(fields=['latitude', 'longitude']),
         ]
         # 같은 대화에서 같은 위치의 카드는 중복되지 않도록
         unique_together = ['conversation', 'card_position', 'draw_round']
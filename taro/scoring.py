@@ -0,0 +1,160 @@
+"""
+타로 후보 장소 일괄 점수 계산
+
+reference_score(한 곳씩 계산하던 기존 식)와 같은 점수를 후보 전체에 대해 한 번에 계산
+- 문자열 검사(카테고리 단어, 키워드 포함 여부)는 후보를 배열로 바꿀 때 한 번만 하고
+  (카테고리는 이름별로 캐시), 점수 합산은 NumPy 배열 연산으로 처리
+- 덧셈 순서를 기존 코드와 똑같이 맞추고 마지막 반올림은 파이썬 round 로 해서 결과가 완전히 같음
+"""
+from functools import lru_cache
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+# 음식 취향별 카테고리 단어
+FOOD_CATEGORY_WORDS = {
+    'cafe': ['카페', '커피', '디저트'],
+    'restaurant': ['음식점', '식당', '한식', '양식', '중식'],
+    'bar': ['주점', '바', '펍'],
+}
+FOOD_BITS = {pref: 1 << i for i, pref in enumerate(FOOD_CATEGORY_WORDS)}
+
+# 점수 가중치
+DISTANCE_WEIGHT = 0.3
+CATEGORY_WEIGHT = 0.4
+KEYWORD_SCORE = 5 * 0.2
+COMPLETENESS_WEIGHT = 0.1
+MATCHED_CATEGORY_SCORE = 10
+DEFAULT_CATEGORY_SCORE = 5
+
+
+class Candidates(NamedTuple):
+    """후보 장소를 열 단위 배열로 모은 것"""
+    distance: np.ndarray      # float64, 미터
+    category_id: np.ndarray   # int64, categories 의 인덱스
+    categories: np.ndarray    # int64, 카테고리 id 별 FOOD_BITS 비트마스크
+    keyword: np.ndarray       # bool, 검색 키워드가 장소 이름에 포함되는지
+    completeness: np.ndarray  # int64, 전화번호/도로명주소/장소 URL 개수
+
+
+def reference_score(place: Dict, user_preferences: Dict) -> float:
+    """한 장소의 점수 - 일괄 계산 전 기존 식 그대로 (서비스에서는 쓰지 않음, 테스트/벤치마크 비교 기준)"""
+    score = 0.0
+
+    # 거리 점수 (가까울수록 높은 점수)
+    distance = float(place.get('distance', 0))
+    if distance > 0:
+        distance_score = max(0, 10 - (distance / 500))  # 500m마다 1점 감소
+        score += distance_score * 0.3
+
+    # 카테고리 점수
+    category = place.get('category', '').lower()
+    food_pref = user_preferences.get('food_preference', 'cafe')
+
+    category_score = 0
+    if food_pref == 'cafe' and any(word in category for word in ['카페', '커피', '디저트']):
+        category_score = 10
+    elif food_pref == 'restaurant' and any(word in category for word in ['음식점', '식당', '한식', '양식', '중식']):
+        category_score = 10
+    elif food_pref == 'bar' and any(word in category for word in ['주점', '바', '펍']):
+        category_score = 10
+    else:
+        category_score = 5  # 기본 점수
+
+    score += category_score * 0.4
+
+    # 키워드 매칭 점수
+    search_keyword = place.get('search_keyword', '')
+    if search_keyword and search_keyword in place.get('name', ''):
+        score += 5 * 0.2
+
+    # 정보 완성도 점수
+    completeness = 0
+    if place.get('phone'):
+        completeness += 1
+    if place.get('road_address'):
+        completeness += 1
+    if place.get('place_url'):
+        completeness += 1
+
+    score += completeness * 0.1
+
+    return round(score, 2)
+
+
+@lru_cache(maxsize=1024)
+def category_bits(category: str) -> int:
+    """카테고리 이름이 어느 음식 취향에 해당하는지 비트마스크로"""
+    category = category.lower()
+    bits = 0
+    for pref, words in FOOD_CATEGORY_WORDS.items():
+        if any(word in category for word in words):
+            bits |= FOOD_BITS[pref]
+    return bits
+
+
+def to_candidates(places: List[Dict]) -> Candidates:
+    """장소 dict 목록 -> Candidates"""
+    n = len(places)
+    distance = np.empty(n, dtype=np.float64)
+    category_id = np.empty(n, dtype=np.int64)
+    keyword = np.zeros(n, dtype=bool)
+    completeness = np.zeros(n, dtype=np.int64)
+    ids = {}
+
+    for i, place in enumerate(places):
+        distance[i] = float(place.get('distance', 0))
+        category_id[i] = ids.setdefault(place.get('category', ''), len(ids))
+        search_keyword = place.get('search_keyword', '')
+        keyword[i] = bool(search_keyword) and search_keyword in place.get('name', '')
+        completeness[i] = bool(place.get('phone')) + bool(place.get('road_address')) + bool(place.get('place_url'))
+
+    categories = np.fromiter((category_bits(c) for c in ids), dtype=np.int64, count=len(ids))
+    return Candidates(distance, category_id, categories, keyword, completeness)
+
+
+def score_candidates(candidates: Candidates, user_preferences: Dict) -> np.ndarray:
+    """반올림 전 점수 배열"""
+    food_bit = FOOD_BITS.get(user_preferences.get('food_preference', 'cafe'), 0)
+
+    distance = candidates.distance
+    distance_score = np.where(distance > 0, np.maximum(0, 10 - (distance / 500)) * DISTANCE_WEIGHT, 0.0)
+
+    matched = (candidates.categories & food_bit) != 0
+    category_score = np.where(matched, MATCHED_CATEGORY_SCORE, DEFAULT_CATEGORY_SCORE)[candidates.category_id]
+
+    # 기존 코드의 score += ... 순서 그대로 더함 (부동소수점 결과를 같게 유지)
+    score = 0.0 + distance_score
+    score = score + category_score * CATEGORY_WEIGHT
+    score = score + np.where(candidates.keyword, KEYWORD_SCORE, 0.0)
+    score = score + candidates.completeness * COMPLETENESS_WEIGHT
+    return score
+
+
+def score_places(places: List[Dict], user_preferences: Dict) -> List[float]:
+    """장소 목록의 점수 (소수 둘째 자리 반올림, reference_score 와 동일한 값)"""
+    if not places:
+        return []
+    raw = score_candidates(to_candidates(places), user_preferences)
+    # np.round 는 파이썬 round 와 경계값에서 결과가 다를 수 있어 파이썬 round 사용
+    return [round(s, 2) for s in raw.tolist()]
+
+
+def top_k(scores, k: int) -> List[int]:
+    """점수 높은 순 상위 k개 인덱스
+    - sorted(..., reverse=True)[:k] 와 같은 결과 (동점이면 원래 순서가 앞선 것 우선)
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return []
+    if k < n:
+        # k번째로 큰 값을 기준으로 그보다 큰 것 전부 + 같은 것 중 앞쪽부터 채움
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        idx = np.concatenate([above, ties])
+    else:
+        idx = np.arange(n)
+    order = np.lexsort((idx, -scores[idx]))
+    return idx[order].tolist()
@@ -96,7 +96,6 @@ class TaroCardSerializer(serializers.ModelSerializer):
     
     # API 응답에서 사용할 카드 ID
     card_id = serializers.CharField(
-        source='card_id',
         read_only=True,
         #"카드 고유 식별자"
     )
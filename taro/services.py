@@ -8,14 +8,32 @@ Taro 서비스 모듈
 import requests
 import logging
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import List, Dict, Optional, Tuple
 from django.conf import settings
 from django.utils import timezone
 from decimal import Decimal
+import numpy as np
+from core import http
+from core.distance import haversine
+from places.services import kakao
+from . import scoring
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# 키워드별 카카오 검색을 동시에 보내는 공용 스레드 풀 (요청이 몰려도 프로세스당 동시 호출 수는 이 이하)
+# - 셔플 한 번의 키워드는 최대 16개라, 워커 16개면 캐시에 없는 셔플 하나는 한 번에 다 나감
+# - 풀은 프로세스 전체가 같이 쓰므로 셔플이 겹치면 나중 요청의 키워드는 줄을 섬
+#   마감 시간은 요청마다 제출 시점부터 재기 때문에 기다린 시간도 포함되고,
+#   못 받은 키워드는 취소(아직 시작 안 했으면 호출 자체를 안 함)하고 받은 결과로만 카드를 만듦
+# - 카카오 호출 상한을 지키는 용도라 동시 요청 수에 맞춰 키우지 않음 (프로세스/워커 수로 확장)
+KAKAO_SEARCH_WORKERS = 16
+# 키워드 검색 전체에 주는 시간(초) - 이 안에 못 받은 키워드는 버리고 받은 결과만 사용
+KAKAO_SEARCH_DEADLINE = 6.0
+_kakao_executor = ThreadPoolExecutor(max_workers=KAKAO_SEARCH_WORKERS, thread_name_prefix="taro-kakao")
+
 
 class TaruAIService:
     """타루 AI 대화 서비스
@@ -35,7 +53,12 @@ class TaruAIService:
         except ImportError:
             raise RuntimeError("openai 패키지가 설치되어야 합니다: pip install openai")
         
-        self._client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self._client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_API_BASE)
+
+    def _complete(self, operation: str, **kwargs):
+        """chat.completions 호출 (core.http 로 지연 시간/실패 계측)"""
+        with http.timed("openai", operation):
+            return self._client.chat.completions.create(**kwargs)
     
     def generate_greeting_message(self, user_location: Optional[str] = None) -> str:
         """인사 메시지 생성
@@ -62,7 +85,8 @@ class TaruAIService:
 """
         
         try:
-            response = self._client.chat.completions.create(
+            response = self._complete(
+                "greeting",
                 model="gpt-5-mini",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=200,
@@ -70,7 +94,7 @@ class TaruAIService:
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
-            logger.error(f"인사 메시지 생성 실패: {e}")
+            logger.error("인사 메시지 생성 실패: %s", e)
             return "안녕하세요! 저는 타루입니다. 🔮 몇 가지 질문을 통해 당신에게 완벽한 장소를 찾아드릴게요!"
     
     def generate_question(
@@ -135,7 +159,8 @@ D) [선택지4] (필요시)"
 """
         
         try:
-            response = self._client.chat.completions.create(
+            response = self._complete(
+                "question",
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=300,
@@ -143,7 +168,7 @@ D) [선택지4] (필요시)"
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
-            logger.error(f"질문 생성 실패: {e}")
+            logger.error("질문 생성 실패: %s", e)
             # 기본 질문들
             default_questions = [
                 "오늘은 어떤 분위기를 원하시나요?\nA) 조용하고 차분한 곳\nB) 활기차고 에너지 넘치는 곳",
@@ -198,7 +223,8 @@ JSON 형태로만 응답해주세요:
 """
         
         try:
-            response = self._client.chat.completions.create(
+            response = self._complete(
+                "analyze",
                 model="gpt-5-mini",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=200,
@@ -230,7 +256,7 @@ JSON 형태로만 응답해주세요:
             return updated_preferences
             
         except Exception as e:
-            logger.error(f"답변 분석 실패: {e}")
+            logger.error("답변 분석 실패: %s", e)
             return current_preferences
     
     def generate_recommendation_summary(
@@ -267,7 +293,8 @@ JSON 형태로만 응답해주세요:
 """
         
         try:
-            response = self._client.chat.completions.create(
+            response = self._complete(
+                "recommendation_summary",
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=250,
@@ -275,7 +302,7 @@ JSON 형태로만 응답해주세요:
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
-            logger.error(f"추천 요약 생성 실패: {e}")
+            logger.error("추천 요약 생성 실패: %s", e)
             return f"당신의 취향을 바탕으로 {len(recommended_places)}개의 특별한 장소를 준비했어요! 🔮 이제 카드를 뽑아보세요!"
 
 
@@ -289,7 +316,7 @@ class PlaceRecommendationService:
     
     def __init__(self):
         """서비스 초기화"""
-        self.kakao_base_url = "https://dapi.kakao.com/v2/local"
+        self.kakao_base_url = settings.KAKAO_LOCAL_BASE
         
     def _get_kakao_headers(self) -> Dict[str, str]:
         """카카오 API 헤더 생성"""
@@ -319,17 +346,31 @@ class PlaceRecommendationService:
         search_keywords = self._generate_search_keywords(user_preferences)
         all_places = []
         
-        for keyword in search_keywords:
+        # 키워드별 검색을 동시에 보내고, 공통 마감 시간까지 도착한 결과만 사용
+        # (결과는 키워드 순서대로 합쳐서 순차 호출 때와 같은 순서를 유지)
+        deadline = time.monotonic() + KAKAO_SEARCH_DEADLINE
+        futures = [
+            (keyword, _kakao_executor.submit(
+                http.bind(self._search_kakao_places),
+                keyword=keyword,
+                x=user_longitude,
+                y=user_latitude,
+                radius=radius,
+                timeout=KAKAO_SEARCH_DEADLINE
+            ))
+            for keyword in search_keywords
+        ]
+        
+        for keyword, future in futures:
             try:
-                places = self._search_kakao_places(
-                    keyword=keyword,
-                    x=user_longitude,
-                    y=user_latitude,
-                    radius=radius
-                )
+                places = future.result(timeout=max(deadline - time.monotonic(), 0))
                 all_places.extend(places)
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning("장소 검색 시간 초과 - 키워드: %s", keyword)
+                continue
             except Exception as e:
-                logger.error(f"장소 검색 실패 - 키워드: {keyword}, 에러: {e}")
+                logger.error("장소 검색 실패 - 키워드: %s, 에러: %s", keyword, e)
                 continue
         
         # 중복 제거 및 점수 계산
@@ -338,7 +379,8 @@ class PlaceRecommendationService:
         )
         
         # 상위 50개 선택 (카드 25장의 2배로 여유분 확보)
-        return sorted(unique_places, key=lambda x: x['score'], reverse=True)[:50]
+        top = scoring.top_k([p['score'] for p in unique_places], 50)
+        return [unique_places[i] for i in top]
     
     def _generate_search_keywords(self, user_preferences: Dict) -> List[str]:
         """사용자 취향 기반 검색 키워드 생성"""
@@ -385,31 +427,21 @@ class PlaceRecommendationService:
         keyword: str, 
         x: float, 
         y: float, 
-        radius: int = 5000
+        radius: int = 5000,
+        timeout: float = 10
     ) -> List[Dict]:
         """카카오 API로 장소 검색"""
-        url = f"{self.kakao_base_url}/search/keyword.json"
-        params = {
-            'query': keyword,
-            'x': x,
-            'y': y,
-            'radius': radius,
-            'size': 15,  # 키워드당 최대 15개
-            'sort': 'distance'  # 거리순 정렬
-        }
-        
-        response = requests.get(
-            url, 
-            headers=self._get_kakao_headers(), 
-            params=params,
-            timeout=10
+        # 같은 동네의 같은 키워드는 places.services.kakao 의 키워드 캐시를 먼저 확인
+        documents = kakao.keyword_search(
+            keyword, x, y, radius,
+            size=15,  # 키워드당 최대 15개
+            sort='distance',  # 거리순 정렬
+            timeout=timeout
         )
-        response.raise_for_status()
-        
-        data = response.json()
         places = []
         
-        for place in data.get('documents', []):
+        for place in documents:
+            lat, lng = float(place.get('y', 0)), float(place.get('x', 0))
             places.append({
                 'kakao_id': place.get('id'),
                 'name': place.get('place_name'),
@@ -417,9 +449,10 @@ class PlaceRecommendationService:
                 'address': place.get('address_name'),
                 'road_address': place.get('road_address_name'),
                 'phone': place.get('phone'),
-                'latitude': float(place.get('y', 0)),
-                'longitude': float(place.get('x', 0)),
-                'distance': place.get('distance', '0'),
+                'latitude': lat,
+                'longitude': lng,
+                # 캐시된 결과의 distance 는 격자 칸 중앙 기준이라 사용자 위치에서 다시 계산 (m)
+                'distance': str(round(haversine(float(y), float(x), lat, lng) * 1000)),
                 'place_url': place.get('place_url'),
                 'search_keyword': keyword
             })
@@ -441,65 +474,13 @@ class PlaceRecommendationService:
             if kakao_id not in unique_places:
                 unique_places[kakao_id] = place
         
-        # 각 장소에 점수 부여
-        scored_places = []
-        for place in unique_places.values():
-            score = self._calculate_place_score(place, user_preferences, user_lat, user_lng)
+        # 각 장소에 점수 부여 (후보 전체를 한 번에 계산, 기준식은 scoring.reference_score)
+        scored_places = list(unique_places.values())
+        for place, score in zip(scored_places, scoring.score_places(scored_places, user_preferences)):
             place['score'] = score
-            scored_places.append(place)
         
         return scored_places
     
-    def _calculate_place_score(
-        self, 
-        place: Dict, 
-        user_preferences: Dict,
-        user_lat: float,
-        user_lng: float
-    ) -> float:
-        """장소 점수 계산"""
-        score = 0.0
-        
-        # 거리 점수 (가까울수록 높은 점수)
-        distance = float(place.get('distance', 0))
-        if distance > 0:
-            distance_score = max(0, 10 - (distance / 500))  # 500m마다 1점 감소
-            score += distance_score * 0.3
-        
-        # 카테고리 점수
-        category = place.get('category', '').lower()
-        food_pref = user_preferences.get('food_preference', 'cafe')
-        
-        category_score = 0
-        if food_pref == 'cafe' and any(word in category for word in ['카페', '커피', '디저트']):
-            category_score = 10
-        elif food_pref == 'restaurant' and any(word in category for word in ['음식점', '식당', '한식', '양식', '중식']):
-            category_score = 10
-        elif food_pref == 'bar' and any(word in category for word in ['주점', '바', '펍']):
-            category_score = 10
-        else:
-            category_score = 5  # 기본 점수
-        
-        score += category_score * 0.4
-        
-        # 키워드 매칭 점수
-        search_keyword = place.get('search_keyword', '')
-        if search_keyword and search_keyword in place.get('name', ''):
-            score += 5 * 0.2
-        
-        # 정보 완성도 점수
-        completeness = 0
-        if place.get('phone'):
-            completeness += 1
-        if place.get('road_address'):
-            completeness += 1
-        if place.get('place_url'):
-            completeness += 1
-        
-        score += completeness * 0.1
-        
-        return round(score, 2)
-    
     def select_diverse_cards(
         self, 
         places: List[Dict], 
@@ -567,3 +548,21 @@ def calculate_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) ->
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
     
     return round(R * c, 2)
+
+
+def calculate_distances_km(lat: float, lon: float, coords: List[Tuple[float, float]]) -> List[float]:
+    """한 지점에서 여러 좌표까지의 거리 일괄 계산 (calculate_distance_km 과 같은 공식, km 소수 둘째 자리)"""
+    if not coords:
+        return []
+    points = np.radians(np.asarray(coords, dtype=np.float64))
+    lat1_rad, lon1_rad = np.radians(lat), np.radians(lon)
+    lat2_rad, lon2_rad = points[:, 0], points[:, 1]
+    
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+    
+    a = (np.sin(dlat/2)**2 +
+         np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    
+    return [round(d, 2) for d in (6371.0 * c).tolist()]
@@ -1,3 +1,230 @@
-from django.test import TestCase
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIRequestFactory
+
+from core.distance import haversine
+from taro import scoring, services
+
+# taro 앱은 아직 INSTALLED_APPS 에 없어서 모델을 쓰는 테스트는 앱을 켠 설정에서만 실행
+# (모델 import 도 앱이 없으면 실패하므로 테스트 안에서 import)
+TARO_INSTALLED = apps.is_installed("taro")
+
+
+def _place(kakao_id, name="장소", category="카페", distance="300", **extra):
+    return {
+        "kakao_id": kakao_id, "name": name, "category": category, "distance": distance,
+        "address": "서울", "road_address": "", "phone": "", "place_url": "",
+        "latitude": 37.5, "longitude": 127.0, "search_keyword": "", "score": 5.0, **extra,
+    }
+
+
+class ScoringTests(SimpleTestCase):
+    """taro.scoring 일괄 계산이 한 곳씩 계산하는 기준식(reference_score)과 같은 결과인지"""
+
+    CATEGORIES = ["카페", "커피전문점", "디저트카페", "한식", "양식", "중식", "일식", "술집", "호프,요리주점",
+                  "칵테일바", "공원", "미술관", "BAR", ""]
+    KEYWORDS = ["카페", "맛집", "공원", ""]
+
+    def make_places(self, n, rng):
+        places = []
+        for i in range(n):
+            keyword = rng.choice(self.KEYWORDS)
+            place = {
+                "kakao_id": str(i),
+                "name": f"{rng.choice(['', keyword])}장소{i}",
+                "category": rng.choice(self.CATEGORIES),
+                # 0, 경계(5000m = 거리 점수 0), 반올림 경계가 나오기 쉬운 값 포함
+                "distance": str(rng.choice([0, 5000, 7500, 125, 375, rng.randint(1, 8000), rng.random() * 6000])),
+                "phone": rng.choice(["", "02-000-0000"]),
+                "road_address": rng.choice(["", "서울 중구"]),
+                "place_url": rng.choice(["", "http://place.map.kakao.com/1"]),
+                "search_keyword": keyword,
+            }
+            if rng.random() < 0.1:
+                del place["category"]  # 빠진 키는 기본값
+            places.append(place)
+        return places
+
+    def test_scores_match_reference(self):
+        rng = random.Random(0)
+        for n in (1, 7, 500):
+            places = self.make_places(n, rng)
+            for food in ("cafe", "restaurant", "bar", "other", None):
+                prefs = {} if food is None else {"food_preference": food}
+                with self.subTest(n=n, food=food):
+                    expected = [scoring.reference_score(p, prefs) for p in places]
+                    self.assertEqual(scoring.score_places(places, prefs), expected)
+
+    def test_top_k_matches_sorted(self):
+        rng = random.Random(1)
+        for n, k in [(0, 5), (5, 0), (5, 10), (60, 50), (500, 50), (500, 1)]:
+            # 동점이 많도록 점수 범위를 좁게
+            scores = [round(rng.choice([1.5, 2.0, 2.5]) + rng.randint(0, 3), 2) for _ in range(n)]
+            expected = sorted(range(n), key=lambda i: scores[i], reverse=True)[:k]
+            with self.subTest(n=n, k=k):
+                self.assertEqual(scoring.top_k(scores, k), expected)
+
+    def test_service_uses_batch_scores(self):
+        places = self.make_places(30, random.Random(2))
+        prefs = {"food_preference": "bar"}
+        scored = services.PlaceRecommendationService()._deduplicate_and_score_places(
+            places + places[:5], prefs, 37.5, 127.0  # 중복은 한 번만
+        )
+        self.assertEqual(len(scored), 30)
+        self.assertEqual([p["score"] for p in scored], [scoring.reference_score(p, prefs) for p in places])
+        self.assertEqual(scoring.score_places([], prefs), [])
+
+
+class KeywordSearchDeadlineTests(SimpleTestCase):
+    """키워드 검색 병렬 처리: 마감 시간이 지나면 늦은 키워드는 버리고 대기 중인 호출은 취소"""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)  # 막아 둔 워커 스레드 정리
+        self.called = []
+
+        def search(keyword, **kwargs):
+            self.called.append(keyword)
+            if keyword == "느림":
+                self.release.wait(5)
+            return [_place(f"{keyword}-1", name=keyword)]
+
+        service = services.PlaceRecommendationService()
+        patches = [
+            mock.patch.object(service, "_search_kakao_places", side_effect=search),
+            mock.patch.object(services, "KAKAO_SEARCH_DEADLINE", 0.2),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.service = service
+
+    def search(self, keywords):
+        with mock.patch.object(self.service, "_generate_search_keywords", return_value=keywords):
+            return self.service.search_places_by_preferences({}, 37.5, 127.0)
+
+    def test_late_keyword_is_dropped(self):
+        started = time.monotonic()
+        with self.assertLogs("taro.services", "WARNING") as logs:
+            places = self.search(["빠름", "느림", "빠름2"])
+        self.assertLess(time.monotonic() - started, 1.0)  # 느린 키워드를 기다리지 않음
+        self.assertEqual({p["name"] for p in places}, {"빠름", "빠름2"})
+        self.assertIn("느림", logs.output[0])
+
+    def test_queued_keywords_are_cancelled(self):
+        # 워커 1개: 느린 키워드가 자리를 잡고 있어서 뒤 키워드는 시작도 못 한 채 마감
+        with mock.patch.object(services, "_kakao_executor", ThreadPoolExecutor(max_workers=1)) as pool:
+            self.addCleanup(pool.shutdown, wait=False)
+            with self.assertLogs("taro.services", "WARNING") as logs:
+                places = self.search(["느림", "대기"])
+            self.release.set()
+            pool.shutdown(wait=True)
+        self.assertEqual(places, [])
+        self.assertEqual(self.called, ["느림"])  # 취소된 키워드는 호출되지 않음
+        self.assertEqual(len(logs.output), 2)
+
+    def test_failed_keyword_does_not_break_search(self):
+        def search(keyword, **kwargs):
+            if keyword == "오류":
+                raise RuntimeError("kakao 500")
+            return [_place(keyword)]
+
+        with mock.patch.object(self.service, "_search_kakao_places", side_effect=search), \
+                self.assertLogs("taro.services", "ERROR"):
+            places = self.search(["오류", "정상"])
+        self.assertEqual([p["kakao_id"] for p in places], ["정상"])
+
+
+class KakaoDistanceTests(SimpleTestCase):
+    """키워드 캐시는 격자 칸 중앙 기준 결과를 공유하므로 거리는 사용자 실제 위치에서 다시 계산"""
+
+    def setUp(self):
+        services.kakao.keyword_cache.clear()
+        self.addCleanup(services.kakao.keyword_cache.clear)
+
+    @mock.patch("places.services.kakao.catalog.record_kakao")
+    @mock.patch("places.services.kakao.http.get")
+    def test_cache_hit_uses_real_origin(self, get, _):
+        doc = {"id": "1", "place_name": "카페", "x": "126.9800", "y": "37.5650", "distance": "5"}
+        response = mock.Mock()
+        response.json.return_value = {"documents": [doc]}
+        get.return_value = response
+        service = services.PlaceRecommendationService()
+
+        # 같은 격자 칸 안의 서로 다른 두 사용자 위치
+        origins = [(126.9781, 37.5664), (126.9799, 37.5631)]
+        for x, y in origins:
+            place = service._search_kakao_places("카페", x=x, y=y)[0]
+            expected = round(haversine(y, x, 37.5650, 126.9800) * 1000)
+            self.assertEqual(place["distance"], str(expected))
+        self.assertEqual(get.call_count, 1)  # 두 번째는 캐시 적중
+        self.assertNotEqual(*(service._search_kakao_places("카페", x=x, y=y)[0]["distance"] for x, y in origins))
+
+
+@skipUnless(TARO_INSTALLED, "taro 앱이 INSTALLED_APPS 에 없음")
+class DrawCardsTests(TestCase):
+    """셔플/다시 뽑기 - 외부 검색 후 잠금을 잡고 뽑기 횟수를 다시 확인"""
+
+    def setUp(self):
+        from taro.models import TaroConversation
+
+        self.conversation = TaroConversation.objects.create(
+            session_key="s" * 32, conversation_stage="recommending",
+            user_latitude=37.5, user_longitude=127.0, user_preferences={"food_preference": "cafe"},
+        )
+        self.places = [_place(str(i), name=f"카페{i}", distance=str(100 * i)) for i in range(40)]
+
+    def call(self, action):
+        from taro.views import TaroViewSet
+
+        view = TaroViewSet.as_view({"get": action})
+        request = APIRequestFactory().get(f"/api/taro/{action}", {"session_key": self.conversation.session_key})
+        return view(request)
+
+    def test_draw_limit_rechecked_after_search(self):
+        from taro.models import TaroCard, TaroConversation
+
+        def search(**kwargs):
+            # 검색하는 사이 다른 요청이 남은 뽑기를 다 써 버림
+            TaroConversation.objects.filter(pk=self.conversation.pk).update(
+                card_draw_count=self.conversation.max_card_draws
+            )
+            return self.places
+
+        with mock.patch.object(services.PlaceRecommendationService, "search_places_by_preferences", side_effect=search):
+            response = self.call("shuffle")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(TaroCard.objects.exists())
+
+    def test_query_count(self):
+        # 대화 조회, (세이브포인트) 잠금 재조회, 이전 카드 삭제, 카드 bulk insert, 대화 갱신 - 카드 수와 무관
+        with mock.patch.object(services.PlaceRecommendationService, "search_places_by_preferences", return_value=self.places):
+            with self.assertNumQueries(7):
+                response = self.call("shuffle")
+        self.assertEqual(response.data["total_cards"], 25)
+
+        with mock.patch.object(services.PlaceRecommendationService, "search_places_by_preferences", return_value=self.places[:5]):
+            with self.assertNumQueries(7):
+                response = self.call("redraw")
+        self.assertEqual(response.data["total_cards"], 5)
+
+    def test_shuffle_then_redraw(self):
+        from taro.models import TaroCard
+
+        with mock.patch.object(services.PlaceRecommendationService, "search_places_by_preferences", return_value=self.places):
+            first = self.call("shuffle")
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(first.data["total_cards"], 25)
+            self.assertTrue(first.data["can_redraw"])
+
+            second = self.call("redraw")
+            self.assertEqual(second.status_code, 200)
+            self.assertFalse(second.data["can_redraw"])
+            self.assertEqual(self.call("redraw").status_code, 400)
+        self.assertEqual(TaroCard.objects.filter(conversation=self.conversation).count(), 50)
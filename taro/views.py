@@ -25,7 +25,7 @@ from .serializers import (
     TaroCartItemSerializer,
     TaroCartQuerySerializer,
 )
-from .services import TaruAIService, PlaceRecommendationService, calculate_distance_km
+from .services import TaruAIService, PlaceRecommendationService, calculate_distances_km
 
 logger = logging.getLogger(__name__)
 
@@ -114,76 +114,91 @@ class TaroViewSet(viewsets.GenericViewSet):
                     "error": "카드 뽑기 횟수를 초과했습니다."
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            if conversation.conversation_stage not in ["recommending", "completed"]:
-                return Response({
-                    "error": "아직 대화가 충분히 진행되지 않았습니다."
-                }, status=status.HTTP_400_BAD_REQUEST)
+            return self._draw_cards(conversation, session_key)
             
-            if not (conversation.user_latitude and conversation.user_longitude):
+        except Exception as e:
+            logger.error("카드 셔플 중 오류: %s", e)
+            return Response({
+                "error": "카드 생성 중 오류가 발생했습니다."
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def _draw_cards(self, conversation, session_key):
+        """카드 25장 선정 후 저장 (shuffle/redraw 공통)
+        - 카드는 bulk_create 한 번으로 저장하고, 응답은 메모리의 카드 객체로 바로 직렬화
+        - 외부 검색을 빼면 DB 왕복 횟수는 카드 수와 무관하게 일정
+        """
+        if conversation.conversation_stage not in ["recommending", "completed"]:
+            return Response({
+                "error": "아직 대화가 충분히 진행되지 않았습니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not (conversation.user_latitude and conversation.user_longitude):
+            return Response({
+                "error": "위치 정보가 필요합니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # 외부 API 검색/카드 선정은 트랜잭션 밖에서 (DB 잠금을 잡은 채로 카카오 응답을 기다리지 않도록)
+        recommendation_service = PlaceRecommendationService()
+        recommended_places = recommendation_service.search_places_by_preferences(
+            user_preferences=conversation.user_preferences or {},
+            user_latitude=conversation.user_latitude,
+            user_longitude=conversation.user_longitude
+        )
+        
+        selected_places = recommendation_service.select_diverse_cards(
+            places=recommended_places, count=25
+        )
+        
+        # 사용자 위치에서 카드 장소까지 거리는 한 번에 계산
+        distances = calculate_distances_km(
+            conversation.user_latitude, conversation.user_longitude,
+            [(place_data.get('latitude', 0), place_data.get('longitude', 0)) for place_data in selected_places]
+        )
+        
+        with transaction.atomic():
+            # 검색하는 동안 다른 요청이 먼저 뽑았을 수 있으니 잠그고 다시 확인
+            conversation = TaroConversation.objects.select_for_update().get(pk=conversation.pk)
+            if not conversation.can_draw_cards():
                 return Response({
-                    "error": "위치 정보가 필요합니다."
+                    "error": "카드 뽑기 횟수를 초과했습니다."
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            with transaction.atomic():
-                recommendation_service = PlaceRecommendationService()
-                recommended_places = recommendation_service.search_places_by_preferences(
-                    user_preferences=conversation.user_preferences or {},
-                    user_latitude=conversation.user_latitude,
-                    user_longitude=conversation.user_longitude
-                )
-                
-                selected_places = recommendation_service.select_diverse_cards(
-                    places=recommended_places, count=25
-                )
-                
-                current_draw = conversation.card_draw_count + 1
-                TaroCard.objects.filter(
-                    conversation=conversation, draw_round=current_draw
-                ).delete()
-                
-                cards = []
-                for i, place_data in enumerate(selected_places, 1):
-                    distance_km = calculate_distance_km(
-                        conversation.user_latitude, conversation.user_longitude,
-                        place_data.get('latitude', 0), place_data.get('longitude', 0)
-                    )
-                    
-                    card_id = f"{session_key[:8]}-{current_draw}-{i:02d}"
-                    
-                    card = TaroCard.objects.create(
-                        conversation=conversation,
-                        card_id=card_id,
-                        place_name=place_data['name'],
-                        distance=f"{distance_km}km",
-                        category=place_data.get('category', '기타'),
-                        address=place_data.get('address', ''),
-                        road_address=place_data.get('road_address', ''),
-                        phone=place_data.get('phone', ''),
-                        recommendation_reason=f"취향 점수: {place_data.get('score', 0):.1f}/10",
-                        card_position=i,
-                        draw_round=current_draw,
-                        kakao_place_id=place_data.get('kakao_id', ''),
-                        latitude=place_data.get('latitude'),
-                        longitude=place_data.get('longitude')
-                    )
-                    cards.append(card)
-                
-                conversation.card_draw_count = current_draw
-                conversation.conversation_stage = "completed"
-                conversation.save(update_fields=["card_draw_count", "conversation_stage", "updated_at"])
+            current_draw = conversation.card_draw_count + 1
+            TaroCard.objects.filter(
+                conversation=conversation, draw_round=current_draw
+            ).delete()
             
-            serializer = TaroCardSerializer(cards, many=True)
-            return Response({
-                "cards": serializer.data,
-                "total_cards": len(cards),
-                "can_redraw": conversation.can_draw_cards()
-            }, status=status.HTTP_200_OK)
+            cards = [
+                TaroCard(
+                    conversation=conversation,
+                    card_id=f"{session_key[:8]}-{current_draw}-{i:02d}",
+                    place_name=place_data['name'],
+                    distance=f"{distance_km}km",
+                    category=place_data.get('category', '기타'),
+                    address=place_data.get('address', ''),
+                    road_address=place_data.get('road_address', ''),
+                    phone=place_data.get('phone', ''),
+                    recommendation_reason=f"취향 점수: {place_data.get('score', 0):.1f}/10",
+                    card_position=i,
+                    draw_round=current_draw,
+                    kakao_place_id=place_data.get('kakao_id', ''),
+                    latitude=place_data.get('latitude'),
+                    longitude=place_data.get('longitude')
+                )
+                for i, (place_data, distance_km) in enumerate(zip(selected_places, distances), 1)
+            ]
+            TaroCard.objects.bulk_create(cards)
             
-        except Exception as e:
-            logger.error(f"카드 셔플 중 오류: {e}")
-            return Response({
-                "error": "카드 생성 중 오류가 발생했습니다."
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            conversation.card_draw_count = current_draw
+            conversation.conversation_stage = "completed"
+            conversation.save(update_fields=["card_draw_count", "conversation_stage", "updated_at"])
+        
+        serializer = TaroCardSerializer(cards, many=True)
+        return Response({
+            "cards": serializer.data,
+            "total_cards": len(cards),
+            "can_redraw": conversation.can_draw_cards()
+        }, status=status.HTTP_200_OK)
 
     @extend_schema(
         tags=["타로 카드"],
@@ -214,11 +229,11 @@ class TaroViewSet(viewsets.GenericViewSet):
                     "error": "먼저 카드를 뽑아주세요."
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # shuffle 메서드와 동일한 로직으로 다시 뽑기
-            return self.shuffle(request)
+            # shuffle 메서드와 동일한 로직으로 다시 뽑기 (조회한 대화를 그대로 넘김)
+            return self._draw_cards(conversation, session_key)
             
         except Exception as e:
-            logger.error(f"카드 다시 뽑기 중 오류: {e}")
+            logger.error("카드 다시 뽑기 중 오류: %s", e)
             return Response({
                 "error": "카드 다시 뽑기 중 오류가 발생했습니다."
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -269,7 +284,7 @@ class TaroViewSet(viewsets.GenericViewSet):
             return Response(serializer.data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"카드 선택 중 오류: {e}")
+            logger.error("카드 선택 중 오류: %s", e)
             return Response({
                 "error": "카드 선택 중 오류가 발생했습니다."
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
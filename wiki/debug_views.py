@@ -1,13 +1,15 @@
 """
-디버깅용 뷰 - 크롤링 리뷰 수집 테스트
+디버깅용 뷰 - 크롤링 리뷰 수집 테스트, 요청 프로파일 조회
 """
 
 import logging
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
+from core import profiling
 from .service import google
 from .service.openai import create_crawled_reviews_summary
 
@@ -115,3 +117,39 @@ class ReviewCrawlerDebugViewSet(viewsets.ViewSet):
                 {"error": f"크롤링 테스트 실패: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class ProfileDebugViewSet(viewsets.ViewSet):
+    """요청 프로파일 조회 뷰셋 (스태프 전용) - core.middleware.ProfilingMiddleware 가 모은 결과
+    - 프로세스(워커)별 메모리 링 버퍼라서 같은 워커로 간 요청의 결과만 보임
+    """
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=["🔧디버깅"],
+        parameters=[
+            OpenApiParameter(name="ordering", description="정렬", required=False, type=str, enum=["latest", "slowest"], default="latest"),
+        ],
+        summary="요청 프로파일 목록 (함수별 상세 제외)"
+    )
+    def list(self, request):
+        items = [{k: v for k, v in e.items() if k != "top"} for e in profiling.entries()]
+        if request.query_params.get("ordering") == "slowest":
+            items.sort(key=lambda e: e["duration_ms"], reverse=True)
+        return Response(items)
+
+    @extend_schema(tags=["🔧디버깅"], summary="요청 프로파일 상세 (오래 걸린 함수 top-N, DB 쿼리 수/시간)")
+    def retrieve(self, request, pk=None):
+        try:
+            entry = profiling.get(int(pk))
+        except ValueError:
+            entry = None
+        if entry is None:
+            return Response({"error": "프로파일이 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(entry)
+
+    @extend_schema(tags=["🔧디버깅"], summary="요청 프로파일 비우기")
+    @action(detail=False, methods=["POST"])
+    def clear(self, request):
+        profiling.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,139 @@
+"""
+위키 홈 피드 캐시
+- 3.2 현재 핫한 게시판 (좋아요순 7개), 3.1 최근 업데이트된 위키 (최신 5개)
+- 피드는 Django 캐시에 보관하고, 리뷰 작성/좋아요/삭제 시 wiki/signals.py 에서 invalidate()
+- 캐시 키에 피드 버전(마지막 변경 시각)을 넣어서, 무효화 직전에 만들어진 피드가 새 버전으로 저장되지 않도록 함
+- "n분 전" 같은 상대 시간은 캐시하지 않고 응답할 때마다 계산
+"""
+
+import hashlib
+import json
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .models import Review
+
+FEED_TTL = 300  # 초, 무효화가 누락돼도 이 시간이 지나면 다시 만듦
+HOT_SIZE = 7
+RECENT_SIZE = 5
+VERSION_KEY = "wiki:feeds:version"
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _now_version():
+    return time.time_ns() // 1000  # 마이크로초
+
+
+def invalidate():
+    """피드 버전을 올려서 기존 캐시를 버림"""
+    version = cache.get(VERSION_KEY) or 0
+    cache.set(VERSION_KEY, max(_now_version(), version + 1), None)
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _now_version(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _get_feed(name, build):
+    """{"items": [...], "last_modified": datetime} 형태의 피드 (없으면 build() 로 만들어 저장)"""
+    version = _version()
+    key = f"wiki:feeds:{name}:{version}"
+    feed = cache.get(key)
+    if feed is None:
+        feed = {
+            "items": build(),
+            "last_modified": datetime.fromtimestamp(version / 1_000_000, tz=dt_timezone.utc),
+        }
+        cache.set(key, feed, FEED_TTL)
+    return feed
+
+
+def _reviews():
+    return Review.objects.select_related("wiki_place").only(
+        "id", "review_content", "like_num", "created_at",
+        "wiki_place__shop_name", "wiki_place__google_place_id", "wiki_place__blended_review_score",
+    )
+
+
+def hot_reviews():
+    """좋아요 많은 리뷰 피드"""
+    def build():
+        return [
+            {
+                "id": r.id,
+                "place_name": r.wiki_place.shop_name,
+                "gplace_id": r.wiki_place.google_place_id,
+                "review_content": r.review_content,
+                "like_num": r.like_num,
+                "review_score": r.wiki_place.blended_review_score,  # 장소의 위키 별점
+            }
+            for r in _reviews().order_by("-like_num")[:HOT_SIZE]
+        ]
+    return _get_feed("hot", build)
+
+
+def recent_reviews():
+    """최근 작성된 리뷰 피드 (created_at 은 datetime 그대로 보관)"""
+    def build():
+        return [
+            {
+                "place_name": r.wiki_place.shop_name,
+                "review_content": r.review_content,
+                "created_at": r.created_at,
+            }
+            for r in _reviews().order_by("-created_at")[:RECENT_SIZE]
+        ]
+    return _get_feed("recent", build)
+
+
+def time_text(created_at, now=None):
+    """작성 시각 -> "방금 전" / "n분 전" / "n시간 전" / "n일 전" / "YYYY년 MM월 DD일" """
+    time_diff = (now or timezone.now()) - created_at
+
+    # 시간 차이 계산
+    minutes = int(time_diff.total_seconds() // 60)
+    hours = int(time_diff.total_seconds() // 3600)
+    days = time_diff.days
+
+    if days > 7:
+        # 7일 이상이면 'YYYY년 MM월 DD일' 형식으로 표시 (로컬 타임 기준)
+        return timezone.localtime(created_at).strftime("%Y년 %m월 %d일")
+    if days > 0:
+        return f"{days}일 전"
+    if hours > 0:
+        return f"{hours}시간 전"
+    if minutes > 0:
+        return f"{minutes}분 전"
+    return "방금 전"
+
+
+def format_datetime(value):
+    """시리얼라이저와 같은 형식의 날짜 문자열"""
+    return _datetime_field.to_representation(value)
+
+
+def conditional_response(request, feed, data):
+    """ETag(응답 본문 해시) / Last-Modified(피드 변경 시각) 를 붙이고, 클라이언트 캐시가 최신이면 304"""
+    body = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+    etag = quote_etag(hashlib.md5(body.encode()).hexdigest())
+    last_modified = int(feed["last_modified"].timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = Response(data)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "no-cache"  # 저장은 하되 쓰기 전에 항상 재검증
+    return response
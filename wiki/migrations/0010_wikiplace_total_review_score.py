@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:14
+
+from django.db import migrations, models
+
+
+def backfill_review_stats(apps, schema_editor):
+    # 기존 리뷰로 점수 합/개수/평균을 한 번 채워 둠 (이후로는 시그널에서 증감)
+    WikiPlace = apps.get_model('wiki', 'WikiPlace')
+    Review = apps.get_model('wiki', 'Review')
+    stats = Review.objects.values('wiki_place').annotate(
+        total=models.Sum('review_score'), count=models.Count('id')
+    )
+    for row in stats:
+        WikiPlace.objects.filter(pk=row['wiki_place']).update(
+            total_review_score=row['total'],
+            total_review_count=row['count'],
+            average_review_score=row['total'] / row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wiki', '0009_alter_review_review_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wikiplace',
+            name='total_review_score',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+    ]
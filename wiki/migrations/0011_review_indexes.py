@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wiki', '0010_wikiplace_total_review_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['wiki_place', 'created_at'], name='wiki_review_wiki_pl_c73055_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['like_num'], name='wiki_review_like_nu_d5909c_idx'),
+        ),
+    ]
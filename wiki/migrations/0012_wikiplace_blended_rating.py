@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:18
+
+from django.db import migrations, models
+
+
+def backfill_blended_score(apps, schema_editor):
+    # 구글 별점은 아직 없으므로 자체 리뷰가 있는 장소는 자체 평점으로 채움 (상세 조회 때 구글 별점과 다시 결합)
+    WikiPlace = apps.get_model('wiki', 'WikiPlace')
+    WikiPlace.objects.filter(total_review_count__gt=0).update(
+        blended_review_score=models.F('average_review_score')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wiki', '0011_review_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wikiplace',
+            name='blended_review_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='wikiplace',
+            name='google_rating',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_blended_score, migrations.RunPython.noop),
+    ]
@@ -82,6 +82,26 @@ class WikiPlace(models.Model):
         # "🔥전체 리뷰 개수"
     )
 
+    total_review_score = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0.00,
+        # "전체 리뷰 점수 합 (리뷰 작성/삭제 시 wiki/signals.py 에서 증감)"
+    )
+
+    # 구글 별점 (장소 상세 조회 때 받아 온 값)
+    google_rating = models.FloatField(
+        blank=True,
+        null=True,
+        # "구글 Places API 별점"
+    )
+
+    # 위키 별점 (자체 리뷰 + 구글 별점 결합, wiki/service/rating.py)
+    blended_review_score = models.FloatField(
+        default=0.0,
+        # "자체 리뷰 통계나 구글 별점이 바뀔 때만 다시 계산"
+    )
+
     # 위키 정보 생성/수정 시간
     created_at = models.DateTimeField(
         default=timezone.now,
@@ -113,25 +133,25 @@ class WikiPlace(models.Model):
         return f"WikiPlace: {self.shop_name or self.google_place_id}"
 
     def update_review_stats(self):
-        """리뷰 통계 업데이트 메서드
-        - 평균 점수와 리뷰 개수를 재계산하여 캐시
+        """리뷰 통계 전체 재계산 메서드
+        - 평소에는 리뷰 작성/삭제 시 시그널에서 증감하므로 호출할 필요 없음 (데이터 보정용)
+        - 시그널을 거치지 않고 들어온 리뷰(시드 적재 등) 뒤에 호출하면 위키 별점과 홈 피드까지 맞춰 줌
         """
-        reviews = self.reviews.all()
+        from . import feeds
+        from .service import rating
 
-        if reviews.exists():
-            # 평균 점수 계산
-            self.average_review_score = (
-                reviews.aggregate(avg_score=models.Avg("review_score"))["avg_score"]
-                or 0.00
-            )
+        stats = self.reviews.aggregate(
+            total=models.Sum("review_score"), count=models.Count("id")
+        )
+        self.total_review_score = stats["total"] or 0
+        self.total_review_count = stats["count"]
+        self.average_review_score = (
+            self.total_review_score / self.total_review_count if self.total_review_count else 0.00
+        )
 
-            # 리뷰 개수 계산
-            self.total_review_count = reviews.count()
-        else:
-            self.average_review_score = 0.00
-            self.total_review_count = 0
-
-        self.save(update_fields=["average_review_score", "total_review_count"])
+        self.save(update_fields=["average_review_score", "total_review_count", "total_review_score"])
+        self.blended_review_score = rating.recompute(self.pk)
+        feeds.invalidate()  # 핫 게시판 피드에 위키 별점이 들어감
 
 
 class WikiSearchHistory(models.Model):
@@ -238,6 +258,12 @@ class Review(models.Model):
     class Meta:
         verbose_name = "리뷰"
         verbose_name_plural = "리뷰들"
+        indexes = [
+            # 장소별 최신 리뷰 목록 (커서 페이지네이션)
+            models.Index(fields=["wiki_place", "created_at"]),
+            # 좋아요순 인기 리뷰
+            models.Index(fields=["like_num"]),
+        ]
 
     def __str__(self):
         return f"리뷰: {self.wiki_place} - {self.review_score}점"
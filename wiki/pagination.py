@@ -0,0 +1,39 @@
+"""
+Wiki 앱 페이지네이션
+- 리뷰 목록은 커서 기반 (OFFSET 없이 인덱스 (wiki_place, created_at) 로 다음 페이지를 바로 찾음)
+"""
+
+from django.db.models import BigIntegerField, ExpressionWrapper, F
+from rest_framework.pagination import CursorPagination
+
+# 좋아요순 커서 키 = like_num * LIKE_RANK_BASE + id
+# - DRF 커서는 정렬 첫 필드 값 하나만 위치로 저장하는데, like_num 은 겹치는 값이 많아서
+#   그대로 쓰면 같은 좋아요 수 안에서는 offset 으로 넘어가 페이지 사이에 리뷰가 빠지거나 겹침
+# - (like_num, id) 를 정수 하나로 합쳐 겹치지 않는 위치로 사용 (like_num 은 PositiveSmallIntegerField 라 넘치지 않음)
+# - 보는 도중 좋아요 수가 바뀐 리뷰는 순서 자체가 바뀌므로 그 리뷰만 다른 페이지로 옮겨갈 수 있음
+LIKE_RANK_BASE = 1 << 40
+
+
+class ReviewCursorPagination(CursorPagination):
+    """장소별 리뷰 목록 커서 페이지네이션
+    - ordering=latest (기본) : 최신순
+    - ordering=liked         : 좋아요순 (좋아요 수가 같으면 나중에 작성된 순)
+    """
+    page_size = 10
+    page_size_query_param = "size"
+    max_page_size = 50
+
+    ORDERINGS = {
+        "latest": ("-created_at", "-id"),
+        "liked": ("-like_rank",),
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get("ordering") == "liked":
+            queryset = queryset.annotate(like_rank=ExpressionWrapper(
+                F("like_num") * LIKE_RANK_BASE + F("id"), output_field=BigIntegerField()
+            ))
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        return self.ORDERINGS.get(request.query_params.get("ordering"), self.ORDERINGS["latest"])
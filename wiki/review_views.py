@@ -11,8 +11,6 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
-from datetime import datetime, timedelta
-from dateutil import parser
 from django.utils import timezone
 
 # from places.models import Place
@@ -23,12 +21,25 @@ from .serializers import (
     WikiReportSerializer,
     WikiReportCreateSerializer,
 )
+from . import feeds
+from .pagination import ReviewCursorPagination
 from .service import openai
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 리뷰 목록 응답(WikiReviewSerializer)에 필요한 컬럼만 조회 (장소 정보는 JOIN 으로 함께)
+REVIEW_LIST_FIELDS = (
+    "id", "review_content", "review_score", "review_image", "created_at", "like_num",
+    "wiki_place__shop_name", "wiki_place__google_place_id",
+)
+
+
+def review_list_queryset():
+    """리뷰 목록용 쿼리셋 - 리뷰마다 wiki_place 를 따로 조회하지 않도록 select_related + only"""
+    return Review.objects.select_related("wiki_place").only(*REVIEW_LIST_FIELDS)
+
 
 class WikiReviewViewSet(viewsets.GenericViewSet):
     """위키 리뷰 뷰셋 - 3.2.2 후기 작성 기능"""
@@ -41,6 +52,37 @@ class WikiReviewViewSet(viewsets.GenericViewSet):
             return WikiReviewCreateSerializer
         return WikiReviewSerializer
 
+    def get_queryset(self):
+        if self.action == 'by_place':
+            return review_list_queryset()
+        return super().get_queryset()
+
+    @extend_schema(
+        tags=["🔥위키페이지"],
+        parameters=[
+            OpenApiParameter(name="place_id", description="구글 장소ID", required=True, type=str),
+            OpenApiParameter(name="ordering", description="정렬", required=False, type=str, enum=["latest", "liked"], default="latest"),
+            OpenApiParameter(name="size", description="페이지 크기 (최대 50)", required=False, type=int, default=10),
+            OpenApiParameter(name="cursor", description="다음/이전 페이지 커서", required=False, type=str),
+        ],
+        responses={200: WikiReviewSerializer(many=True)},
+        summary="3.4.2 장소별 후기 목록 - 커서 페이지네이션 (최신순/좋아요순)"
+    )
+    @action(detail=False, methods=["GET"])
+    def by_place(self, request):
+        place_id = request.query_params.get('place_id')
+        if not place_id:
+            return Response(
+                {'detail': 'place_id는 필수 파라미터입니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.get_queryset().filter(wiki_place__google_place_id=place_id)
+        paginator = ReviewCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = WikiReviewSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
     @extend_schema(
         tags=["🔥위키페이지"],
         request={'multipart/form-data': WikiReviewCreateSerializer},
@@ -60,15 +102,13 @@ class WikiReviewViewSet(viewsets.GenericViewSet):
 
                 if review.review_score < 0 or review.review_score > 5:
                     raise ValueError("wiki 리뷰 점수는 0보다는 크고, 5보다는 작아야 합니다.")
-
-                # 통계 갱신
-                review.wiki_place.update_review_stats()
+                # 통계(점수 합/개수/평균)는 wiki/signals.py 에서 리뷰 저장 시 같은 트랜잭션으로 갱신
 
             # 응답용 시리얼라이저로 변환
             return Response(WikiReviewSerializer(review).data, status=status.HTTP_201_CREATED)
         
         except Exception as e:
-            logger.error(f"리뷰 생성 중 오류: {e}")
+            logger.error("리뷰 생성 중 오류: %s", e)
             return Response(
                 {'detail': f'리뷰 작성 중 오류가 발생했습니다. {e}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -95,19 +135,8 @@ class WikiReviewViewSet(viewsets.GenericViewSet):
     )
     @action(methods=["GET"], detail=False)
     def top7_liked(self, request):
-        top_wiki = self.get_queryset().order_by("-like_num")[:7]
-        top_wiki_serializer = WikiReviewSerializer(top_wiki, many=True)
-
-        top_data = []
-        for top in top_wiki_serializer.data:
-            top_data.append({
-                    'id': top.get('id'),
-                    'place_name': top.get('place_name'),
-                    'gplace_id': top.get('gplace_id'),
-                    'review_content': top.get('review_content'),
-                    'like_num': top.get('like_num')
-            })
-        return Response({"top_data" : top_data})
+        feed = feeds.hot_reviews()
+        return feeds.conditional_response(request, feed, {"top_data": feed["items"]})
     
     @extend_schema(
         tags=["🔥위키페이지"],
@@ -115,46 +144,20 @@ class WikiReviewViewSet(viewsets.GenericViewSet):
     )
     @action(methods=["GET"], detail=False)
     def recent5_wiki(self, request):
-        recent_wiki = self.get_queryset().order_by("-created_at")[:5]
-        recent_wiki_serializer = WikiReviewSerializer(recent_wiki, many=True)
-
-        recent_data = []
-
-        for re in recent_wiki_serializer.data:
-            
-            # 리뷰 몇 분전 작성됐는지
-            now = timezone.now()
-            created= re.get('created_at')
-            created_at = parser.isoparse(created)
-            time_diff = now - created_at
-
-            # 시간 차이 계산
-            minutes = int(time_diff.total_seconds() // 60)
-            hours = int(time_diff.total_seconds() // 3600)
-            days = time_diff.days
-
-            if days > 7:
-                # 7일 이상이면 'YYYY년 MM월 DD일' 형식으로 표시
-                # created_at을 로컬 타임으로 변환하여 포맷팅하는 것이 사용자에게 더 익숙합니다.
-                time_text = timezone.localtime(created_at).strftime("%Y년 %m월 %d일")
-            elif days > 0:
-                time_text = f"{days}일 전"
-            elif hours > 0:
-                time_text = f"{hours}시간 전"
-            elif minutes > 0:
-                time_text = f"{minutes}분 전"
-            else:
-                time_text = "방금 전"
-
-            recent_data.append({
-                    'place_name': re.get('place_name'),
-                    'review_content': re.get('review_content'),
-                    'created_at': re.get('created_at'),
-                    'time_text' : time_text
-            })
-
-        
-        return Response({"recent_data" : recent_data})
+        feed = feeds.recent_reviews()
+
+        # 리뷰 몇 분전 작성됐는지는 캐시하지 않고 매번 계산
+        now = timezone.now()
+        recent_data = [
+            {
+                'place_name': item['place_name'],
+                'review_content': item['review_content'],
+                'created_at': feeds.format_datetime(item['created_at']),
+                'time_text': feeds.time_text(item['created_at'], now),
+            }
+            for item in feed["items"]
+        ]
+        return feeds.conditional_response(request, feed, {"recent_data": recent_data})
 
 
 class WikiReportViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
@@ -215,7 +218,7 @@ class WikiReportViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
             
         except Exception as e:
-            logger.error(f"신고 생성 중 오류: {e}")
+            logger.error("신고 생성 중 오류: %s", e)
             return Response(
                 {'detail': '신고 접수 중 오류가 발생했습니다.'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -2,14 +2,15 @@ from django.conf import settings
 import requests
 import logging
 
-from core import times
+from core import http, times
 from core.distance import calculate_distance
 from places.models import PopularKeyward
-from wiki.models import WikiPlace
+from places.services.google import fetch_place
+from wiki.service import rating
 
 logger = logging.getLogger(__name__)
 
-BASE = "https://places.googleapis.com/v1/places"
+BASE = settings.GOOGLE_PLACES_BASE
 
 def _headers():
     return {
@@ -40,30 +41,30 @@ def search_place(place_name, latitude, longitude, radius, rankPreference=None, p
             }
         },
     }
-    r = requests.post(f"{BASE}:searchText", headers=_headers(), json=body, timeout=15)
+    r = http.post("google", "search_text", f"{BASE}:searchText", headers=_headers(), json=body, timeout=15)
     r.raise_for_status()
 
     data = r.json()
     places = data.get("places", [])
 
     google_place = []
+
+    # 인기 카운트/위키 별점은 장소마다 조회하지 않고 한 번에 가져옴
+    places = places[:10]
+    place_ids = [p.get("id") for p in places]
+    click_nums = dict(
+        PopularKeyward.objects.filter(place_id__in=place_ids).values_list("place_id", "click_num")
+    )
+    wiki_ratings = rating.ratings_for(place_ids)
     
-    for p in places[:10]:
+    for p in places:
         
-        p_id = ""
-        click_num = 0 #[인기순정렬] 검색한 장소의 id가 DB에 있을 경우 인기 카운트 횟수를 세서 반환
-        try:
-            p_id = PopularKeyward.objects.get(place_id = p.get("id"))
-            click_num = p_id.click_num if p_id else 0
-        except PopularKeyward.DoesNotExist:
-            pass
-
-        review_count = 0 #[후기순정렬] 검색한 장소의 id, 리뷰 개수 반환
-        try:
-            r_id = WikiPlace.objects.get(google_place_id = p.get("id"))
-            review_count = r_id.total_review_count if p_id else 0
-        except WikiPlace.DoesNotExist:
-            pass
+        click_num = click_nums.get(p.get("id"), 0) #[인기순정렬] 검색한 장소의 id가 DB에 있을 경우 인기 카운트 횟수를 세서 반환
+
+        #[후기순정렬] 검색한 장소의 리뷰 개수, 위키 별점 (위키에 없는 장소는 구글 별점)
+        wiki_rating = wiki_ratings.get(p.get("id"))
+        review_count = wiki_rating["review_count"] if wiki_rating else 0
+        review_score = wiki_rating["review_score"] if wiki_rating else rating.blend(0, 0, p.get("rating"))
         
         running_time = p.get("regularOpeningHours", {})
         if not running_time:
@@ -100,6 +101,7 @@ def search_place(place_name, latitude, longitude, radius, rankPreference=None, p
             "rating" : p.get("rating"), #구글 별점 혹시하고 가져옴
             "click_num": click_num, #[인기순정렬]
             "review_count": review_count, #[후기순정렬]
+            "review_score": review_score, #위키별점
             "running_time" : time,
             "distance_text" : distance_text,
             "place_photos":place_photos
@@ -110,15 +112,18 @@ def search_place(place_name, latitude, longitude, radius, rankPreference=None, p
 
 # 프론트로부터 place_id를 받고 세부 데이터 응답
 def search_detail(place_id):
-    params = {
-        "languageCode": "ko",
-        "regionCode": "KR",
-        "fields": "id,displayName,formattedAddress,location,regularOpeningHours,photos",
-    }
-    r = requests.get(f"{BASE}/{place_id}", params=params, headers=_headers(), timeout=15)
-    r.raise_for_status()
-    p = r.json()
+    return _detail_from(fetch_place(place_id, reviews=False))
+
 
+def search_detail_with_reviews(place_id, limit=10):
+    """세부 데이터와 구글 리뷰를 places/{id} 한 번의 호출로 함께 반환
+    - 응답은 places.services.google.fetch_place 캐시를 공유하므로 장소 요약에서 조회한 결과도 재사용
+    """
+    p = fetch_place(place_id)
+    return _detail_from(p), _reviews_from(p, place_id, limit)
+
+
+def _detail_from(p):
     photos = p.get("photos", [])[:5] #장소상한
     place_photos = {
         build_photo_url(p["name"], max_width_px=800)
@@ -159,47 +164,41 @@ def get_google_reviews(place_id, limit=10):
         dict: {"reviews": [리뷰 텍스트 리스트], "ratings": [별점 리스트], "average_rating": 평균별점}
     """
     try:
-        # 구글 Places API에서 리뷰 포함하여 장소 정보 조회
-        params = {
-            "languageCode": "ko",
-            "regionCode": "KR", 
-            "fields": "id,displayName,reviews",
-        }
-        
-        r = requests.get(f"{BASE}/{place_id}", params=params, headers=_headers(), timeout=20)
-        r.raise_for_status()
-        
-        data = r.json()
-        reviews_data = data.get("reviews", [])
-        
-        # 리뷰 텍스트와 별점 추출 (빈 리뷰는 제외)
-        review_texts = []
-        review_ratings = []
-        
-        for review in reviews_data[:limit]:
-            text_data = review.get("text", {})
-            review_text = text_data.get("text", "").strip()
-            review_rating = review.get("rating", 0)  # 별점 (1-5)
-            
-            if review_text and len(review_text) >= 10:  # 최소 10자 이상인 리뷰만
-                review_texts.append(review_text)
-                review_ratings.append(review_rating)
-        
-        # 평균 별점 계산
-        average_rating = round(sum(review_ratings) / len(review_ratings), 1) if review_ratings else 0
-        
-        logger.info(f"구글 리뷰 {len(review_texts)}개 수집 완료 (평균별점: {average_rating}) (장소ID: {place_id})")
-        
-        return {
-            "reviews": review_texts,
-            "ratings": review_ratings, 
-            "average_rating": average_rating,
-            "review_count": len(review_texts)
-        }
+        # 구글 Places API에서 리뷰 포함하여 장소 정보 조회 (세부 데이터 조회와 같은 응답 재사용)
+        return _reviews_from(fetch_place(place_id), place_id, limit)
         
     except requests.RequestException as e:
-        logger.error(f"구글 리뷰 수집 실패 (장소ID: {place_id}): {e}")
+        logger.error("구글 리뷰 수집 실패 (장소ID: %s): %s", place_id, e)
         return {"reviews": [], "ratings": [], "average_rating": 0, "review_count": 0}
     except Exception as e:
-        logger.error(f"구글 리뷰 처리 중 오류 (장소ID: {place_id}): {e}")
-        return {"reviews": [], "ratings": [], "average_rating": 0, "review_count": 0}
\ No newline at end of file
+        logger.error("구글 리뷰 처리 중 오류 (장소ID: %s): %s", place_id, e)
+        return {"reviews": [], "ratings": [], "average_rating": 0, "review_count": 0}
+
+
+def _reviews_from(data, place_id, limit=10):
+    reviews_data = data.get("reviews", [])
+    
+    # 리뷰 텍스트와 별점 추출 (빈 리뷰는 제외)
+    review_texts = []
+    review_ratings = []
+    
+    for review in reviews_data[:limit]:
+        text_data = review.get("text", {})
+        review_text = text_data.get("text", "").strip()
+        review_rating = review.get("rating", 0)  # 별점 (1-5)
+        
+        if review_text and len(review_text) >= 10:  # 최소 10자 이상인 리뷰만
+            review_texts.append(review_text)
+            review_ratings.append(review_rating)
+    
+    # 평균 별점 계산
+    average_rating = round(sum(review_ratings) / len(review_ratings), 1) if review_ratings else 0
+    
+    logger.info("구글 리뷰 %s개 수집 완료 (평균별점: %s) (장소ID: %s)", len(review_texts), average_rating, place_id)
+    
+    return {
+        "reviews": review_texts,
+        "ratings": review_ratings, 
+        "average_rating": average_rating,
+        "review_count": len(review_texts)
+    }
@@ -6,10 +6,12 @@ import requests
 import logging
 from django.conf import settings
 
+from core import http
+
 logger = logging.getLogger(__name__)
 
-BASE = "https://api.openai.com/v1/chat/completions"
-CONTENT = "https://api.openai.com/v1/moderations"
+BASE = f"{settings.OPENAI_API_BASE}/chat/completions"
+CONTENT = f"{settings.OPENAI_API_BASE}/moderations"
 
 def _headers():
     return {
@@ -56,7 +58,7 @@ def openai_summary(input_text:str, lang: str = "ko", model: str = "gpt-4o-mini")
         ],
     }
 
-    r = requests.post(BASE, headers=_headers(), json=body, timeout=(5,100))
+    r = http.post("openai", "review_summary", BASE, headers=_headers(), json=body, timeout=(5,100))
     try:
         r.raise_for_status()
     except requests.HTTPError as e:
@@ -90,7 +92,7 @@ def create_crawled_reviews_summary(place_name, google_reviews=None, blog_reviews
         blog_reviews = blog_reviews or []
         
         if not google_reviews and not blog_reviews:
-            logger.warning(f"크롤링된 리뷰가 없어 요약 생성 불가 (장소: {place_name})")
+            logger.warning("크롤링된 리뷰가 없어 요약 생성 불가 (장소: %s)", place_name)
             return None  # 실제 리뷰가 없으면 요약 생성하지 않음
         
         # 구글맵 리뷰만 사용 (블로그 리뷰는 제외)
@@ -158,32 +160,28 @@ def create_crawled_reviews_summary(place_name, google_reviews=None, blog_reviews
             "max_completion_tokens": 1000
         }
         
-        print(f"🚀 [DEBUG] OpenAI API 요청 시작 - 모델: {model}, 장소: {place_name}")
-        print(f"🚀 [DEBUG] 요청 데이터: {body}")
+        logger.debug("OpenAI API 요청 - 모델: %s, 장소: %s", model, place_name, extra={"request_body": body})
         
         try:
-            r = requests.post(BASE, headers=_headers(), json=body, timeout=(10, 120))
-            print(f"🚀 [DEBUG] HTTP 응답 코드: {r.status_code}")
+            r = http.post("openai", "crawled_summary", BASE, headers=_headers(), json=body, timeout=(10, 120))
             r.raise_for_status()
             
             data = r.json()
-            print(f"🚀 [DEBUG] OpenAI API 응답 성공!")
-            print(f"🚀 [DEBUG] 전체 응답: {data}")
             
             ai_summary = ((data.get("choices") or [])[0].get("message") or {}).get("content", "").strip()
-            print(f"🚀 [DEBUG] 추출된 AI 요약: '{ai_summary}'")
+            logger.debug("OpenAI API 응답 - 장소: %s, 요약: %s", place_name, ai_summary, extra={"usage": data.get("usage")})
             
         except requests.HTTPError as http_err:
-            print(f"❌ [DEBUG] HTTP 에러: {http_err}")
-            print(f"❌ [DEBUG] 응답 내용: {http_err.response.text if http_err.response else 'No response'}")
+            logger.error("OpenAI API HTTP 에러: %s (응답: %s)", http_err,
+                         http_err.response.text if http_err.response is not None else None)
             raise
         except Exception as e:
-            print(f"❌ [DEBUG] 기타 에러: {e}")
+            logger.exception("OpenAI API 호출 실패 - 장소: %s", place_name)
             raise
         
         # 응답이 없거나 빈 경우 None 반환
         if not ai_summary:
-            logger.warning(f"AI 요약 생성 결과가 비어있음 (장소: {place_name})")
+            logger.warning("AI 요약 생성 결과가 비어있음 (장소: %s)", place_name)
             return None
         
         # 장소명으로 시작하지 않는 경우 보정
@@ -0,0 +1,90 @@
+"""
+위키 별점 서비스
+- 자체 리뷰 평점과 구글 별점을 결합한 위키 별점을 WikiPlace.blended_review_score 에 저장
+- 자체 리뷰 통계가 바뀌거나(wiki/signals.py, WikiPlace.update_review_stats) 구글 별점이 새로 들어올 때(place_detail)만 다시 계산
+- 목록 API 는 ratings_for() 로 여러 장소의 별점을 쿼리 한 번에 조회
+"""
+
+import logging
+
+from wiki import feeds
+from wiki.models import WikiPlace
+
+logger = logging.getLogger(__name__)
+
+ENOUGH_REVIEWS = 5    # 자체 리뷰가 이보다 많으면 자체 평점만 사용
+INTERNAL_WEIGHT = 0.7
+GOOGLE_WEIGHT = 0.3
+
+
+def blend(internal_score, internal_count, google_rating):
+    """하이브리드 평점 (자체 우선, 5개 이하면 구글 평점과 합치기)
+    - 자체 리뷰 5개 초과: 자체 평점
+    - 자체 리뷰 1~5개: 자체 70% + 구글 30% (구글 별점이 없으면 자체 평점)
+    - 자체 리뷰 없음: 구글 별점 (없으면 0)
+    """
+    internal_score = float(internal_score or 0)
+    google_rating = float(google_rating or 0)
+
+    if internal_count > ENOUGH_REVIEWS:
+        return internal_score
+    if internal_count > 0:
+        if google_rating > 0:
+            return round((internal_score * INTERNAL_WEIGHT) + (google_rating * GOOGLE_WEIGHT), 1)
+        return internal_score
+    return google_rating
+
+
+def _blend_place(wiki_place):
+    return blend(wiki_place.average_review_score, wiki_place.total_review_count, wiki_place.google_rating)
+
+
+def recompute(wiki_place_id):
+    """자체 리뷰 통계가 바뀐 뒤 위키 별점을 다시 계산해 저장"""
+    row = WikiPlace.objects.filter(pk=wiki_place_id).values_list(
+        "average_review_score", "total_review_count", "google_rating"
+    ).first()
+    if row is None:
+        return None
+    score = blend(*row)
+    WikiPlace.objects.filter(pk=wiki_place_id).update(blended_review_score=score)
+    return score
+
+
+def refresh_google_rating(wiki_place, google_rating):
+    """구글 별점을 기록하고 위키 별점 갱신 (값이 그대로면 저장하지 않음)"""
+    google_rating = float(google_rating) if google_rating else None
+    update_fields = []
+    if google_rating != wiki_place.google_rating:
+        wiki_place.google_rating = google_rating
+        update_fields.append("google_rating")
+
+    score = _blend_place(wiki_place)
+    if score != wiki_place.blended_review_score:
+        wiki_place.blended_review_score = score
+        update_fields.append("blended_review_score")
+
+    if update_fields:
+        logger.debug("위키 별점 갱신 - %s: %s (구글 %s)", wiki_place.google_place_id, score, google_rating)
+        WikiPlace.objects.filter(pk=wiki_place.pk).update(
+            **{field: getattr(wiki_place, field) for field in update_fields}
+        )
+        if "blended_review_score" in update_fields:
+            feeds.invalidate()  # 핫 게시판 피드에 위키 별점이 들어감
+    return score
+
+
+def ratings_for(google_place_ids):
+    """구글 장소 ID 목록 -> {장소 ID: {"review_score": 위키 별점, "review_count": 자체 리뷰 수}} (쿼리 1번)
+    - 위키에 아직 없는 장소는 결과에 없음
+    """
+    ids = [pid for pid in google_place_ids if pid]
+    if not ids:
+        return {}
+    rows = WikiPlace.objects.filter(google_place_id__in=ids).values_list(
+        "google_place_id", "blended_review_score", "total_review_count"
+    )
+    return {
+        pid: {"review_score": score, "review_count": count}
+        for pid, score, count in rows
+    }
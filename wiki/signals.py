@@ -0,0 +1,95 @@
+# 리뷰 작성/수정/삭제 시 WikiPlace 리뷰 통계(점수 합, 개수, 평균)를 증감
+# - 전체 리뷰를 다시 집계하지 않고 UPDATE 한 번으로 처리 (리뷰 수와 무관하게 O(1))
+# - F() 로 DB 에서 바로 더하므로 동시에 리뷰가 들어와도 값이 덮어써지지 않음
+# - 수정은 저장 직전(pre_save)에 DB 의 이전 점수/장소를 읽어 두고 차이만 반영
+# - loaddata(raw 저장)로 들어온 리뷰/장소는 증감 대신 해당 장소를 전체 재계산 (fixture 에 점수 합이 없음)
+# 리뷰 작성/좋아요/삭제, 장소 이름 변경 시 위키 홈 피드(wiki/feeds.py) 무효화
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import feeds
+from .models import Review, WikiPlace
+from .service import rating
+
+
+def _apply_review(wiki_place_id, score, count):
+    """점수 합에 score, 개수에 count(+1/-1) 를 더하고 평균도 같은 UPDATE 에서 갱신
+    - SET 의 우변은 갱신 전 값을 보므로 평균은 (기존 합 + score) / (기존 개수 + count) 로 계산
+    """
+    new_total = Cast(F("total_review_score"), FloatField()) + Value(float(score))
+    new_count = F("total_review_count") + count
+    WikiPlace.objects.filter(pk=wiki_place_id).update(
+        total_review_score=F("total_review_score") + score,
+        total_review_count=new_count,
+        average_review_score=Case(
+            When(total_review_count__gt=-count, then=new_total / new_count),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    )
+    rating.recompute(wiki_place_id)  # 자체 통계가 바뀌었으니 위키 별점도 다시 계산
+
+
+def _invalidate_feeds():
+    # 바로 한 번, 커밋 후 한 번 더 (커밋 전에 다른 요청이 옛 데이터로 다시 만든 피드도 버리도록)
+    feeds.invalidate()
+    transaction.on_commit(feeds.invalidate)
+
+
+STAT_FIELDS = {"review_score", "wiki_place", "wiki_place_id"}
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_stats(sender, instance, raw=False, update_fields=None, **kwargs):
+    # 좋아요 수처럼 점수/장소와 무관한 update_fields 저장은 조회하지 않음
+    instance._previous_stats = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not STAT_FIELDS & set(update_fields):
+        return
+    instance._previous_stats = (
+        Review.objects.filter(pk=instance.pk).values_list("wiki_place_id", "review_score").first()
+    )
+
+
+def _repair_stats(wiki_place_id):
+    place = WikiPlace.objects.filter(pk=wiki_place_id).first()
+    if place is not None:  # 장소가 나중에 적재되면 그때 다시 계산
+        place.update_review_stats()
+
+
+@receiver(post_save, sender=Review)
+def add_review_stats(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        _repair_stats(instance.wiki_place_id)
+    elif created:
+        _apply_review(instance.wiki_place_id, instance.review_score, 1)
+    elif getattr(instance, "_previous_stats", None):
+        old_place_id, old_score = instance._previous_stats
+        if old_place_id != instance.wiki_place_id:
+            # 다른 장소로 옮겨진 리뷰
+            _apply_review(old_place_id, -old_score, -1)
+            _apply_review(instance.wiki_place_id, instance.review_score, 1)
+        else:
+            diff = Decimal(str(instance.review_score)) - old_score  # 저장 직후에는 float/str 일 수 있음
+            if diff:
+                _apply_review(instance.wiki_place_id, diff, 0)
+    _invalidate_feeds()  # 새 리뷰, 점수/좋아요 수 변경
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_stats(sender, instance, **kwargs):
+    _apply_review(instance.wiki_place_id, -instance.review_score, -1)
+    _invalidate_feeds()
+
+
+@receiver(post_save, sender=WikiPlace)
+def wiki_place_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        _repair_stats(instance.pk)  # fixture 의 통계 값으로 덮어써졌으므로
+    _invalidate_feeds()  # 피드에 장소 이름이 들어감
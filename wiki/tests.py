@@ -1,3 +1,353 @@
+import random
+from decimal import Decimal
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core import profiling
+from . import feeds
+from .models import WikiPlace, Review
+from .service import rating
+
+
+class ReviewQueryCountTests(TestCase):
+    """리뷰 목록 API 가 리뷰 수와 관계없이 일정한 쿼리 수로 응답하는지 확인"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.place = WikiPlace.objects.create(google_place_id="place-1", shop_name="장소1")
+
+    def add_reviews(self, n, place=None):
+        place = place or self.place
+        for i in range(n):
+            Review.objects.create(
+                wiki_place=place, review_content=f"리뷰 내용입니다 {i}",
+                review_score=Decimal("4.0"), session_key="s", like_num=i,
+            )
+
+    def test_top7_liked(self):
+        for i in range(3):
+            self.add_reviews(5, WikiPlace.objects.create(google_place_id=f"other-{i}", shop_name=f"다른 장소{i}"))
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/wiki/reviews/top7_liked")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["top_data"]), 7)
+        self.assertTrue(all(r["place_name"] for r in response.data["top_data"]))
+
+    def test_recent5_wiki(self):
+        for i in range(3):
+            self.add_reviews(5, WikiPlace.objects.create(google_place_id=f"other-{i}", shop_name=f"다른 장소{i}"))
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/wiki/reviews/recent5_wiki")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["recent_data"]), 5)
+
+    def test_feeds_cached_until_review_changes(self):
+        self.add_reviews(3)
+        self.client.get("/api/wiki/reviews/top7_liked")
+        with self.assertNumQueries(0):
+            cached = self.client.get("/api/wiki/reviews/top7_liked")
+        self.assertEqual(cached.data["top_data"][0]["like_num"], 2)
+
+        # 좋아요 -> 피드 무효화
+        review = Review.objects.get(like_num=0)
+        self.client.get(f"/api/wiki/reviews/{review.id}/click_liked")
+        self.client.get(f"/api/wiki/reviews/{review.id}/click_liked")
+        self.client.get(f"/api/wiki/reviews/{review.id}/click_liked")
+        response = self.client.get("/api/wiki/reviews/top7_liked")
+        self.assertEqual(response.data["top_data"][0]["id"], review.id)
+
+    def test_feeds_conditional_get(self):
+        self.add_reviews(3)
+        for url in ("/api/wiki/reviews/top7_liked", "/api/wiki/reviews/recent5_wiki"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            etag = response["ETag"]
+            self.assertTrue(response.has_header("Last-Modified"))
+
+            with self.assertNumQueries(0):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+            self.add_reviews(1)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+
+    def test_by_place_pages(self):
+        self.add_reviews(25)
+        seen = []
+        url = "/api/wiki/reviews/by_place?place_id=place-1&size=10"
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(r["id"] for r in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+    def test_by_place_liked_ordering(self):
+        self.add_reviews(5)
+        response = self.client.get("/api/wiki/reviews/by_place?place_id=place-1&ordering=liked")
+        likes = [r["like_num"] for r in response.data["results"]]
+        self.assertEqual(likes, sorted(likes, reverse=True))
+
+    def test_by_place_liked_pages_with_ties(self):
+        # 좋아요 수가 겹치는 리뷰가 많아도 페이지 사이에 빠지거나 겹치지 않음 (앞뒤로 넘겨도 같은 순서)
+        self.add_reviews(23)
+        for review in Review.objects.all():
+            review.like_num = review.id % 3
+            review.save(update_fields=["like_num"])
+        expected = list(Review.objects.order_by("-like_num", "-id").values_list("id", flat=True))
+
+        seen, pages = [], []
+        url = "/api/wiki/reviews/by_place?place_id=place-1&ordering=liked&size=4"
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            pages.append([r["id"] for r in response.data["results"]])
+            seen.extend(pages[-1])
+            previous, url = response.data["previous"], response.data["next"]
+        self.assertEqual(seen, expected)
+
+        back = []
+        while previous:
+            response = self.client.get(previous)
+            back.insert(0, [r["id"] for r in response.data["results"]])
+            previous = response.data["previous"]
+        self.assertEqual(back, pages[:-1])
+
+    def test_by_place_liked_pages_when_likes_change(self):
+        # 넘기는 도중 이미 본 리뷰에 좋아요가 늘어도 나머지 리뷰는 빠지거나 겹치지 않음
+        self.add_reviews(12)
+        Review.objects.update(like_num=0)
+        url = "/api/wiki/reviews/by_place?place_id=place-1&ordering=liked&size=4"
+        response = self.client.get(url)
+        first = [r["id"] for r in response.data["results"]]
+        Review.objects.filter(id__in=first[:2]).update(like_num=5)
+
+        seen = list(first)
+        url = response.data["next"]
+        while url:
+            response = self.client.get(url)
+            seen.extend(r["id"] for r in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(sorted(seen), sorted(Review.objects.values_list("id", flat=True)))
+
+    def test_by_place_requires_place_id(self):
+        response = self.client.get("/api/wiki/reviews/by_place")
+        self.assertEqual(response.status_code, 400)
+
+    @mock.patch("wiki.views.openai.openai_summary", return_value="요약")
+    @mock.patch("wiki.views.openai.create_crawled_reviews_summary", return_value="요약")
+    @mock.patch("wiki.views.google.search_detail_with_reviews")
+    def test_place_detail(self, search_detail, *_):
+        search_detail.return_value = (
+            {"place_name": "장소1", "rating": 4.2},
+            {"review_count": 0, "average_rating": 0, "reviews": []},
+        )
+        # 구글 별점이 그대로면 위키 별점은 다시 저장하지 않음
+        WikiPlace.objects.filter(pk=self.place.pk).update(google_rating=4.2)
+        for total in (3, 30):
+            Review.objects.all().delete()
+            self.place.refresh_from_db()
+            self.add_reviews(total)
+            # WikiPlace 조회 / 리뷰 첫 페이지 / AI 요약용 리뷰 본문
+            with self.assertNumQueries(3):
+                response = self.client.get("/api/wiki/detail/?place_id=place-1")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["reviews_count"], total)
+            self.assertEqual(len(response.data["reviews_content"]), min(total, 10))
+            self.assertEqual(response.data["reviews_next"] is not None, total > 10)
+
+
+class RatingTests(TestCase):
+    """위키 별점 저장/갱신"""
+
+    def setUp(self):
+        self.place = WikiPlace.objects.create(google_place_id="place-1", shop_name="장소1")
+
+    def add_review(self, score):
+        return Review.objects.create(
+            wiki_place=self.place, review_content="리뷰 내용입니다", review_score=Decimal(score), session_key="s",
+        )
+
+    def test_blend(self):
+        self.assertEqual(rating.blend(0, 0, 4.3), 4.3)
+        self.assertEqual(rating.blend(0, 0, None), 0.0)
+        self.assertEqual(rating.blend(Decimal("4.00"), 2, 3.0), 3.7)
+        self.assertEqual(rating.blend(Decimal("4.00"), 2, None), 4.0)
+        self.assertEqual(rating.blend(Decimal("3.50"), 6, 5.0), 3.5)
+
+    def test_recomputed_on_review_and_google_rating_change(self):
+        rating.refresh_google_rating(self.place, 3.0)
+        self.place.refresh_from_db()
+        self.assertEqual(self.place.blended_review_score, 3.0)
+
+        self.add_review("5.0")
+        self.place.refresh_from_db()
+        self.assertEqual(self.place.blended_review_score, 4.4)
+
+        review = self.add_review("3.0")
+        self.place.refresh_from_db()
+        self.assertEqual(self.place.blended_review_score, 3.7)
+
+        review.delete()
+        self.place.refresh_from_db()
+        self.assertEqual(self.place.blended_review_score, 4.4)
+
+    def test_update_review_stats_repairs_blended_score(self):
+        # 시그널 없이 들어온 리뷰 (시드 적재와 같은 상황)
+        rating.refresh_google_rating(self.place, 3.0)
+        Review.objects.bulk_create([
+            Review(wiki_place=self.place, review_content="리뷰 내용입니다", review_score=Decimal(score), session_key="s")
+            for score in ("5.0", "4.0")
+        ])
+        self.assertEqual(rating.ratings_for(["place-1"])["place-1"]["review_score"], 3.0)
+
+        version = cache.get(feeds.VERSION_KEY)
+        place = WikiPlace.objects.get(pk=self.place.pk)
+        place.update_review_stats()
+        self.assertEqual(place.blended_review_score, 4.0)  # 4.5 * 0.7 + 3.0 * 0.3
+        self.assertEqual(rating.ratings_for(["place-1"])["place-1"], {"review_score": 4.0, "review_count": 2})
+        self.assertNotEqual(cache.get(feeds.VERSION_KEY), version)
+
+    def test_ratings_for_single_query(self):
+        WikiPlace.objects.create(google_place_id="place-2", blended_review_score=4.5, total_review_count=3)
+        with self.assertNumQueries(1):
+            ratings = rating.ratings_for(["place-1", "place-2", "unknown"])
+        self.assertEqual(ratings["place-2"], {"review_score": 4.5, "review_count": 3})
+        self.assertNotIn("unknown", ratings)
+
+
+class ReviewStatsTests(TestCase):
+    """리뷰 작성/수정/삭제 시그널의 F() 증감이 전체 재집계(update_review_stats)와 같은지"""
+
+    def setUp(self):
+        self.place = WikiPlace.objects.create(google_place_id="place-1", shop_name="장소1")
+
+    def add_review(self, score, place=None):
+        return Review.objects.create(
+            wiki_place=place or self.place, review_content="리뷰 내용입니다",
+            review_score=Decimal(score), session_key="s",
+        )
+
+    def stats(self, place=None):
+        place = place or self.place
+        place.refresh_from_db()
+        return place.total_review_score, place.total_review_count, round(float(place.average_review_score), 2)
+
+    def recomputed(self, place=None):
+        place = WikiPlace.objects.get(pk=(place or self.place).pk)
+        place.update_review_stats()
+        return self.stats(place)
+
+    def test_create_and_delete(self):
+        stale = WikiPlace.objects.get(pk=self.place.pk)  # 갱신 전 값을 들고 있는 객체
+        first = self.add_review("5.0")
+        self.add_review("3.5")
+        self.assertEqual(self.stats(), (Decimal("8.50"), 2, 4.25))
+        self.assertEqual(stale.total_review_count, 0)  # DB 에서만 더함
+
+        first.delete()
+        self.assertEqual(self.stats(), (Decimal("3.50"), 1, 3.5))
+        Review.objects.get().delete()
+        self.assertEqual(self.stats(), (Decimal("0.00"), 0, 0.0))
+
+    def test_score_edit(self):
+        self.add_review("5.0")
+        review = self.add_review("3.0")
+        review.review_score = 4.5  # 시리얼라이저/관리자 화면처럼 Decimal 이 아닌 값
+        review.save()
+        self.assertEqual(self.stats(), (Decimal("9.50"), 2, 4.75))
+
+        review.refresh_from_db()
+        review.review_content = "내용만 수정"
+        review.save()
+        self.assertEqual(self.stats(), (Decimal("9.50"), 2, 4.75))
+        self.assertEqual(self.stats(), self.recomputed())
+
+    def test_like_save_skips_lookup(self):
+        review = self.add_review("4.0")
+        review.like_num = 3
+        with self.assertNumQueries(1):  # UPDATE 한 번 (이전 점수 조회 없음)
+            review.save(update_fields=["like_num"])
+        self.assertEqual(self.stats(), (Decimal("4.00"), 1, 4.0))
+
+    def test_review_moved_to_other_place(self):
+        other = WikiPlace.objects.create(google_place_id="place-2", shop_name="장소2")
+        self.add_review("2.0")
+        review = self.add_review("4.0")
+        review.wiki_place = other
+        review.review_score = Decimal("5.0")
+        review.save()
+        self.assertEqual(self.stats(), (Decimal("2.00"), 1, 2.0))
+        self.assertEqual(self.stats(other), (Decimal("5.00"), 1, 5.0))
+
+    def test_random_sequence_matches_recompute(self):
+        rng = random.Random(5)
+        reviews = []
+        for _ in range(60):
+            action = rng.random()
+            if action < 0.5 or not reviews:
+                reviews.append(self.add_review(str(rng.choice([1, 2.5, 3, 4.5, 5]))))
+            elif action < 0.8:
+                review = rng.choice(reviews)
+                review.review_score = Decimal(str(rng.choice([1, 2, 3.5, 5])))
+                review.save()
+            else:
+                reviews.pop(rng.randrange(len(reviews))).delete()
+        self.assertEqual(self.stats(), self.recomputed())
+
+    def test_migration_backfill(self):
+        backfill = import_module("wiki.migrations.0010_wikiplace_total_review_score").backfill_review_stats
+        other = WikiPlace.objects.create(google_place_id="place-2", shop_name="장소2")
+        empty = WikiPlace.objects.create(google_place_id="place-3", shop_name="장소3")
+        for score in ("5.0", "4.0", "2.5"):
+            self.add_review(score)
+        self.add_review("3.0", other)
+        # 컬럼이 새로 생긴 직후처럼 통계를 비워 두고 채움
+        WikiPlace.objects.update(total_review_score=0, total_review_count=0, average_review_score=0)
+
+        backfill(apps, None)
+        self.assertEqual(self.stats(), (Decimal("11.50"), 3, 3.83))
+        self.assertEqual(self.stats(other), (Decimal("3.00"), 1, 3.0))
+        self.assertEqual(self.stats(empty), (Decimal("0.00"), 0, 0.0))
+
+
+class ProfilingTests(TestCase):
+    """X-Profile 헤더로 켠 프로파일이 스태프 전용 디버그 API 에 쌓이는지 확인"""
+
+    def setUp(self):
+        profiling.clear()
+        self.client = APIClient()
+        staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        self.client.force_login(staff)
+
+    def test_header_profiles_request(self):
+        for mode in ("cprofile", "sample"):
+            response = self.client.get("/api/wiki/reviews/by_place?place_id=place-1", HTTP_X_PROFILE=mode)
+            profile_id = response["X-Profile-Id"]
+
+            detail = self.client.get(f"/api/wiki/debug/profiles/{profile_id}/").data
+            self.assertEqual(detail["mode"], mode)
+            self.assertEqual(detail["path"], "/api/wiki/reviews/by_place?place_id=place-1")
+            self.assertGreaterEqual(detail["db_queries"], 1)
+            if mode == "cprofile":
+                self.assertTrue(detail["top"])
+
+        self.assertEqual(len(self.client.get("/api/wiki/debug/profiles/").data), 2)
+
+    def test_not_profiled_without_header_or_for_anonymous(self):
+        self.assertFalse(self.client.get("/api/wiki/reviews/top7_liked").has_header("X-Profile-Id"))
 
-# Create your tests here.
+        anonymous = APIClient()
+        response = anonymous.get("/api/wiki/reviews/top7_liked", HTTP_X_PROFILE="cprofile")
+        self.assertFalse(response.has_header("X-Profile-Id"))
+        self.assertEqual(anonymous.get("/api/wiki/debug/profiles/").status_code, 403)
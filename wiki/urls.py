@@ -10,7 +10,7 @@ from django.conf.urls.static import static
 
 from .views import WikiViewSet
 from .review_views import WikiReviewViewSet, WikiReportViewSet
-from .debug_views import ReviewCrawlerDebugViewSet
+from .debug_views import ReviewCrawlerDebugViewSet, ProfileDebugViewSet
 from .test_crawling_only import CrawlingOnlyTestViewSet
 
 app_name = "wiki"
@@ -33,6 +33,7 @@ report_router.register("reports", WikiReportViewSet, basename="wiki-reports")
 # 디버깅 라우터 (크롤링 테스트용)
 debug_router = routers.SimpleRouter(trailing_slash=True)
 debug_router.register("debug", ReviewCrawlerDebugViewSet, basename="wiki-debug")
+debug_router.register("debug/profiles", ProfileDebugViewSet, basename="wiki-debug-profiles")
 
 # 크롤링 전용 라우터 (AI 요약 없이)
 crawling_router = routers.SimpleRouter(trailing_slash=True)
@@ -58,6 +59,7 @@ urlpatterns = [
     # 디버깅 기능 (크롤링 테스트)
     # GET /debug/test_google_reviews - 구글맵 리뷰 크롤링 테스트 
     # GET /debug/test_full_crawling_summary - 구글맵 리뷰 크롤링 + AI 요약 테스트
+    # GET /debug/profiles/, /debug/profiles/{id}/ - 요청 프로파일 조회 (스태프 전용)
     path("", include(debug_router.urls)),
     
     # 크롤링 전용 기능 (AI 요약 없이)
@@ -84,8 +86,8 @@ GET /wiki/detail
 
 ### 3.2.2 후기 작성
 GET /reviews/by_place
-- 파라미터: place_id, page, size
-- 응답: 리뷰 목록 (reviews, reviews_score)
+- 파라미터: place_id, ordering(latest|liked), size, cursor
+- 응답: 리뷰 목록 (next, previous, results)
 
 POST /reviews  
 - 요청: place_id, review_content, review_score, review_image
@@ -3,8 +3,9 @@ Wiki 앱 뷰 - 메인 검색 및 정보 안내
 """
 
 from datetime import timezone
+from urllib.parse import urlencode
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg
+from django.urls import reverse
 
 import requests
 from rest_framework import viewsets, status
@@ -23,7 +24,9 @@ from .serializers import (
 )
 from typing import List, Dict, Optional, Tuple
 
-from .service import google, openai
+from .pagination import ReviewCursorPagination
+from .review_views import review_list_queryset
+from .service import google, openai, rating
 
 import logging
 
@@ -54,7 +57,7 @@ class WikiViewSet(viewsets.GenericViewSet):
             google_places = google.search_place(**search_data)
             
         except Exception as e:
-            logger.error(f"위키 검색 중 오류: {e}")
+            logger.error("위키 검색 중 오류: %s", e)
             return Response(
                 {'detail': f'검색 중 오류가 발생했습니다: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -82,7 +85,7 @@ class WikiViewSet(viewsets.GenericViewSet):
         if lang not in ['ko', 'en']:
             lang = 'ko'  # 잘못된 언어는 한국어로 기본 설정
             
-        logger.info(f"위키 상세정보 요청 - place_id: {place_id}, lang: {lang}")
+        logger.info("위키 상세정보 요청 - place_id: %s, lang: %s", place_id, lang)
         
         if not place_id:
             return Response(
@@ -92,7 +95,9 @@ class WikiViewSet(viewsets.GenericViewSet):
         
         ai_summary = None
         try:
-            search_details = google.search_detail(place_id=place_id) 
+            # 세부 데이터 + 구글맵 리뷰를 한 번의 호출로 가져오기 (리뷰는 평점 계산에 필요)
+            search_details, google_review_data = google.search_detail_with_reviews(place_id, limit=10)
+            logger.info("구글맵 리뷰 크롤링 완료: %s개, 평균별점: %s", google_review_data['review_count'], google_review_data['average_rating'])
             shop_name =search_details.get("place_name")  
             # WikiPlace 조회
             wiki_place = None
@@ -110,77 +115,43 @@ class WikiViewSet(viewsets.GenericViewSet):
                     wiki_place.shop_name = shop_name
                     wiki_place.save(update_fields=["shop_name"])
         
-            # 먼저 구글맵 리뷰 크롤링 (평점 계산에 필요)
-            google_review_data = {"reviews": [], "ratings": [], "average_rating": 0, "review_count": 0}
-            try:
-                google_review_data = google.get_google_reviews(place_id, limit=10)
-                logger.info(f"구글맵 리뷰 크롤링 완료: {google_review_data['review_count']}개, 평균별점: {google_review_data['average_rating']}")
-            except Exception as e:
-                logger.warning(f"구글맵 리뷰 크롤링 실패 (장소: {shop_name}): {e}")
-
-            # 평점 정보 계산 (내부 리뷰 + 크롤링된 구글맵 리뷰 별점 결합)
-            reviews = Review.objects.filter(wiki_place=wiki_place)
-            
-            # 내부 리뷰 평점 계산
-            internal_review_score = 0.00
-            internal_review_count = 0
-            
-            if reviews.exists():
-                avg_score = reviews.aggregate(avg=Avg('review_score'))['avg']
-                internal_review_score = float(avg_score) if avg_score else 0.00
-                internal_review_count = reviews.count()
-            
-            # 🔥 하이브리드 평점 시스템 (자체 우선, 5개 이하면 구글 평점과 합치기)
-            print(f"🔍 [DEBUG] 하이브리드 평점 시스템 시작:")
-            print(f"🔍 [DEBUG] - 내부 리뷰 개수: {internal_review_count}")
-            print(f"🔍 [DEBUG] - 내부 리뷰 평점: {internal_review_score}")
-            print(f"🔍 [DEBUG] - 구글맵 전체 평점: {search_details.get('rating')}")
-            print(f"🔍 [DEBUG] - 크롤링된 평점: {google_review_data['average_rating']}")
-            
-            if internal_review_count > 5:
-                # 자체 리뷰가 5개 초과면 자체 평점만 사용
-                review_score = internal_review_score
-                print(f"🔍 [DEBUG] - 자체 리뷰 충분 (5개 초과): 자체 평점만 사용 {review_score}")
-            elif internal_review_count > 0:
-                # 자체 리뷰가 1~5개면 구글 평점과 가중평균
-                google_rating = search_details.get("rating", 0) or google_review_data["average_rating"]
-                if google_rating > 0:
-                    # 가중평균: 자체 70%, 구글 30%
-                    review_score = round((internal_review_score * 0.7) + (google_rating * 0.3), 1)
-                    print(f"🔍 [DEBUG] - 하이브리드 평점: 자체({internal_review_score})*0.7 + 구글({google_rating})*0.3 = {review_score}")
-                else:
-                    review_score = internal_review_score
-                    print(f"🔍 [DEBUG] - 구글 평점 없음, 자체 평점만 사용: {review_score}")
-            else:
-                # 자체 리뷰가 없으면 구글 평점 사용
-                review_score = search_details.get("rating", 0) or google_review_data["average_rating"] or 0.00
-                print(f"🔍 [DEBUG] - 자체 리뷰 없음, 구글 평점 사용: {review_score}")
+            # 위키 별점 (자체 리뷰 + 구글 별점 결합) - 저장된 값을 쓰고, 구글 별점이 바뀐 경우에만 다시 계산
+            internal_review_count = wiki_place.total_review_count
+            google_rating = search_details.get("rating", 0) or google_review_data["average_rating"]
+            review_score = rating.refresh_google_rating(wiki_place, google_rating)
 
             # 게시판 리뷰 조회 (최신순/추천순)
-            reviews_content = wiki_place.reviews.order_by('-created_at')
-            reviews_count = wiki_place.reviews.count()
+            # 첫 페이지만 내려주고 나머지는 reviews_next (GET /reviews/by_place 커서 링크) 로 이어서 조회
+            reviews_count = internal_review_count
+            paginator = ReviewCursorPagination()
+            reviews_page = paginator.paginate_queryset(
+                review_list_queryset().filter(wiki_place=wiki_place), request, view=self
+            )
+            paginator.base_url = request.build_absolute_uri(
+                f"{reverse('wiki:wiki-reviews-by-place')}?{urlencode({'place_id': place_id})}"
+            )
+            reviews_next = paginator.get_next_link()
             reviews_data = WikiReviewSerializer(
-                reviews_content, many=True, context={'request': request}
+                reviews_page, many=True, context={'request': request}
             ).data #직렬화
 
             ############################################################################################
             # 🔥 하이브리드 AI 요약 시스템 (자체 우선, 5개 이하면 구글 리뷰와 합치기)
             ai_summary = None
-            review_texts = [review.review_content for review in reviews_content if review.review_content]
+            review_texts = [
+                text for text in wiki_place.reviews.order_by('-created_at').values_list('review_content', flat=True) if text
+            ]
             
-            print(f"🔍 [DEBUG] 하이브리드 AI 요약 시스템 시작:")
-            print(f"🔍 [DEBUG] - 자체 리뷰 개수: {len(review_texts)}")
-            print(f"🔍 [DEBUG] - 구글 리뷰 개수: {google_review_data['review_count']}")
+            logger.debug("하이브리드 AI 요약 - 자체 리뷰 %d개, 구글 리뷰 %d개", len(review_texts), google_review_data['review_count'])
             
             if len(review_texts) > 5:
                 # 🎯 케이스 1: 자체 리뷰가 5개 초과 - 자체 리뷰만 사용
                 try:
                     input_text = "\n\n".join(review_texts)
                     ai_summary = openai.openai_summary(input_text=input_text, lang=lang)
-                    logger.info(f"자체 리뷰만으로 AI 요약 생성 완료 (장소: {shop_name}, {len(review_texts)}개 리뷰)")
-                    print(f"🔍 [DEBUG] - 자체 리뷰만 사용한 AI 요약 생성 성공")
+                    logger.info("자체 리뷰만으로 AI 요약 생성 완료 (장소: %s, %s개 리뷰)", shop_name, len(review_texts))
                 except Exception as e:
-                    logger.error(f"자체 리뷰 AI 요약 실패: {e}")
+                    logger.error("자체 리뷰 AI 요약 실패: %s", e)
                     ai_summary = None
                     
             elif len(review_texts) > 0:
@@ -198,11 +169,10 @@ class WikiViewSet(viewsets.GenericViewSet):
                         blog_reviews=[],
                         lang=lang
                     )
-                    logger.info(f"하이브리드 AI 요약 생성 완료 (자체: {len(review_texts)}개 + 구글: {len(google_reviews_to_add)}개)")
-                    print(f"🔍 [DEBUG] - 하이브리드 요약 생성 성공 (자체:{len(review_texts)} + 구글:{len(google_reviews_to_add)})")
+                    logger.info("하이브리드 AI 요약 생성 완료 (자체: %s개 + 구글: %s개)", len(review_texts), len(google_reviews_to_add))
                     
                 except Exception as e:
-                    logger.error(f"하이브리드 AI 요약 실패: {e}")
+                    logger.error("하이브리드 AI 요약 실패: %s", e)
                     ai_summary = None
                     
             else:
@@ -215,22 +185,21 @@ class WikiViewSet(viewsets.GenericViewSet):
                             blog_reviews=[],
                             lang=lang
                         )
-                        logger.info(f"구글맵 리뷰만으로 AI 요약 생성 완료 ({google_review_data['review_count']}개 리뷰)")
-                        print(f"🔍 [DEBUG] - 구글 리뷰만 사용한 AI 요약 생성 성공")
+                        logger.info("구글맵 리뷰만으로 AI 요약 생성 완료 (%s개 리뷰)", google_review_data['review_count'])
                     except Exception as e:
-                        logger.error(f"구글맵 리뷰 AI 요약 실패: {e}")
+                        logger.error("구글맵 리뷰 AI 요약 실패: %s", e)
                         ai_summary = None
             
             # 3. 리뷰가 없는 경우 처리 - 다국어 친근한 메시지 표시
             if not ai_summary:
-                logger.info(f"실제 리뷰 데이터가 없어 기본 메시지 표시 (장소: {shop_name}, 언어: {lang})")
+                logger.info("실제 리뷰 데이터가 없어 기본 메시지 표시 (장소: %s, 언어: %s)", shop_name, lang)
                 if lang == "en":
                     ai_summary = "No reviews yet! Be the first to share your experience! 🌟"
                 else:
                     ai_summary = "리뷰가 아직 없습니다! 첫 리뷰의 주인공이 되어주세요! 🌟"
 
         except Exception as e:
-            logger.error(f"위키 상세 정보 조회 중 오류: {e}")
+            logger.error("위키 상세 정보 조회 중 오류: %s", e)
             return Response(
                 {'detail': f'정보 조회 중 오류가 발생했습니다: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -242,7 +211,8 @@ class WikiViewSet(viewsets.GenericViewSet):
                 "average_review_score":review_score, # 위키별점
                 "ai_summary": ai_summary, # AI요약
                 'reviews_count':reviews_count,
-                "reviews_content":reviews_data
+                "reviews_content":reviews_data,
+                "reviews_next": reviews_next, # 다음 리뷰 페이지 (없으면 null)
             }, 
             status=200
         )
\ No newline at end of file